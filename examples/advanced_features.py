@@ -133,36 +133,29 @@ def batch_processing_example():
         "https://example.com/audio3.mp3"
     ]
     
-    # 提交所有任务
-    tasks = []
-    for i, url in enumerate(audio_files, 1):
-        print(f"提交任务 {i}/{len(audio_files)}: {url}")
-        task_id = client.submit_audio(
-            audio_url=url,
-            audio_format="mp3",
-            enable_itn=True,
-            enable_punc=True
-        )
-        tasks.append((task_id, url))
-    
-    # 等待所有任务完成
+    # 有界并发提交，并由同一个调度循环轮询所有任务，完成一个产出一个
     results = []
-    for task_id, url in tasks:
-        print(f"等待任务完成: {task_id}")
-        try:
-            result = client.wait_for_result(task_id, timeout=300)
+    for url, result in client.transcribe_many(
+        audio_files,
+        concurrency=4,
+        timeout=300,
+        return_exceptions=True,
+        audio_format="mp3",
+        enable_itn=True,
+        enable_punc=True
+    ):
+        print(f"任务完成: {url}")
+        if isinstance(result, Exception):
             results.append({
                 "url": url,
-                "task_id": task_id,
-                "text": result.text,
-                "success": True
+                "error": str(result),
+                "success": False
             })
-        except Exception as e:
+        else:
             results.append({
                 "url": url,
-                "task_id": task_id,
-                "error": str(e),
-                "success": False
+                "text": result.text,
+                "success": True
             })
     
     # 输出结果
@@ -5,6 +5,7 @@
 """
 
 from .client import ByteDanceASRClient
+from .async_client import AsyncByteDanceASRClient
 from .models import ASRResult, ASRUtterance, AudioInfo
 from .exceptions import (
     ByteDanceASRError,
@@ -20,6 +21,7 @@ __author__ = "ByteDance ASR Client"
 
 __all__ = [
     "ByteDanceASRClient",
+    "AsyncByteDanceASRClient",
     "ASRResult", 
     "ASRUtterance",
     "AudioInfo",
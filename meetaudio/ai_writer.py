@@ -8,12 +8,20 @@ import logging
 import time
 import threading
 import io
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from functools import partial
 import httpx
-from openai import OpenAI
 from .enhanced_client import MeetingResult
 from .aviation_terms import aviation_processor
+from .cancellation import CancelToken
+from .chunker import TokenChunker, estimate_tokens
+from .exceptions import TaskCancelledError
+from .llm_cache import LLMResponseCache
+from .llm_transport import LLMTransport
+from .matcher import KeywordClassifier
+from .sentence_index import SentenceIndex
 
 try:
     from docx import Document
@@ -26,50 +34,97 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 等待分段摘要期间检查取消令牌的间隔（秒）
+CANCEL_CHECK_INTERVAL = 0.5
+
+# 分段摘要失败后首次重试前的等待时间（秒），之后指数增长
+CHUNK_RETRY_DELAY = 1.0
+
+# 下一步工作的关键词
+NEXT_STEP_CLASSIFIER = KeywordClassifier({
+    "next_steps": ["下一步", "接下来", "今后", "下阶段", "后续"],
+})
+
+
+def _cap_timeout(cancel_token: Optional[CancelToken], timeout: float) -> float:
+    """将大模型调用的超时限制在取消令牌的剩余时间内"""
+    return cancel_token.cap_timeout(timeout) if cancel_token else timeout
+
 
 class AIWriter:
     """AI撰稿引擎"""
 
-    def __init__(self, api_key=None, model=None, base_url=None, timeout=None):
+    def __init__(
+        self,
+        api_key=None,
+        model=None,
+        base_url=None,
+        timeout=None,
+        chunk_concurrency=None,
+        chunk_retries=None,
+        reduce_max_length=None,
+        response_cache: Optional[LLMResponseCache] = None,
+        chunk_tokens=None,
+        chunk_overlap_tokens=None
+    ):
+        """
+        Args:
+            chunk_concurrency: 长会议分段摘要同时进行的大模型调用数
+            chunk_retries: 单个分段摘要失败后的重试次数
+            reduce_max_length: 合并摘要的最大字符数，超出时先逐级合并摘要再生成纪要
+            response_cache: 大模型响应缓存，None表示不缓存
+            chunk_tokens: 每段会议记录的token预算，超出预算的会议记录分段摘要
+            chunk_overlap_tokens: 相邻分段重叠的token数
+        """
         self.templates = MeetingTemplates()
         self.client = None
+        self.transport: Optional[LLMTransport] = None
         self.api_key = api_key or os.getenv("ARK_API_KEY")
         self.model = model or os.getenv("ARK_MODEL", "ARK_MODEL_EP")
         self.base_url = base_url or os.getenv("ARK_BASE_URL", "https://ark.cn-beijing.volces.com/api/v3")
         self.timeout = timeout or int(os.getenv("ARK_TIMEOUT", "300"))
+        self.chunk_concurrency = max(1, chunk_concurrency or int(os.getenv("ARK_CHUNK_CONCURRENCY", "4")))
+        self.chunk_retries = chunk_retries if chunk_retries is not None else int(os.getenv("ARK_CHUNK_RETRIES", "2"))
+        self.reduce_max_length = reduce_max_length or int(os.getenv("ARK_REDUCE_MAX_LENGTH", "8000"))
+        self.response_cache = response_cache
+        self.chunker = TokenChunker(
+            chunk_tokens or int(os.getenv("ARK_CHUNK_TOKENS", "6000")),
+            chunk_overlap_tokens if chunk_overlap_tokens is not None
+            else int(os.getenv("ARK_CHUNK_OVERLAP_TOKENS", "200"))
+        )
         self._init_ai_client()
 
     def _init_ai_client(self):
         """初始化AI客户端"""
         try:
             if self.api_key:
-                # 创建自定义的httpx客户端，设置充足的超时时间
-                custom_timeout = httpx.Timeout(
-                    timeout=float(self.timeout),   # 使用配置的超时时间
-                    connect=30.0,    # 连接超时30秒
-                    read=float(self.timeout) - 30.0,      # 读取超时
-                    write=30.0       # 写入超时30秒
-                )
-
-                self.client = OpenAI(
-                    base_url=self.base_url,
-                    api_key=self.api_key,
-                    timeout=custom_timeout,
-                    max_retries=1  # 允许1次重试
+                # 所有大模型调用共用一个长期存在的连接池，OpenAI客户端也建立在同一连接池上
+                self.transport = LLMTransport(
+                    self.api_key, self.base_url, timeout=self.timeout, cache=self.response_cache
                 )
-                logger.info("豆包AI客户端初始化成功")
+                self.client = self.transport.openai
+                logger.info(f"豆包AI客户端初始化成功（HTTP/2: {self.transport.http2}）")
             else:
                 logger.warning("ARK_API_KEY未设置，将使用模拟AI生成")
         except Exception as e:
             logger.error(f"AI客户端初始化失败: {e}")
             self.client = None
+            self.transport = None
+
+    def close(self):
+        """关闭大模型调用的连接池"""
+        if self.transport:
+            self.transport.close()
         
     def generate_meeting_minutes(
         self,
         meeting_result: MeetingResult,
         meeting_info: Dict[str, Any],
         focus_on_last_speakers: bool = True,
-        speaker_count: int = 2
+        speaker_count: int = 2,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         生成会议纪要
@@ -79,6 +134,9 @@ class AIWriter:
             meeting_info: 会议基本信息
             focus_on_last_speakers: 是否聚焦最后几位发言人
             speaker_count: 聚焦的发言人数量
+            cancel_token: 取消令牌；被取消或超时时在两次大模型调用之间抛出 TaskCancelledError
+            use_cache: 为False时不使用缓存的大模型回复（重新生成），新的回复仍会写入缓存
+            on_text: 流式生成，纪要正文每生成一段时以已生成的全部文本回调（重试时从头开始）
             
         Returns:
             会议纪要内容
@@ -99,10 +157,15 @@ class AIWriter:
             focus_content = processed_text
         
         # 4. 生成纪要内容
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
         minutes_content = self._generate_content(
             focus_content, 
             key_info, 
-            meeting_info
+            meeting_info,
+            cancel_token,
+            use_cache,
+            on_text
         )
         
         # 5. 格式化输出
@@ -161,13 +224,16 @@ class AIWriter:
         self,
         content: str,
         key_info: Dict[str, Any],
-        meeting_info: Dict[str, Any]
+        meeting_info: Dict[str, Any],
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """生成纪要内容"""
 
         if self.client:
             # 使用豆包AI生成
-            return self._ai_generate_content(content, key_info, meeting_info)
+            return self._ai_generate_content(content, key_info, meeting_info, cancel_token, use_cache, on_text)
         else:
             # 使用规则生成示例
             generated_content = {
@@ -183,7 +249,10 @@ class AIWriter:
         self,
         content: str,
         key_info: Dict[str, Any],
-        meeting_info: Dict[str, Any]
+        meeting_info: Dict[str, Any],
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """使用豆包AI生成会议纪要内容"""
 
@@ -198,11 +267,13 @@ class AIWriter:
             # 使用之前能工作的模型
             model = os.getenv("ARK_MODEL", "ep-202***")
 
-            # 检查内容长度，决定是否需要分段处理
-            max_content_length = 8000  # 单次处理的最大字符数
-            if len(content) > max_content_length:
-                logger.info(f"内容较长（{len(content)}字符），使用分段处理")
-                return self._chunked_ai_generate(content, key_info, meeting_info, model)
+            # 检查内容长度，超出分段预算时分段处理
+            content_tokens = estimate_tokens(content)
+            if content_tokens > self.chunker.max_tokens:
+                logger.info(f"内容较长（{len(content)}字符，约{content_tokens}token），使用分段处理")
+                return self._chunked_ai_generate(
+                    content, key_info, meeting_info, model, cancel_token, use_cache, on_text
+                )
 
             # 构建系统提示词
             system_prompt = self._build_system_prompt()
@@ -217,10 +288,16 @@ class AIWriter:
 
             # 尝试直接使用httpx调用，避免OpenAI客户端的问题
             try:
-                ai_response = self._direct_api_call(model, system_prompt, user_prompt)
+                ai_response = self._direct_api_call(
+                    model, system_prompt, user_prompt, cancel_token, use_cache, on_text
+                )
+            except TaskCancelledError:
+                raise
             except Exception as direct_error:
                 logger.warning(f"直接API调用失败: {direct_error}，尝试OpenAI客户端")
-                # 降级到OpenAI客户端
+                # 降级到OpenAI客户端（超时同样不超过取消令牌的剩余时间）
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
                 response = self.client.chat.completions.create(
                     model=model,
                     messages=[
@@ -229,7 +306,7 @@ class AIWriter:
                     ],
                     temperature=0.3,  # 降低随机性，提高一致性
                     max_tokens=3000,  # 恢复合理的生成长度
-                    timeout=1800  # 30分钟超时
+                    timeout=_cap_timeout(cancel_token, 1800)  # 30分钟超时
                 )
                 ai_response = response.choices[0].message.content
 
@@ -241,6 +318,8 @@ class AIWriter:
             logger.info("豆包AI生成会议纪要成功")
             return self._parse_ai_response(ai_response)
 
+        except TaskCancelledError:
+            raise
         except Exception as e:
             error_msg = str(e)
             logger.error(f"AI生成失败，错误详情: {error_msg}")
@@ -259,61 +338,65 @@ class AIWriter:
             logger.info("使用本地规则生成会议纪要")
             return self._generate_local_content(content, key_info, meeting_info)
 
-    def _direct_api_call(self, model: str, system_prompt: str, user_prompt: str) -> str:
-        """直接使用httpx调用豆包API，带重试机制"""
-        import time
-
-        ark_api_key = os.getenv("ARK_API_KEY")
-        ark_base_url = os.getenv("ARK_BASE_URL", "https://ark.cn-beijing.volces.com/api/v3")
+    def _direct_api_call(
+        self,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        直接调用豆包API（共用连接池），带重试机制（超时不超过取消令牌的剩余时间）
 
-        url = f"{ark_base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {ark_api_key}",
-            "Content-Type": "application/json"
-        }
+        传入 on_text 时流式调用，每次重试都从头回调；接收期间被取消时立即中断。
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
 
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            "temperature": 0.3,
-            "max_tokens": 3000
-        }
+        stream = on_text
+        if on_text and cancel_token:
+            def stream(text: str):
+                cancel_token.raise_if_cancelled()
+                on_text(text)
 
         # 重试配置
         max_retries = 3
         base_delay = 5  # 基础延迟5秒
 
         for attempt in range(max_retries):
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            cap = partial(_cap_timeout, cancel_token)
+
             try:
                 logger.info(f"豆包AI调用尝试 {attempt + 1}/{max_retries}")
 
                 # 使用合理的超时时间
                 timeout = httpx.Timeout(
-                    timeout=600.0,    # 总超时600秒（10分钟）
-                    connect=30.0,     # 连接超时30秒
-                    read=570.0,       # 读取超时570秒
-                    write=30.0        # 写入超时30秒
+                    timeout=cap(600.0),    # 总超时600秒（10分钟）
+                    connect=cap(30.0),     # 连接超时30秒
+                    read=cap(570.0),       # 读取超时570秒
+                    write=cap(30.0)        # 写入超时30秒
                 )
 
-                with httpx.Client(timeout=timeout) as client:
-                    response = client.post(url, headers=headers, json=payload)
-                    response.raise_for_status()
-
-                    result = response.json()
-                    if "choices" in result and len(result["choices"]) > 0:
-                        content = result["choices"][0]["message"]["content"]
-                        if content and content.strip():
-                            logger.info(f"豆包AI调用成功，尝试次数: {attempt + 1}")
-                            return content
-                        else:
-                            raise Exception("API返回空内容")
-                    else:
-                        raise Exception(f"API响应格式错误: {result}")
+                content = self.transport.chat(
+                    model, messages, max_tokens=3000, timeout=timeout, use_cache=use_cache, on_text=stream
+                )
+                if content and content.strip():
+                    logger.info(f"豆包AI调用成功，尝试次数: {attempt + 1}")
+                    return content
+                else:
+                    raise Exception("API返回空内容")
 
             except Exception as e:
+                # 因取消或到达截止时间而失败时不再重试
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+
                 error_msg = str(e)
                 logger.warning(f"豆包AI调用失败 (尝试 {attempt + 1}/{max_retries}): {error_msg}")
 
@@ -325,7 +408,347 @@ class AIWriter:
                 # 指数退避延迟
                 delay = base_delay * (2 ** attempt)
                 logger.info(f"等待 {delay} 秒后重试...")
-                time.sleep(delay)
+                if cancel_token:
+                    cancel_token.sleep(delay)
+                else:
+                    time.sleep(delay)
+
+    def _chunked_ai_generate(
+        self,
+        content: str,
+        key_info: Dict[str, Any],
+        meeting_info: Dict[str, Any],
+        model: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        分段处理长内容的AI生成
+
+        各段摘要以 chunk_concurrency 为上限并发生成（map），按原顺序合并后生成最终纪要（reduce）；
+        合并后的摘要仍超过 reduce_max_length 时，先逐级合并相邻摘要。等待期间检查取消令牌。
+        只有最终纪要通过 on_text 流式回调，各段摘要不回调。
+        """
+        try:
+            logger.info("开始分段处理长内容")
+
+            # 分割内容
+            chunks = self.chunker.split(content)
+            logger.info(f"内容分割为{len(chunks)}段，并发数{self.chunk_concurrency}")
+
+            # 并发生成各段摘要
+            start_time = time.time()
+            summaries = self._map_concurrently(
+                lambda i: self._generate_chunk_summary(
+                    chunks[i], i, len(chunks), meeting_info, model, cancel_token, use_cache
+                ),
+                len(chunks),
+                cancel_token
+            )
+            logger.info(f"所有分段摘要生成完成，耗时{time.time() - start_time:.2f}秒，开始生成最终纪要")
+
+            # 基于摘要生成最终纪要
+            sections = [(i, i, summary) for i, summary in enumerate(summaries)]
+            combined_summary = self._reduce_summaries(sections, meeting_info, model, cancel_token, use_cache)
+            final_result = self._generate_final_minutes_from_summaries(
+                combined_summary, key_info, meeting_info, model, cancel_token, use_cache, on_text
+            )
+
+            logger.info("分段处理完成")
+            return final_result
+
+        except TaskCancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"分段处理失败: {e}")
+            # 降级到本地生成
+            return self._generate_local_content(content, key_info, meeting_info)
+
+    def _map_concurrently(
+        self,
+        func: Callable[[int], str],
+        count: int,
+        cancel_token: Optional[CancelToken] = None
+    ) -> List[str]:
+        """
+        以 chunk_concurrency 为上限并发调用 func(0..count-1)，按下标顺序返回结果
+
+        被取消时不再启动新的调用并抛出 TaskCancelledError（进行中的调用在后台结束）。
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        if count <= 1 or self.chunk_concurrency == 1:
+            results = []
+            for i in range(count):
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                results.append(func(i))
+            return results
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.chunk_concurrency, count), thread_name_prefix="AIWriterChunk"
+        )
+        futures = []
+        try:
+            futures.extend(executor.submit(func, i) for i in range(count))
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=CANCEL_CHECK_INTERVAL, return_when=FIRST_COMPLETED)
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+            return [future.result() for future in futures]
+        finally:
+            # 取消尚未开始的分段（shutdown 的 cancel_futures 参数需要 Python 3.9）
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _reduce_summaries(
+        self,
+        sections: List[Tuple[int, int, str]],
+        meeting_info: Dict[str, Any],
+        model: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        合并分段摘要；超过 reduce_max_length 时将相邻摘要分组、逐级合并，直到放得下
+
+        Args:
+            sections: (起始段序号, 结束段序号, 摘要) 列表，按段落顺序排列
+        """
+        level = 0
+        while True:
+            combined = self._format_summary_sections(sections)
+            if len(combined) <= self.reduce_max_length or len(sections) <= 1:
+                return combined
+
+            groups = self._group_sections(sections)
+            if len(groups) >= len(sections):
+                # 单个摘要已超出预算，无法再合并
+                logger.warning(f"合并摘要（{len(combined)}字符）超出{self.reduce_max_length}字符，无法继续合并")
+                return combined
+
+            level += 1
+            logger.info(f"合并摘要共{len(combined)}字符，第{level}级合并：{len(sections)}段 -> {len(groups)}组")
+            merged = self._map_concurrently(
+                lambda i: self._generate_group_summary(
+                    groups[i], i, len(groups), meeting_info, model, cancel_token, use_cache
+                ),
+                len(groups),
+                cancel_token
+            )
+            sections = [(group[0][0], group[-1][1], summary) for group, summary in zip(groups, merged)]
+
+    def _group_sections(self, sections: List[Tuple[int, int, str]]) -> List[List[Tuple[int, int, str]]]:
+        """将相邻摘要按 reduce_max_length 分组（每组至少一段）"""
+        groups = []
+        current = []
+        length = 0
+        for section in sections:
+            section_length = len(self._format_summary_sections([section])) + 2
+            if current and length + section_length > self.reduce_max_length:
+                groups.append(current)
+                current, length = [], 0
+            current.append(section)
+            length += section_length
+        if current:
+            groups.append(current)
+        return groups
+
+    def _format_summary_sections(self, sections: List[Tuple[int, int, str]]) -> str:
+        """将摘要按段落顺序拼接为带标题的文本"""
+        parts = []
+        for first, last, summary in sections:
+            label = f"分段{first + 1}" if first == last else f"分段{first + 1}-{last + 1}"
+            parts.append(f"## {label}摘要\n{summary}")
+        return "\n\n".join(parts)
+
+    def _generate_chunk_summary(
+        self,
+        chunk: str,
+        chunk_index: int,
+        total_chunks: int,
+        meeting_info: Dict[str, Any],
+        model: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True
+    ) -> str:
+        """生成单个分段的摘要"""
+        topic = meeting_info.get("topic", "工作会议")
+
+        prompt = f"""
+请对以下会议记录片段进行总结，提取关键信息：
+
+会议主题：{topic}
+片段：{chunk_index + 1}/{total_chunks}
+
+会议记录片段：
+{chunk}
+
+请提取以下信息：
+1. 主要讨论议题
+2. 重要决策和结论
+3. 关键数据和指标
+4. 行动计划和责任人
+5. 其他重要信息
+
+请用简洁的要点形式总结，保持客观准确。
+"""
+        return self._summarize_with_retry(prompt, model, f"分段{chunk_index + 1}", cancel_token, use_cache)
+
+    def _generate_group_summary(
+        self,
+        sections: List[Tuple[int, int, str]],
+        group_index: int,
+        total_groups: int,
+        meeting_info: Dict[str, Any],
+        model: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True
+    ) -> str:
+        """将相邻的若干分段摘要合并为一份摘要"""
+        topic = meeting_info.get("topic", "工作会议")
+
+        prompt = f"""
+以下是同一会议连续若干片段的摘要，请将其合并为一份摘要：
+
+会议主题：{topic}
+部分：{group_index + 1}/{total_groups}
+
+{self._format_summary_sections(sections)}
+
+请按时间顺序保留主要议题、决策和结论、关键数据、行动计划和责任人，去除重复内容，用简洁的要点形式总结。
+"""
+        label = f"分段{sections[0][0] + 1}-{sections[-1][1] + 1}"
+        return self._summarize_with_retry(prompt, model, label, cancel_token, use_cache)
+
+    def _summarize_with_retry(
+        self,
+        prompt: str,
+        model: str,
+        label: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        调用大模型生成摘要，失败时按 chunk_retries 指数退避重试
+
+        Returns:
+            摘要；重试后仍失败时返回失败说明（不中断其余分段）
+        """
+        attempts = self.chunk_retries + 1
+        for attempt in range(attempts):
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            try:
+                return self._summarize(prompt, model, use_cache, cancel_token)
+            except Exception as e:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if attempt == attempts - 1:
+                    logger.error(f"生成{label}摘要失败（已尝试{attempts}次）: {e}")
+                    return f"{label}摘要生成失败: {str(e)}"
+                delay = CHUNK_RETRY_DELAY * 2 ** attempt
+                logger.warning(f"生成{label}摘要失败 (尝试 {attempt + 1}/{attempts}): {e}，{delay}秒后重试")
+                if cancel_token:
+                    cancel_token.sleep(delay)
+                else:
+                    time.sleep(delay)
+
+    def _summarize(
+        self,
+        prompt: str,
+        model: str,
+        use_cache: bool = True,
+        cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        """调用一次大模型生成摘要（超时不超过取消令牌的剩余时间）"""
+        try:
+            response = self._direct_api_call_simple(model, prompt, use_cache, cancel_token)
+            return response.strip()
+        except Exception as e:
+            if not self.client:
+                raise
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            logger.warning(f"直接API调用失败: {e}，尝试OpenAI客户端")
+            # 降级到OpenAI客户端
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1000,
+                temperature=0.3,
+                timeout=_cap_timeout(cancel_token, 300)  # 5分钟超时
+            )
+            return response.choices[0].message.content.strip()
+
+    def _direct_api_call_simple(
+        self,
+        model: str,
+        prompt: str,
+        use_cache: bool = True,
+        cancel_token: Optional[CancelToken] = None
+    ) -> str:
+        """简化的直接API调用（共用连接池，超时不超过取消令牌的剩余时间）"""
+        return self.transport.chat(
+            model, [{"role": "user", "content": prompt}], max_tokens=1000,
+            timeout=_cap_timeout(cancel_token, 300.0),  # 5分钟超时
+            use_cache=use_cache
+        )
+
+    def _generate_final_minutes_from_summaries(
+        self,
+        combined_summary: str,
+        key_info: Dict[str, Any],
+        meeting_info: Dict[str, Any],
+        model: str,
+        cancel_token: Optional[CancelToken] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """基于分段摘要生成最终会议纪要"""
+        try:
+            # 构建系统提示词
+            system_prompt = self._build_system_prompt()
+
+            # 构建用户提示词（使用合并的摘要）
+            user_prompt = self._build_user_prompt(combined_summary, key_info, meeting_info)
+
+            # 调用AI生成最终纪要
+            try:
+                ai_response = self._direct_api_call(
+                    model, system_prompt, user_prompt, cancel_token, use_cache, on_text
+                )
+            except TaskCancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"直接API调用失败: {e}，尝试OpenAI客户端")
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3,
+                    max_tokens=3000,
+                    timeout=_cap_timeout(cancel_token, 600)  # 10分钟超时
+                )
+                ai_response = response.choices[0].message.content
+
+            return self._parse_ai_response(ai_response)
+
+        except TaskCancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"生成最终会议纪要失败: {e}")
+            # 降级到本地生成
+            return self._generate_local_content(combined_summary, key_info, meeting_info)
 
     def _generate_local_content(self, content: str, key_info: Dict[str, Any], meeting_info: Dict[str, Any]) -> Dict[str, Any]:
         """本地生成会议纪要内容"""
@@ -635,15 +1058,9 @@ class AIWriter:
     
     def _extract_next_steps(self, content: str) -> List[str]:
         """提取下一步工作"""
-        next_steps = []
-        
         # 简单的关键词匹配
-        keywords = ["下一步", "接下来", "今后", "下阶段", "后续"]
-        sentences = content.split("。")
-        
-        for sentence in sentences:
-            if any(keyword in sentence for keyword in keywords):
-                next_steps.append(sentence.strip())
+        index = SentenceIndex.for_text(content)
+        next_steps = [sentence.text.strip() for sentence in index.matching(NEXT_STEP_CLASSIFIER, "next_steps")]
         
         return next_steps[:5]  # 限制数量
     
@@ -1034,19 +1451,20 @@ class AIWriter:
 
         return text.strip()
 
-    def enhance_content(self, text: str, enhancement_type: str = "expand") -> str:
+    def enhance_content(self, text: str, enhancement_type: str = "expand", use_cache: bool = True) -> str:
         """
         内容增强
 
         Args:
             text: 原始文本
             enhancement_type: 增强类型 (expand/rewrite/optimize)
+            use_cache: 为False时不使用缓存的大模型回复
 
         Returns:
             增强后的文本
         """
         if self.client:
-            return self._ai_enhance_content(text, enhancement_type)
+            return self._ai_enhance_content(text, enhancement_type, use_cache)
         else:
             # 降级到规则处理
             if enhancement_type == "expand":
@@ -1058,7 +1476,7 @@ class AIWriter:
             else:
                 return text
 
-    def _ai_enhance_content(self, text: str, enhancement_type: str) -> str:
+    def _ai_enhance_content(self, text: str, enhancement_type: str, use_cache: bool = True) -> str:
         """使用AI增强内容"""
         try:
             model = os.getenv("ARK_MODEL", "ep-202***")
@@ -1104,17 +1522,15 @@ class AIWriter:
 
             prompt = prompts.get(enhancement_type, prompts["optimize"])
 
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
+            enhanced_text = self.transport.chat(
+                model,
+                [
                     {"role": "system", "content": "你是一个专业的公文写作助手，擅长民航行业的文档处理。"},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3,
-                max_tokens=1500
-            )
-
-            enhanced_text = response.choices[0].message.content.strip()
+                max_tokens=1500,
+                use_cache=use_cache
+            ).strip()
             logger.info(f"AI内容增强完成: {enhancement_type}")
             return enhanced_text
 
@@ -1163,18 +1579,19 @@ class AIWriter:
         optimized = self._clean_filler_words(optimized)
         return optimized
 
-    def process_text_with_prompt(self, prompt: str) -> str:
+    def process_text_with_prompt(self, prompt: str, use_cache: bool = True) -> str:
         """
         使用自定义提示词处理文本
 
         Args:
             prompt: 包含处理指令和文本的完整提示词
+            use_cache: 为False时不使用缓存的大模型回复
 
         Returns:
             处理后的文本
         """
         if self.client:
-            return self._ai_process_with_prompt(prompt)
+            return self._ai_process_with_prompt(prompt, use_cache)
         else:
             # 降级处理：简单返回提示词中的文本部分
             logger.warning("AI服务不可用，返回原始文本")
@@ -1190,7 +1607,7 @@ class AIWriter:
                             return line[start+1:end]
             return "AI服务不可用，无法处理文本"
 
-    def _ai_process_with_prompt(self, prompt: str) -> str:
+    def _ai_process_with_prompt(self, prompt: str, use_cache: bool = True) -> str:
         """使用AI处理自定义提示词"""
         try:
             model = os.getenv("ARK_MODEL", "ep-202***")
@@ -1199,7 +1616,7 @@ class AIWriter:
 
             # 使用直接API调用
             try:
-                response = self._direct_api_call_simple(model, prompt)
+                response = self._direct_api_call_simple(model, prompt, use_cache)
                 logger.info("AI自定义提示词处理成功")
                 return response.strip()
             except Exception as e:
@@ -1322,167 +1739,3 @@ class MeetingTemplates:
     def get_template(self, template_type: str = "standard") -> Dict[str, str]:
         """获取模板"""
         return self.templates.get(template_type, self.templates["standard"])
-
-    def _chunked_ai_generate(self, content: str, key_info: Dict[str, Any], meeting_info: Dict[str, Any], model: str) -> Dict[str, Any]:
-        """分段处理长内容的AI生成"""
-        try:
-            logger.info("开始分段处理长内容")
-
-            # 分割内容
-            chunks = self._split_content_by_sentences(content, max_length=6000)
-            logger.info(f"内容分割为{len(chunks)}段")
-
-            # 生成各段摘要
-            summaries = []
-            for i, chunk in enumerate(chunks):
-                logger.info(f"正在处理第{i+1}/{len(chunks)}段")
-                try:
-                    summary = self._generate_chunk_summary(chunk, i, len(chunks), meeting_info, model)
-                    summaries.append(summary)
-                except Exception as e:
-                    logger.error(f"第{i+1}段处理失败: {e}")
-                    summaries.append(f"第{i+1}段处理失败: {str(e)}")
-
-            logger.info("所有分段摘要生成完成，开始生成最终纪要")
-
-            # 基于摘要生成最终纪要
-            combined_summary = "\n\n".join([f"## 分段{i+1}摘要\n{summary}" for i, summary in enumerate(summaries)])
-            final_result = self._generate_final_minutes_from_summaries(combined_summary, key_info, meeting_info, model)
-
-            logger.info("分段处理完成")
-            return final_result
-
-        except Exception as e:
-            logger.error(f"分段处理失败: {e}")
-            # 降级到本地生成
-            return self._generate_local_content(content, key_info, meeting_info)
-
-    def _split_content_by_sentences(self, content: str, max_length: int = 6000) -> List[str]:
-        """按句子分割内容"""
-        # 按句号分割
-        sentences = content.split('。')
-        chunks = []
-        current_chunk = ""
-
-        for sentence in sentences:
-            # 检查添加这个句子后是否超过长度限制
-            test_chunk = current_chunk + sentence + '。'
-            if len(test_chunk) > max_length and current_chunk:
-                # 当前块已满，保存并开始新块
-                chunks.append(current_chunk.strip())
-                current_chunk = sentence + '。'
-            else:
-                current_chunk = test_chunk
-
-        # 添加最后一块
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-
-        return chunks
-
-    def _generate_chunk_summary(self, chunk: str, chunk_index: int, total_chunks: int, meeting_info: Dict[str, Any], model: str) -> str:
-        """生成单个分段的摘要"""
-        try:
-            topic = meeting_info.get("topic", "工作会议")
-
-            prompt = f"""
-请对以下会议记录片段进行总结，提取关键信息：
-
-会议主题：{topic}
-片段：{chunk_index + 1}/{total_chunks}
-
-会议记录片段：
-{chunk}
-
-请提取以下信息：
-1. 主要讨论议题
-2. 重要决策和结论
-3. 关键数据和指标
-4. 行动计划和责任人
-5. 其他重要信息
-
-请用简洁的要点形式总结，保持客观准确。
-"""
-
-            # 使用直接API调用
-            try:
-                response = self._direct_api_call_simple(model, prompt)
-                return response.strip()
-            except Exception as e:
-                logger.warning(f"直接API调用失败: {e}，尝试OpenAI客户端")
-                # 降级到OpenAI客户端
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=1000,
-                    temperature=0.3,
-                    timeout=300  # 5分钟超时
-                )
-                return response.choices[0].message.content.strip()
-
-        except Exception as e:
-            logger.error(f"生成分段摘要失败: {e}")
-            return f"分段{chunk_index + 1}摘要生成失败: {str(e)}"
-
-    def _direct_api_call_simple(self, model: str, prompt: str) -> str:
-        """简化的直接API调用"""
-        ark_api_key = os.getenv("ARK_API_KEY")
-        ark_base_url = os.getenv("ARK_BASE_URL", "https://ark.cn-beijing.volces.com/api/v3")
-
-        url = f"{ark_base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {ark_api_key}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.3,
-            "max_tokens": 1000
-        }
-
-        timeout = httpx.Timeout(timeout=300.0)  # 5分钟超时
-
-        with httpx.Client(timeout=timeout) as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-
-    def _generate_final_minutes_from_summaries(self, combined_summary: str, key_info: Dict[str, Any], meeting_info: Dict[str, Any], model: str) -> Dict[str, Any]:
-        """基于分段摘要生成最终会议纪要"""
-        try:
-            # 构建系统提示词
-            system_prompt = self._build_system_prompt()
-
-            # 构建用户提示词（使用合并的摘要）
-            user_prompt = self._build_user_prompt(combined_summary, key_info, meeting_info)
-
-            # 调用AI生成最终纪要
-            try:
-                ai_response = self._direct_api_call(model, system_prompt, user_prompt)
-            except Exception as e:
-                logger.warning(f"直接API调用失败: {e}，尝试OpenAI客户端")
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=3000,
-                    timeout=600  # 10分钟超时
-                )
-                ai_response = response.choices[0].message.content
-
-            return self._parse_ai_response(ai_response)
-
-        except Exception as e:
-            logger.error(f"生成最终会议纪要失败: {e}")
-            # 降级到本地生成
-            return self._generate_local_content(combined_summary, key_info, meeting_info)
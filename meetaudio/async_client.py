@@ -0,0 +1,299 @@
+"""
+火山引擎语音识别异步客户端
+
+基于 httpx.AsyncClient，所有请求共享同一个连接池，
+单个事件循环即可同时跟踪大量转写任务，而无需为每个任务占用一个线程。
+"""
+
+import asyncio
+import json
+import uuid
+import time
+import logging
+from typing import Optional
+
+import httpx
+
+from .config import config
+from .models import ASRResult, TaskStatus
+from .client import BaseASRClient
+from .decoding import RawResult
+from .polling import PollingPolicy
+from .request_log import RequestLogger
+from .url_validation import PROBE_TIMEOUT, RANGE_HEADERS, AudioURLInfo, URLValidator, audio_url_info
+from .exceptions import APIError, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+# 与同步客户端 urllib3 Retry 的 status_forcelist 保持一致
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class AsyncByteDanceASRClient(BaseASRClient):
+    """火山引擎语音识别异步客户端"""
+
+    def __init__(
+        self,
+        app_key: Optional[str] = None,
+        access_key: Optional[str] = None,
+        timeout: int = None,
+        max_retries: int = None,
+        polling_policy: Optional[PollingPolicy] = None,
+        max_connections: int = 100,
+        url_validation: Optional[str] = None,
+        url_validator: Optional[URLValidator] = None
+    ):
+        """
+        初始化客户端
+
+        Args:
+            app_key: APP ID
+            access_key: Access Token
+            timeout: 请求超时时间
+            max_retries: 最大重试次数
+            polling_policy: 等待结果时使用的轮询策略，默认自适应轮询
+            max_connections: 连接池最大连接数
+            url_validation: 提交前验证音频URL的方式（blocking / pipelined / off）
+            url_validator: 验证结果缓存，默认使用进程内共享的 url_validator
+        """
+        super().__init__(
+            app_key, access_key, timeout, max_retries, polling_policy,
+            url_validation=url_validation, url_validator=url_validator
+        )
+        self.request_log = RequestLogger(logger)
+
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=self.max_retries)
+        )
+
+    async def __aenter__(self) -> "AsyncByteDanceASRClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """关闭连接池"""
+        await self.client.aclose()
+
+    async def _post(self, url: str, **kwargs) -> httpx.Response:
+        """发送POST请求，对429/5xx按指数退避重试"""
+        attempt = 0
+        while True:
+            response = await self.client.post(url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+            delay = config.RETRY_DELAY * (2 ** attempt)
+            logger.debug(f"HTTP {response.status_code}，{delay:.1f}秒后重试: {url}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def submit_audio(
+        self,
+        audio_url: str,
+        audio_format: str = "mp3",
+        model_name: str = "bigmodel",
+        enable_itn: bool = True,
+        enable_punc: bool = False,
+        enable_ddc: bool = False,
+        enable_speaker_info: bool = False,
+        enable_channel_split: bool = False,
+        show_utterances: bool = False,
+        vad_segment: bool = False,
+        user_id: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        提交音频文件进行识别
+
+        参数与 ByteDanceASRClient.submit_audio 相同。
+
+        Returns:
+            任务ID
+        """
+        task_id = str(uuid.uuid4())
+
+        # 验证音频URL的可访问性（结果按URL缓存，可信URL不再探测）
+        validation = pending = None
+        if self.url_validation == "blocking":
+            validation = await self.check_audio_url(audio_url)
+            self._ensure_accessible(validation)
+        elif self.url_validation == "pipelined":
+            validation = self._cached_audio_url(audio_url)
+            if validation is None:
+                pending = asyncio.ensure_future(self._refresh_audio_url(audio_url))
+            else:
+                self._ensure_accessible(validation)
+
+        request_data = self._build_request_data(
+            audio_url, audio_format, model_name, enable_itn, enable_punc,
+            enable_ddc, enable_speaker_info, enable_channel_split,
+            show_utterances, vad_segment, user_id, **kwargs
+        )
+        headers = self._get_headers(task_id)
+
+        self.request_log.event(logging.INFO, "submit", task_id, audio_url=audio_url, endpoint=config.SUBMIT_URL)
+        self.request_log.payload("submit.request", task_id, headers=headers, body=request_data)
+
+        try:
+            response = await self._post(config.SUBMIT_URL, json=request_data, headers=headers)
+        except httpx.HTTPError as e:
+            if pending is not None:
+                pending.cancel()
+            raise APIError(f"Failed to submit task: {str(e)}")
+
+        status_code = int(response.headers.get("X-Api-Status-Code", 0))
+        message = response.headers.get("X-Api-Message", "Unknown error")
+        self.request_log.event(
+            logging.INFO, "submit.response", task_id,
+            status_code=status_code, message=message, http_status=response.status_code
+        )
+        self.request_log.payload("submit.response", task_id, headers=response.headers, body=response.content)
+
+        if pending is not None:
+            validation = await pending
+        if status_code != 20000000:
+            # 提交失败时，URL不可访问是更明确的原因
+            if validation is not None:
+                self._ensure_accessible(validation)
+            self._handle_error(status_code, message)
+
+        actual_task_id = task_id
+        try:
+            if response.content:
+                actual_task_id = self._extract_task_id(response.json(), task_id)
+        except Exception as e:
+            logger.debug("Could not parse response body: %s", e)
+
+        self._task_logids[actual_task_id] = response.headers.get("X-Tt-Logid", "")
+        self.request_log.event(logging.INFO, "submitted", actual_task_id, logid=self._task_logids[actual_task_id])
+        self._after_submit_validation(actual_task_id, validation)
+        return actual_task_id
+
+    async def get_result(self, task_id: str) -> TaskStatus:
+        """
+        查询识别结果
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务状态和结果
+        """
+        return (await self.query_raw(task_id)).decode()
+
+    async def query_raw(self, task_id: str) -> RawResult:
+        """
+        查询识别结果，但不解码结果
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务状态和响应体原始字节，调用 decode() 得到与 get_result 相同的任务状态
+        """
+        headers = self._get_query_headers(task_id)
+        self.request_log.payload("query.request", task_id, url=config.QUERY_URL, headers=headers)
+
+        try:
+            response = await self._post(config.QUERY_URL, content=json.dumps({}), headers=headers)
+        except httpx.HTTPError as e:
+            raise APIError(f"Failed to query result: {str(e)}")
+
+        status_code = int(response.headers.get("X-Api-Status-Code", 0))
+        message = response.headers.get("X-Api-Message", "Unknown error")
+        self.request_log.poll("query", task_id, status_code=status_code, message=message, body_bytes=len(response.content))
+        self.request_log.payload("query.response", task_id, body=response.content)
+        return self._raw_result(status_code, message, response.content)
+
+    async def wait_for_result(
+        self,
+        task_id: str,
+        timeout: int = 300,
+        poll_interval: Optional[float] = None,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None
+    ) -> ASRResult:
+        """
+        等待识别完成并返回结果
+
+        Args:
+            task_id: 任务ID
+            timeout: 超时时间（秒）
+            poll_interval: 固定轮询间隔（秒），不指定时使用客户端的自适应轮询策略
+            audio_duration: 音频时长（毫秒），用于估算首次查询时间
+            audio_size: 音频文件大小（字节），没有时长时用于估算
+
+        Returns:
+            识别结果
+        """
+        start_time = time.monotonic()
+        schedule = self._start_polling(poll_interval, audio_duration, audio_size, task_id)
+        delay = schedule.first_delay()
+
+        while True:
+            remaining = timeout - (time.monotonic() - start_time)
+            if remaining <= 0:
+                break
+            if delay:
+                await asyncio.sleep(min(delay, remaining))
+
+            status = await self.get_result(task_id)
+            self.poll_counts[task_id] = schedule.polls + 1
+
+            if status.is_success:
+                if status.result:
+                    self.request_log.event(logging.INFO, "completed", task_id, polls=schedule.polls + 1)
+                    return status.result
+                raise APIError("Task completed but no result returned")
+
+            elif status.is_failed:
+                self._handle_error(status.status_code, status.message)
+
+            delay = schedule.next_delay(status.status_code)
+            self.request_log.event(
+                logging.DEBUG, "processing", task_id, message=status.message, next_poll=round(delay, 1)
+            )
+
+        raise TimeoutError(f"Task {task_id} timeout after {timeout} seconds")
+
+    async def check_audio_url(self, url: str) -> AudioURLInfo:
+        """验证音频URL的可访问性并获取内容长度和类型（参见 ByteDanceASRClient.check_audio_url）"""
+        info = self._cached_audio_url(url)
+        if info is None:
+            info = await self._refresh_audio_url(url)
+        return info
+
+    async def _refresh_audio_url(self, url: str) -> AudioURLInfo:
+        """探测URL并更新缓存"""
+        info = await self._probe_audio_url(url)
+        self._log_audio_url(info)
+        return self.url_validator.put(info)
+
+    async def _probe_audio_url(self, url: str) -> AudioURLInfo:
+        """发送HEAD请求探测URL，HEAD不可用时只请求第一个字节"""
+        try:
+            response = await self.client.head(url, timeout=PROBE_TIMEOUT, follow_redirects=True)
+            info = audio_url_info(url, response.status_code, response.headers)
+            if info.accessible:
+                return info
+            logger.debug("HEAD验证失败（状态码 %s），改用Range GET: %s", response.status_code, url)
+        except httpx.HTTPError as e:
+            logger.debug("HEAD验证异常（%s），改用Range GET: %s", e, url)
+
+        try:
+            async with self.client.stream(
+                "GET", url, headers=RANGE_HEADERS, timeout=PROBE_TIMEOUT, follow_redirects=True
+            ) as response:
+                return audio_url_info(url, response.status_code, response.headers)
+        except httpx.HTTPError as e:
+            return AudioURLInfo(url=url, accessible=False, error=str(e))
+
+    async def _validate_audio_url(self, url: str) -> bool:
+        """验证音频URL的可访问性"""
+        return (await self.check_audio_url(url)).accessible
@@ -3,7 +3,43 @@
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .matcher import TermMatcher
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 实体识别用的关键词
+DEPARTMENT_KEYWORDS = ("部", "中心", "处", "科", "组", "队")
+POSITION_KEYWORDS = ("总经理", "书记", "主任", "经理", "主管", "专员", "员")
+
+# 一次扫描同时找出机型编号和所有关键词的出现位置（同一位置优先匹配较长的关键词）
+_ENTITY_SCANNER = re.compile(
+    r'(?P<aircraft>[A-Z]\d{3}|ARJ\d+|C\d{3})|(?P<keyword>' + '|'.join(
+        re.escape(k) for k in sorted(DEPARTMENT_KEYWORDS + POSITION_KEYWORDS, key=len, reverse=True)
+    ) + ')'
+)
+# 包含在较长关键词中的其他关键词及其偏移（如"总经理"中的"经理"），扫描时一并输出
+_NESTED_KEYWORDS = {
+    keyword: [
+        (offset, inner)
+        for inner in DEPARTMENT_KEYWORDS + POSITION_KEYWORDS if inner != keyword
+        for offset in range(len(keyword) - len(inner) + 1) if keyword.startswith(inner, offset)
+    ]
+    for keyword in DEPARTMENT_KEYWORDS + POSITION_KEYWORDS
+}
+# 从某个位置起的连续汉字（在反转后的文本上匹配可得到片段起点）
+_CJK_RUN = re.compile(r'[\u4e00-\u9fa5]*')
+_DEPARTMENT_KEYWORD_SET = frozenset(DEPARTMENT_KEYWORDS)
+
+
+class AviationEntity(NamedTuple):
+    """带位置信息的民航实体"""
+    type: str                               # 实体类型，与 extract_aviation_entities 的键相同
+    text: str                               # 实体文本
+    start: int                              # 在文本（或所属分句）中的起始位置
+    end: int                                # 结束位置（不含）
+    utterance_index: Optional[int] = None   # 所属分句序号（按分句扫描时）
 
 
 class AviationTermsProcessor:
@@ -159,6 +195,12 @@ class AviationTermsProcessor:
             (r"嗯嗯", ""),
             (r"啊啊", ""),
         ]
+        self._colloquial_regexes = [
+            (re.compile(pattern), replacement) for pattern, replacement in self.colloquial_patterns
+        ]
+
+        # 术语匹配器：一次扫描完成全部术语替换（两端须满足词边界，与逐个 \b 正则替换一致）
+        self._term_matcher = TermMatcher(self.term_mapping, word_boundary=True)
     
     def normalize_text(self, text: str) -> str:
         """
@@ -173,17 +215,14 @@ class AviationTermsProcessor:
         result = text
         
         # 1. 处理口语化表达
-        for pattern, replacement in self.colloquial_patterns:
-            result = re.sub(pattern, replacement, result)
+        for pattern, replacement in self._colloquial_regexes:
+            result = pattern.sub(replacement, result)
         
-        # 2. 替换专业术语
-        for colloquial, formal in self.term_mapping.items():
-            # 使用词边界匹配，避免部分匹配
-            pattern = r'\b' + re.escape(colloquial) + r'\b'
-            result = re.sub(pattern, formal, result)
+        # 2. 替换专业术语（使用词边界匹配，避免部分匹配；同一位置优先匹配最长的术语）
+        result = self._term_matcher.replace(result)
         
         # 3. 清理多余空格
-        result = re.sub(r'\s+', ' ', result).strip()
+        result = _WHITESPACE.sub(' ', result).strip()
         
         return result
     
@@ -206,28 +245,94 @@ class AviationTermsProcessor:
             "regulations": [],  # 法规
         }
         
-        # 部门识别
-        dept_keywords = ["部", "中心", "处", "科", "组", "队"]
-        for keyword in dept_keywords:
-            pattern = r'[\u4e00-\u9fa5]+' + keyword
-            matches = re.findall(pattern, text)
-            entities["departments"].extend(matches)
+        for entity in self.scan_entities(text):
+            entities[entity.type].append(entity.text)
         
-        # 职务识别
-        position_keywords = ["总经理", "书记", "主任", "经理", "主管", "专员", "员"]
-        for pos in position_keywords:
-            if pos in text:
-                entities["positions"].append(pos)
+        # 去重（保留首次出现的顺序）
+        for key in entities:
+            entities[key] = list(dict.fromkeys(entities[key]))
         
-        # 机型识别
-        aircraft_pattern = r'[A-Z]\d{3}|ARJ\d+|C\d{3}'
-        aircraft_matches = re.findall(aircraft_pattern, text)
-        entities["aircraft_types"].extend(aircraft_matches)
+        return entities
+
+    def scan_entities(self, text: str, utterance_index: Optional[int] = None) -> List[AviationEntity]:
+        """
+        单次扫描提取民航实体及其位置
         
-        # 去重
-        for key in entities:
-            entities[key] = list(set(entities[key]))
+        部门为以部门关键词结尾的最长连续汉字片段（每个关键词在每个片段中取最后一次出现），
+        职务为职务关键词的每一次出现，机型为机型编号。
+        
+        Args:
+            text: 文本内容
+            utterance_index: 记录到实体上的分句序号
+            
+        Returns:
+            按起始位置排序的实体列表
+        """
+        entities = []
+        reversed_text = None
+        # 当前连续汉字片段的范围，以及其中各部门关键词最后一次出现的结束位置
+        run_start = run_end = -1
+        department_ends: Dict[str, int] = {}
+
+        for match in _ENTITY_SCANNER.finditer(text):
+            start = match.start()
+            if match.lastgroup == "aircraft":
+                entities.append(AviationEntity("aircraft_types", match.group(), start, match.end(), utterance_index))
+                continue
+
+            matched = match.group()
+            occurrences = [(start, matched)]
+            for offset, inner in _NESTED_KEYWORDS[matched]:
+                occurrences.append((start + offset, inner))
+            for position, keyword in occurrences:
+                if keyword not in _DEPARTMENT_KEYWORD_SET:
+                    entities.append(AviationEntity(
+                        "positions", keyword, position, position + len(keyword), utterance_index
+                    ))
+                    continue
+                if position >= run_end:
+                    # 进入新的汉字片段：先输出上一个片段中的部门
+                    self._flush_departments(text, run_start, department_ends, entities, utterance_index)
+                    if reversed_text is None:
+                        reversed_text = text[::-1]
+                    tail = len(text) - position
+                    run_start = position - (_CJK_RUN.match(reversed_text, tail).end() - tail)
+                    run_end = _CJK_RUN.match(text, position).end()
+                # 部门名称至少包含一个关键词之前的汉字
+                if position > run_start:
+                    department_ends[keyword] = position + len(keyword)
+
+        self._flush_departments(text, run_start, department_ends, entities, utterance_index)
+        entities.sort(key=lambda entity: (entity.start, entity.end))
+        return entities
+
+    @staticmethod
+    def _flush_departments(
+        text: str,
+        run_start: int,
+        department_ends: Dict[str, int],
+        entities: List[AviationEntity],
+        utterance_index: Optional[int]
+    ):
+        """输出一个汉字片段中的部门实体：从片段起点到各关键词最后一次出现处"""
+        for end in department_ends.values():
+            entities.append(AviationEntity("departments", text[run_start:end], run_start, end, utterance_index))
+        department_ends.clear()
+
+    def scan_utterance_entities(self, utterances: Sequence[Any]) -> List[AviationEntity]:
+        """
+        逐个分句提取民航实体
         
+        Args:
+            utterances: 分句列表（ASRUtterance 或字符串）
+            
+        Returns:
+            实体列表，位置相对于所属分句，utterance_index 为分句在列表中的序号
+        """
+        entities = []
+        for index, utterance in enumerate(utterances):
+            text = utterance if isinstance(utterance, str) else utterance.text
+            entities.extend(self.scan_entities(text, index))
         return entities
     
     def get_formal_term(self, colloquial_term: str) -> str:
@@ -250,6 +355,7 @@ class AviationTermsProcessor:
             custom_mapping: 自定义映射字典
         """
         self.term_mapping.update(custom_mapping)
+        self._term_matcher.add(custom_mapping)
 
 
 # 全局实例
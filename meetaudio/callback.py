@@ -0,0 +1,249 @@
+"""
+识别结果回调（Webhook）接收
+
+提交任务时携带 callback 地址后，识别服务会在任务结束时主动推送结果。
+CallbackRegistry 保存推送到的结果并唤醒等待该任务的线程，
+CallbackReceiver 是一个可独立运行的小型HTTP接收端，Web应用则可以直接把请求体交给 parse_callback。
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlparse, parse_qs
+
+from .client import parse_asr_result
+from .models import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+
+def parse_callback(
+    payload: Union[bytes, str, Dict[str, Any]],
+    headers: Optional[Mapping[str, str]] = None
+) -> Tuple[str, TaskStatus]:
+    """
+    解析并校验回调推送
+
+    任务ID依次取自 X-Api-Request-Id 请求头、请求体中的 callback_data / id / task_id；
+    状态码依次取自 X-Api-Status-Code 请求头、请求体中的 code / status_code，
+    两者都没有但带有 result 时视为成功。
+
+    Args:
+        payload: 请求体（JSON字节串、字符串或已解析的字典）
+        headers: 请求头
+
+    Returns:
+        (任务ID, 任务状态)
+
+    Raises:
+        ValueError: 推送内容不合法
+    """
+    headers = headers or {}
+
+    if isinstance(payload, (bytes, str)):
+        try:
+            data = json.loads(payload) if payload else {}
+        except ValueError as e:
+            raise ValueError(f"回调请求体不是合法的JSON: {e}")
+    else:
+        data = payload
+    if not isinstance(data, dict):
+        raise ValueError("回调请求体必须是JSON对象")
+
+    task_id = (
+        headers.get("X-Api-Request-Id")
+        or data.get("callback_data")
+        or data.get("id")
+        or data.get("task_id")
+    )
+    if not task_id or not isinstance(task_id, str):
+        raise ValueError("回调缺少任务ID")
+
+    raw_code = headers.get("X-Api-Status-Code") or data.get("code") or data.get("status_code")
+    if raw_code is None:
+        if "result" not in data:
+            raise ValueError("回调缺少状态码")
+        raw_code = 20000000
+    try:
+        status_code = int(raw_code)
+    except (TypeError, ValueError):
+        raise ValueError(f"回调状态码不合法: {raw_code}")
+
+    message = headers.get("X-Api-Message") or data.get("message") or ""
+
+    result = None
+    if status_code == 20000000:
+        try:
+            result = parse_asr_result(data)
+        except Exception as e:
+            raise ValueError(f"回调识别结果不合法: {e}")
+        if result is None:
+            raise ValueError("成功回调缺少识别结果")
+
+    return task_id, TaskStatus(status_code=status_code, message=message, result=result)
+
+
+class CallbackRegistry:
+    """回调结果登记处：保存推送的任务终态，并唤醒等待者"""
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        Args:
+            max_entries: 最多保留的任务状态数量，超出后淘汰最早的
+        """
+        self.max_entries = max_entries
+        self._statuses: "OrderedDict[str, TaskStatus]" = OrderedDict()
+        self._aliases: "OrderedDict[str, str]" = OrderedDict()
+        self._condition = threading.Condition()
+
+    def alias(self, pushed_id: str, task_id: str):
+        """登记别名：推送中的ID（如客户端生成的请求ID）对应服务端返回的任务ID"""
+        if pushed_id != task_id:
+            with self._condition:
+                self._aliases[pushed_id] = task_id
+                while len(self._aliases) > self.max_entries:
+                    self._aliases.popitem(last=False)
+
+    def publish(self, task_id: str, status: TaskStatus):
+        """
+        登记任务的终态（成功且带结果，或失败）并唤醒所有等待者
+
+        处理中等非终态推送只记录日志不登记，否则等待者会反复拿到同一个非终态而不再等待和查询。
+        """
+        if not ((status.is_success and status.result is not None) or status.is_failed):
+            logger.info(f"收到任务回调: {task_id} (状态码: {status.status_code}，非终态，忽略)")
+            return
+        with self._condition:
+            task_id = self._aliases.get(task_id, task_id)
+            self._statuses[task_id] = status
+            self._statuses.move_to_end(task_id)
+            while len(self._statuses) > self.max_entries:
+                self._statuses.popitem(last=False)
+            self._condition.notify_all()
+        logger.info(f"收到任务回调: {task_id} (状态码: {status.status_code})")
+
+    def get(self, task_id: str) -> Optional[TaskStatus]:
+        """获取已推送的任务状态"""
+        with self._condition:
+            return self._statuses.get(task_id)
+
+    def wait(self, task_id: str, timeout: Optional[float] = None) -> Optional[TaskStatus]:
+        """
+        等待任务状态推送
+
+        Args:
+            task_id: 任务ID
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            推送到的任务状态，超时返回None
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: task_id in self._statuses, timeout)
+            return self._statuses.get(task_id)
+
+    def discard(self, task_id: str):
+        """移除任务状态"""
+        with self._condition:
+            self._statuses.pop(task_id, None)
+
+
+class CallbackReceiver:
+    """独立运行的回调接收端（基于标准库 http.server）"""
+
+    def __init__(
+        self,
+        registry: Optional[CallbackRegistry] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/asr/callback",
+        token: Optional[str] = None,
+        public_url: Optional[str] = None
+    ):
+        """
+        Args:
+            registry: 结果登记处，默认新建
+            host: 监听地址
+            port: 监听端口，0表示随机端口
+            path: 回调路径
+            token: 校验令牌；设置后回调地址需带 ?token=<token>
+            public_url: 对外可访问的地址（经过反向代理时使用），默认取监听地址
+        """
+        self.registry = registry or CallbackRegistry()
+        self.path = path
+        self.token = token
+        self._public_url = public_url
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """提交任务时使用的回调地址"""
+        if self._public_url:
+            base = self._public_url
+        else:
+            host, port = self._server.server_address[:2]
+            base = f"http://{host}:{port}{self.path}"
+        return f"{base}?token={self.token}" if self.token else base
+
+    def start(self) -> "CallbackReceiver":
+        """在后台线程中启动"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="ASRCallbackReceiver", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"回调接收端已启动: {self.url}")
+        return self
+
+    def stop(self):
+        """停止接收"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "CallbackReceiver":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _make_handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                if parsed.path != receiver.path:
+                    self._reply(404, {"success": False, "error": "not found"})
+                    return
+                if receiver.token and parse_qs(parsed.query).get("token", [None])[0] != receiver.token:
+                    self._reply(403, {"success": False, "error": "invalid token"})
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                try:
+                    task_id, status = parse_callback(body, self.headers)
+                except ValueError as e:
+                    logger.warning(f"拒绝非法回调: {e}")
+                    self._reply(400, {"success": False, "error": str(e)})
+                    return
+
+                receiver.registry.publish(task_id, status)
+                self._reply(200, {"success": True})
+
+            def _reply(self, code: int, body: Dict[str, Any]):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug("callback receiver: " + format, *args)
+
+        return Handler
@@ -0,0 +1,60 @@
+"""
+协作式取消
+
+长时间运行的操作（如分段调用大模型生成会议纪要）在每一步之间检查 CancelToken，
+在任务被取消或超过截止时间时尽快退出；单次网络调用的超时也不会超过剩余时间。
+"""
+
+import threading
+import time
+from typing import Optional
+
+from .exceptions import TaskCancelledError
+
+
+class CancelToken:
+    """取消令牌（线程安全）"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Args:
+            timeout: 距截止时间的秒数，None表示不限时
+        """
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def cancel(self, reason: str = "cancelled"):
+        """取消（重复调用时保留第一次的原因）"""
+        if self.reason is None:
+            self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已取消或超时"""
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("timeout")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """距截止时间的剩余秒数，不限时返回None"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cap_timeout(self, timeout: float) -> float:
+        """将单次操作的超时限制在剩余时间内"""
+        remaining = self.remaining()
+        return timeout if remaining is None else max(0.001, min(timeout, remaining))
+
+    def raise_if_cancelled(self):
+        """已取消或超时时抛出 TaskCancelledError"""
+        if self.cancelled:
+            message = "任务执行超时" if self.reason == "timeout" else "任务已取消"
+            raise TaskCancelledError(message)
+
+    def sleep(self, seconds: float):
+        """可被取消打断的等待；被取消时抛出 TaskCancelledError"""
+        self._event.wait(self.cap_timeout(seconds))
+        self.raise_if_cancelled()
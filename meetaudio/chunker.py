@@ -0,0 +1,169 @@
+"""
+按token预算分段
+
+长会议记录需要分段摘要。这里在所有中英文句末标点和换行（说话人轮次）处切分，
+用本地规则估算token数（不依赖分词器），再按token预算贪心装箱，相邻分段可重叠若干token以保留上下文。
+切分、估算和装箱都只扫描一遍文本，耗时与文本长度成线性。
+"""
+
+import math
+import re
+from typing import List, NamedTuple
+
+# 中日韩文字：常见大模型分词器中平均约0.7个token一个字
+CJK_TOKENS_PER_CHAR = 0.7
+
+# 英文单词和数字：平均约4个字符一个token
+CHARS_PER_WORD_TOKEN = 4
+
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_CJK_PATTERN = re.compile(f"[{_CJK_RANGES}]")
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+# 其余非空白字符（标点、符号）各算一个token
+_SYMBOL_PATTERN = re.compile(f"[^\\sA-Za-z0-9_{_CJK_RANGES}]")
+
+# 句末标点（连同其后的引号、括号）或换行；英文句点后须为空白，避免切开小数和缩写中的点
+_BOUNDARY_PATTERN = re.compile(r"(?:[。！？!?；;…]+|\.(?=\s))[”’\"'」』）)\]】]*|\n")
+
+# 说话人轮次的标题行，如“党委书记发言：”“说话人1:”
+_SPEAKER_PATTERN = re.compile(r"[^\s：:。！？!?；;]{1,20}[：:]")
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本的token数"""
+    cjk = len(_CJK_PATTERN.findall(text))
+    words = sum(-(-len(word) // CHARS_PER_WORD_TOKEN) for word in _WORD_PATTERN.findall(text))
+    symbols = len(_SYMBOL_PATTERN.findall(text))
+    return math.ceil(cjk * CJK_TOKENS_PER_CHAR) + words + symbols
+
+
+class Segment(NamedTuple):
+    """切分出的句子或说话人标题行"""
+    text: str     # 原文（含句末标点和其后的空白），所有片段依次拼接即为原文
+    tokens: int   # 估算的token数
+    speaker: bool  # 是否为说话人轮次的标题行
+
+
+class TokenChunker:
+    """按token预算分段"""
+
+    def __init__(self, max_tokens: int = 6000, overlap_tokens: int = 0):
+        """
+        Args:
+            max_tokens: 每段的token预算
+            overlap_tokens: 相邻分段重叠的token数上限（重复上一段末尾的若干句）
+
+        Raises:
+            ValueError: 预算不是正数，或重叠不小于预算的一半
+        """
+        if max_tokens <= 0:
+            raise ValueError(f"分段token预算必须为正数: {max_tokens}")
+        if not 0 <= overlap_tokens < max_tokens / 2:
+            raise ValueError(f"分段重叠token数须小于预算的一半: {overlap_tokens}")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def segments(self, text: str) -> List[Segment]:
+        """在句末标点和换行处切分，超出预算的长句按字符数硬切"""
+        segments = []
+        start = 0
+        for match in _BOUNDARY_PATTERN.finditer(text):
+            self._append_segment(segments, text[start:match.end()])
+            start = match.end()
+        if start < len(text):
+            self._append_segment(segments, text[start:])
+        return segments
+
+    def _append_segment(self, segments: List[Segment], text: str):
+        tokens = estimate_tokens(text)
+        if tokens <= self.max_tokens:
+            speaker = text.endswith("\n") and _SPEAKER_PATTERN.fullmatch(text.strip()) is not None
+            segments.append(Segment(text, tokens, speaker))
+            return
+        # 没有标点的长段落：逐字累计token数，切成不超过预算的片段
+        for piece in self._hard_split(text):
+            segments.append(Segment(piece, estimate_tokens(piece), False))
+
+    def _hard_split(self, text: str) -> List[str]:
+        """
+        逐字切分超出预算的文本，每段的 estimate_tokens 不超过预算
+
+        按与 estimate_tokens 相同的规则逐字累计（中日韩文字、单词、符号分别计数），
+        中英文混排时也不会因平均比例失准而超出预算。
+        """
+        pieces = []
+        start = 0
+        cjk = word_tokens = word_length = symbols = 0
+        for i, char in enumerate(text):
+            is_cjk = _CJK_PATTERN.match(char) is not None
+            is_word = _WORD_PATTERN.match(char) is not None
+            is_symbol = not is_cjk and not is_word and _SYMBOL_PATTERN.match(char) is not None
+
+            next_cjk = cjk + is_cjk
+            next_word_length = word_length + 1 if is_word else 0
+            next_word_tokens = word_tokens if is_word else word_tokens + -(-word_length // CHARS_PER_WORD_TOKEN)
+            next_symbols = symbols + is_symbol
+            total = (math.ceil(next_cjk * CJK_TOKENS_PER_CHAR) + next_word_tokens
+                     + -(-next_word_length // CHARS_PER_WORD_TOKEN) + next_symbols)
+
+            if total > self.max_tokens and i > start:
+                pieces.append(text[start:i])
+                start = i
+                next_cjk, next_word_length, next_word_tokens, next_symbols = int(is_cjk), int(is_word), 0, int(is_symbol)
+            cjk, word_length, word_tokens, symbols = next_cjk, next_word_length, next_word_tokens, next_symbols
+
+        if start < len(text):
+            pieces.append(text[start:])
+        return pieces
+
+    def split(self, text: str) -> List[str]:
+        """
+        将文本分段
+
+        按原文顺序把片段装入当前分段，放不下时开始新分段；新分段先重复上一段末尾不超过 overlap_tokens 的句子。
+        说话人标题行不会留在分段末尾，而是与其后的发言放在同一段。
+
+        Returns:
+            各段文本（去除首尾空白，不含空段）
+        """
+        chunks: List[str] = []
+        current: List[Segment] = []
+        tokens = 0
+        # 当前分段是否有上一段没有的内容（只有重叠内容时不输出）
+        fresh = False
+
+        for segment in self.segments(text):
+            if fresh and tokens + segment.tokens > self.max_tokens:
+                carried = []
+                while len(current) > 1 and current[-1].speaker:
+                    carried.append(current.pop())
+                chunks.append("".join(s.text for s in current).strip())
+
+                overlap = self._overlap(current) + carried[::-1]
+                tokens = sum(s.tokens for s in overlap)
+                # 重叠部分加上新片段超出预算时，从最早的重叠句开始舍弃
+                while overlap and tokens + segment.tokens > self.max_tokens:
+                    tokens -= overlap.pop(0).tokens
+                current = overlap
+                fresh = bool(carried)
+
+            current.append(segment)
+            tokens += segment.tokens
+            fresh = fresh or bool(segment.text.strip())
+
+        if fresh:
+            chunks.append("".join(s.text for s in current).strip())
+        return [chunk for chunk in chunks if chunk]
+
+    def _overlap(self, segments: List[Segment]) -> List[Segment]:
+        """分段末尾不超过 overlap_tokens 的句子"""
+        if not self.overlap_tokens:
+            return []
+        overlap = []
+        tokens = 0
+        for segment in reversed(segments):
+            if tokens + segment.tokens > self.overlap_tokens:
+                break
+            overlap.append(segment)
+            tokens += segment.tokens
+        return overlap[::-1]
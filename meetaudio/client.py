@@ -5,60 +5,202 @@
 import json
 import uuid
 import time
+import heapq
 import logging
-from typing import Optional, Dict, Any, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, Union, Iterable, Iterator, Tuple, TYPE_CHECKING
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .config import config
-from .models import ASRResult, TaskStatus, SubmitRequest
+from .polling import PollingPolicy, PollSchedule
+from .models import ASRResult, ASRUtterance, AudioInfo, TaskStatus, SubmitRequest
+from .decoding import RawResult, columnar_asr_result
+from .streaming import STREAM_CHUNK_SIZE, ResultBuilder
+from .request_log import RequestLogger
+from .url_validation import (
+    URL_VALIDATION_MODES, PROBE_TIMEOUT, RANGE_HEADERS, AudioURLInfo, URLValidator,
+    audio_url_info, url_validator as default_url_validator
+)
 from .exceptions import (
     ByteDanceASRError, APIError, AuthenticationError,
     TimeoutError, STATUS_CODE_EXCEPTIONS
 )
 
+if TYPE_CHECKING:
+    from .callback import CallbackRegistry
+
 logger = logging.getLogger(__name__)
 
+# pipelined 模式下与提交同时进行的URL验证：所有客户端共用一个线程池，首次使用时创建
+URL_CHECK_WORKERS = 4
+_url_executor: Optional[ThreadPoolExecutor] = None
+_url_executor_lock = threading.Lock()
+
+
+def _shared_url_executor() -> ThreadPoolExecutor:
+    """进程内共享的URL验证线程池（客户端可反复创建，不会各自遗留线程）"""
+    global _url_executor
+    with _url_executor_lock:
+        if _url_executor is None:
+            _url_executor = ThreadPoolExecutor(max_workers=URL_CHECK_WORKERS, thread_name_prefix="URLCheck")
+        return _url_executor
+
+
+def parse_asr_result(data: Dict[str, Any], columnar: bool = False) -> Optional[ASRResult]:
+    """
+    将查询响应体（或回调推送体）转换为ASRResult，没有result字段时返回None
+
+    Args:
+        data: 响应体
+        columnar: 为True时分句存为列式的 UtteranceStore，不逐句创建 pydantic 对象
+                  （适用于开启单词级信息的长会议，分句在访问时才生成）
+    """
+    if "result" not in data:
+        return None
+
+    result_data = data["result"]
+    if columnar:
+        return columnar_asr_result(result_data)
+
+    # 处理audio_info
+    if "audio_info" in result_data and isinstance(result_data["audio_info"], dict):
+        result_data["audio_info"] = AudioInfo(**result_data["audio_info"])
+
+    # 处理utterances
+    if "utterances" in result_data and isinstance(result_data["utterances"], list):
+        utterances = []
+        for utterance_data in result_data["utterances"]:
+            if isinstance(utterance_data, dict):
+                utterances.append(ASRUtterance(**utterance_data))
+            else:
+                utterances.append(utterance_data)
+        result_data["utterances"] = utterances
+
+    return ASRResult(**result_data)
+
+
+class BaseASRClient:
+    """同步与异步客户端共用的请求构建、结果解析和错误映射逻辑"""
+
+    # 识别结果的分句是否存为列式的 UtteranceStore
+    columnar = False
 
-class ByteDanceASRClient:
-    """火山引擎语音识别客户端"""
-    
     def __init__(
         self,
         app_key: Optional[str] = None,
         access_key: Optional[str] = None,
         timeout: int = None,
-        max_retries: int = None
+        max_retries: int = None,
+        polling_policy: Optional[PollingPolicy] = None,
+        callback_url: Optional[str] = None,
+        callback_registry: Optional["CallbackRegistry"] = None,
+        url_validation: Optional[str] = None,
+        url_validator: Optional[URLValidator] = None
     ):
         """
         初始化客户端
-        
+
         Args:
             app_key: APP ID
             access_key: Access Token
             timeout: 请求超时时间
             max_retries: 最大重试次数
+            polling_policy: 等待结果时使用的轮询策略，默认自适应轮询
+            callback_url: 默认回调地址，提交任务时自动附带
+            callback_registry: 回调结果登记处，等待结果时优先使用推送的结果
+            url_validation: 提交前验证音频URL的方式：blocking（先验证再提交）、pipelined
+                            （验证与提交同时进行）、off（不验证），默认 config.URL_VALIDATION
+            url_validator: 验证结果缓存，默认使用进程内共享的 url_validator
         """
         self.app_key = app_key or config.APP_KEY
         self.access_key = access_key or config.ACCESS_KEY
         self.timeout = timeout or config.DEFAULT_TIMEOUT
         self.max_retries = max_retries or config.MAX_RETRIES
-        
+
         if not self.app_key or not self.access_key:
             raise AuthenticationError("APP_KEY and ACCESS_KEY are required")
-        
-        # 配置HTTP会话
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=config.RETRY_DELAY,
-            status_forcelist=[429, 500, 502, 503, 504],
+
+        self.polling_policy = polling_policy or PollingPolicy()
+        self.callback_url = callback_url
+        self.callback_registry = callback_registry
+
+        self.url_validation = url_validation or config.URL_VALIDATION
+        if self.url_validation not in URL_VALIDATION_MODES:
+            raise ValueError(f"url_validation must be one of {URL_VALIDATION_MODES}, got {self.url_validation!r}")
+        self.url_validator = url_validator or default_url_validator
+
+        # 请求日志（结构化、延迟格式化）
+        self.request_log = RequestLogger(logger)
+
+        # 任务ID -> X-Tt-Logid，查询时回传
+        self._task_logids: Dict[str, str] = {}
+        # 任务ID -> 等待该任务完成所用的查询次数
+        self.poll_counts: Dict[str, int] = {}
+        # 任务ID -> 提交时音频URL的验证结果
+        self._task_audio: Dict[str, AudioURLInfo] = {}
+
+    def _start_polling(
+        self,
+        poll_interval: Optional[float] = None,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None,
+        task_id: Optional[str] = None
+    ) -> PollSchedule:
+        """
+        创建轮询调度；显式指定 poll_interval 时使用固定间隔
+
+        没有时长和大小时，使用提交时验证音频URL得到的文件大小估算处理耗时。
+        """
+        policy = self.polling_policy if poll_interval is None else PollingPolicy.fixed(poll_interval)
+        if audio_duration is None and audio_size is None and task_id in self._task_audio:
+            audio_size = self._task_audio[task_id].content_length
+        return policy.start(audio_duration=audio_duration, audio_size=audio_size)
+
+    def audio_url_info(self, task_id: str) -> Optional[AudioURLInfo]:
+        """提交任务时音频URL的验证结果（内容长度、类型等），未验证时返回None"""
+        return self._task_audio.get(task_id)
+
+    def _cached_audio_url(self, url: str) -> Optional[AudioURLInfo]:
+        """缓存中的验证结果（含可信URL）"""
+        info = self.url_validator.get(url)
+        if info is not None:
+            logger.debug("URL验证命中缓存: %s (trusted=%s)", url, info.trusted)
+        return info
+
+    def _log_audio_url(self, info: AudioURLInfo):
+        """记录一次URL探测"""
+        level = logging.INFO if info.accessible else logging.WARNING
+        self.request_log.event(
+            level, "audio_url", "", url=info.url, status_code=info.status_code,
+            content_length=info.content_length, content_type=info.content_type, error=info.error
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-    
+
+    def _ensure_accessible(self, info: AudioURLInfo):
+        """URL不可访问时抛出异常"""
+        if not info.accessible:
+            raise APIError(f"音频文件URL无法访问: {info.url}")
+
+    def _after_submit_validation(self, task_id: str, info: Optional[AudioURLInfo]):
+        """提交成功后记录验证结果；与提交同时进行的验证失败时只告警（任务已被服务端接受）"""
+        if info is None:
+            return
+        self._task_audio[task_id] = info
+        if not info.accessible:
+            logger.warning("任务 %s 已提交，但音频URL验证失败，识别服务可能无法下载: %s", task_id, info.url)
+
+    def _apply_callback(self, task_id: str, kwargs: Dict[str, Any]):
+        """未显式指定回调时附带默认回调地址，并以请求ID作为callback_data以便回调定位任务"""
+        if self.callback_url and "callback" not in kwargs:
+            kwargs["callback"] = self.callback_url
+            kwargs.setdefault("callback_data", task_id)
+
+    def get_poll_count(self, task_id: str) -> int:
+        """获取任务等待期间的查询次数"""
+        return self.poll_counts.get(task_id, 0)
+
     def _get_headers(self, request_id: str) -> Dict[str, str]:
         """获取请求头"""
         return {
@@ -69,6 +211,135 @@ class ByteDanceASRClient:
             "X-Api-Request-Id": request_id,
             "X-Api-Sequence": config.SEQUENCE,
         }
+
+    def _get_query_headers(self, task_id: str) -> Dict[str, str]:
+        """获取查询请求头（使用任务ID作为请求ID，并附带X-Tt-Logid）"""
+        headers = self._get_headers(task_id)
+        if task_id in self._task_logids:
+            headers["X-Tt-Logid"] = self._task_logids[task_id]
+        return headers
+
+    def _build_request_data(
+        self,
+        audio_url: str,
+        audio_format: str,
+        model_name: str,
+        enable_itn: bool,
+        enable_punc: bool,
+        enable_ddc: bool,
+        enable_speaker_info: bool,
+        enable_channel_split: bool,
+        show_utterances: bool,
+        vad_segment: bool,
+        user_id: Optional[str],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """构建提交任务的请求体"""
+        request_data = {
+            "audio": {
+                "url": audio_url,
+                "format": audio_format,
+                **{k: v for k, v in kwargs.items() if k in ["codec", "rate", "bits", "channel"]}
+            },
+            "request": {
+                "model_name": model_name,
+                "enable_itn": enable_itn,
+                "enable_punc": enable_punc,
+                "enable_ddc": enable_ddc,
+                "enable_speaker_info": enable_speaker_info,
+                "enable_channel_split": enable_channel_split,
+                "show_utterances": show_utterances,
+                "vad_segment": vad_segment,
+                **{k: v for k, v in kwargs.items() if k in [
+                    "end_window_size", "sensitive_words_filter", "corpus",
+                    "boosting_table_name", "context"
+                ]}
+            }
+        }
+
+        if user_id:
+            request_data["user"] = {"uid": user_id}
+
+        if "callback" in kwargs:
+            request_data["callback"] = kwargs["callback"]
+        if "callback_data" in kwargs:
+            request_data["callback_data"] = kwargs["callback_data"]
+
+        return request_data
+
+    def _extract_task_id(self, data: Any, default: str) -> str:
+        """从提交响应体中取服务端返回的任务ID，没有则使用客户端生成的ID"""
+        if isinstance(data, dict):
+            if "id" in data:
+                logger.info("Server returned task ID: %s", data["id"])
+                return data["id"]
+            if "task_id" in data:
+                logger.info("Server returned task ID: %s", data["task_id"])
+                return data["task_id"]
+        return default
+
+    def _parse_result_data(self, data: Dict[str, Any]) -> Optional[ASRResult]:
+        """将查询响应体转换为ASRResult"""
+        return parse_asr_result(data, columnar=self.columnar)
+
+    def _raw_result(self, status_code: int, message: str, content: bytes) -> RawResult:
+        """包装查询响应，识别结果留待 decode() 时解码"""
+        return RawResult(TaskStatus(status_code=status_code, message=message), content, columnar=self.columnar)
+
+    def _handle_error(self, status_code: int, message: str):
+        """处理错误"""
+        exception_class = STATUS_CODE_EXCEPTIONS.get(status_code, APIError)
+        raise exception_class(f"API Error {status_code}: {message}", status_code)
+
+
+class ByteDanceASRClient(BaseASRClient):
+    """火山引擎语音识别客户端"""
+    
+    def __init__(
+        self,
+        app_key: Optional[str] = None,
+        access_key: Optional[str] = None,
+        timeout: int = None,
+        max_retries: int = None,
+        polling_policy: Optional[PollingPolicy] = None,
+        callback_url: Optional[str] = None,
+        callback_registry: Optional["CallbackRegistry"] = None,
+        stream_results: bool = False,
+        url_validation: Optional[str] = None,
+        url_validator: Optional[URLValidator] = None
+    ):
+        """
+        初始化客户端
+        
+        Args:
+            app_key: APP ID
+            access_key: Access Token
+            timeout: 请求超时时间
+            max_retries: 最大重试次数
+            polling_policy: 等待结果时使用的轮询策略，默认自适应轮询
+            callback_url: 默认回调地址，提交任务时自动附带
+            callback_registry: 回调结果登记处，等待结果时优先使用推送的结果
+            stream_results: 为True时 get_result 边读取边解析响应体（见 stream_result），
+                            适用于开启单词时间戳的多小时会议
+            url_validation: 提交前验证音频URL的方式（blocking / pipelined / off）
+            url_validator: 验证结果缓存，默认使用进程内共享的 url_validator
+        """
+        super().__init__(
+            app_key, access_key, timeout, max_retries, polling_policy,
+            callback_url, callback_registry, url_validation, url_validator
+        )
+        self.stream_results = stream_results
+        
+        # 配置HTTP会话
+        self.session = requests.Session()
+        retry_strategy = Retry(
+            total=self.max_retries,
+            backoff_factor=config.RETRY_DELAY,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(max_retries=retry_strategy)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
     def submit_audio(
         self,
@@ -107,48 +378,30 @@ class ByteDanceASRClient:
         """
         task_id = str(uuid.uuid4())
 
-        # 验证音频URL的可访问性
-        if not self._validate_audio_url(audio_url):
-            raise APIError(f"音频文件URL无法访问: {audio_url}")
+        # 验证音频URL的可访问性（结果按URL缓存，可信URL不再探测）
+        validation = pending = None
+        if self.url_validation == "blocking":
+            validation = self.check_audio_url(audio_url)
+            self._ensure_accessible(validation)
+        elif self.url_validation == "pipelined":
+            validation = self._cached_audio_url(audio_url)
+            if validation is None:
+                pending = _shared_url_executor().submit(self._refresh_audio_url, audio_url)
+            else:
+                self._ensure_accessible(validation)
 
         # 构建请求数据
-        request_data = {
-            "audio": {
-                "url": audio_url,
-                "format": audio_format,
-                **{k: v for k, v in kwargs.items() if k in ["codec", "rate", "bits", "channel"]}
-            },
-            "request": {
-                "model_name": model_name,
-                "enable_itn": enable_itn,
-                "enable_punc": enable_punc,
-                "enable_ddc": enable_ddc,
-                "enable_speaker_info": enable_speaker_info,
-                "enable_channel_split": enable_channel_split,
-                "show_utterances": show_utterances,
-                "vad_segment": vad_segment,
-                **{k: v for k, v in kwargs.items() if k in [
-                    "end_window_size", "sensitive_words_filter", "corpus",
-                    "boosting_table_name", "context"
-                ]}
-            }
-        }
-        
-        if user_id:
-            request_data["user"] = {"uid": user_id}
-        
-        if "callback" in kwargs:
-            request_data["callback"] = kwargs["callback"]
-        if "callback_data" in kwargs:
-            request_data["callback_data"] = kwargs["callback_data"]
-        
+        self._apply_callback(task_id, kwargs)
+        request_data = self._build_request_data(
+            audio_url, audio_format, model_name, enable_itn, enable_punc,
+            enable_ddc, enable_speaker_info, enable_channel_split,
+            show_utterances, vad_segment, user_id, **kwargs
+        )
+
         headers = self._get_headers(task_id)
 
-        # 记录详细的请求信息用于调试
-        logger.info(f"提交ASR任务 - URL: {audio_url}")
-        logger.info(f"请求数据: {request_data}")
-        logger.info(f"请求头: {headers}")
-        logger.info(f"API端点: {config.SUBMIT_URL}")
+        self.request_log.event(logging.INFO, "submit", task_id, audio_url=audio_url, endpoint=config.SUBMIT_URL)
+        self.request_log.payload("submit.request", task_id, headers=headers, body=request_data)
 
         try:
             response = self.session.post(
@@ -162,14 +415,16 @@ class ByteDanceASRClient:
             status_code = int(response.headers.get("X-Api-Status-Code", 0))
             message = response.headers.get("X-Api-Message", "Unknown error")
 
-            # 记录响应信息用于调试
-            logger.info(f"ASR API响应 - 状态码: {status_code}, 消息: {message}")
-            logger.info(f"HTTP状态码: {response.status_code}")
-            logger.info(f"响应头: {dict(response.headers)}")
-            if response.content:
-                logger.info(f"响应体: {response.text}")
+            self.request_log.event(
+                logging.INFO, "submit.response", task_id,
+                status_code=status_code, message=message, http_status=response.status_code
+            )
+            self.request_log.payload("submit.response", task_id, headers=response.headers, body=response.content)
 
             if status_code != 20000000:
+                # 提交失败时，URL不可访问是更明确的原因
+                if pending is not None:
+                    self._ensure_accessible(pending.result())
                 # 特别处理TOS URL相关的错误
                 if "不存在" in message or "过期" in message:
                     logger.error(f"音频文件访问失败 - URL: {audio_url}, 错误: {message}")
@@ -178,28 +433,22 @@ class ByteDanceASRClient:
 
             # 获取X-Tt-Logid用于后续查询
             x_tt_logid = response.headers.get("X-Tt-Logid", "")
-            logger.info(f"X-Tt-Logid: {x_tt_logid}")
 
             # 检查响应体中是否有实际的任务ID
             actual_task_id = task_id  # 默认使用客户端生成的ID
             try:
                 if response.content:
-                    data = response.json()
-                    if "id" in data:
-                        actual_task_id = data["id"]
-                        logger.info(f"Server returned task ID: {actual_task_id}")
-                    elif "task_id" in data:
-                        actual_task_id = data["task_id"]
-                        logger.info(f"Server returned task ID: {actual_task_id}")
+                    actual_task_id = self._extract_task_id(response.json(), task_id)
             except Exception as e:
-                logger.debug(f"Could not parse response body: {e}")
+                logger.debug("Could not parse response body: %s", e)
 
-            logger.info(f"Task submitted successfully: {actual_task_id}")
+            self.request_log.event(logging.INFO, "submitted", actual_task_id, logid=x_tt_logid)
 
             # 存储X-Tt-Logid以供查询使用
-            if not hasattr(self, '_task_logids'):
-                self._task_logids = {}
             self._task_logids[actual_task_id] = x_tt_logid
+            if self.callback_registry:
+                self.callback_registry.alias(task_id, actual_task_id)
+            self._after_submit_validation(actual_task_id, pending.result() if pending is not None else validation)
 
             return actual_task_id
             
@@ -216,21 +465,73 @@ class ByteDanceASRClient:
         Returns:
             任务状态和结果
         """
-        # 使用任务ID作为请求ID进行查询
-        headers = self._get_headers(task_id)
+        if self.stream_results:
+            return self.stream_result(task_id)
+        return self.query_raw(task_id).decode()
 
-        # 添加X-Tt-Logid（如果有的话）
-        if hasattr(self, '_task_logids') and task_id in self._task_logids:
-            headers["X-Tt-Logid"] = self._task_logids[task_id]
-            logger.info(f"使用X-Tt-Logid进行查询: {self._task_logids[task_id]}")
+    def stream_result(self, task_id: str, builder: Optional[ResultBuilder] = None) -> TaskStatus:
+        """
+        查询识别结果，边读取响应体边解析
+
+        分句逐个解码后追加到列式存储（UtteranceStore），不缓存完整的响应体，
+        也不生成完整的字典，内存峰值与会议时长无关。
+
+        Args:
+            task_id: 任务ID
+            builder: 接收解析结果的构建器，默认新建 ResultBuilder
+
+        Returns:
+            任务状态和结果（分句为 UtteranceStore）
+        """
+        headers = self._get_query_headers(task_id)
+
+        try:
+            response = self.session.post(
+                config.QUERY_URL,
+                data=json.dumps({}),
+                headers=headers,
+                timeout=self.timeout,
+                stream=True
+            )
+            with response:
+                status_code = int(response.headers.get("X-Api-Status-Code", 0))
+                message = response.headers.get("X-Api-Message", "Unknown error")
+
+                result = None
+                if status_code == 20000000:
+                    builder = builder or ResultBuilder()
+                    try:
+                        if builder.feed(response.iter_content(STREAM_CHUNK_SIZE)):
+                            result = builder.build()
+                    except requests.RequestException:
+                        raise
+                    except Exception as e:
+                        logger.warning("Failed to parse result: %s", e)
+                self.request_log.poll("query", task_id, status_code=status_code, message=message, streamed=True)
+
+            return TaskStatus(status_code=status_code, message=message, result=result)
+
+        except requests.RequestException as e:
+            raise APIError(f"Failed to query result: {str(e)}")
+
+    def query_raw(self, task_id: str) -> RawResult:
+        """
+        查询识别结果，但不解码结果
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务状态和响应体原始字节，调用 decode() 得到与 get_result 相同的任务状态
+        """
+        # 使用任务ID作为请求ID进行查询，并添加X-Tt-Logid（如果有的话）
+        headers = self._get_query_headers(task_id)
 
         # 根据官方示例，查询时传递空的JSON对象
         request_data = {}
 
         try:
-            logger.info(f"查询任务 - URL: {config.QUERY_URL}")
-            logger.info(f"查询请求头: {headers}")
-            logger.debug(f"查询请求数据: {request_data}")
+            self.request_log.payload("query.request", task_id, url=config.QUERY_URL, headers=headers, body=request_data)
 
             response = self.session.post(
                 config.QUERY_URL,
@@ -241,41 +542,11 @@ class ByteDanceASRClient:
             
             status_code = int(response.headers.get("X-Api-Status-Code", 0))
             message = response.headers.get("X-Api-Message", "Unknown error")
-            
-            # 解析结果
-            result = None
-            if status_code == 20000000 and response.content:
-                try:
-                    data = response.json()
-                    if "result" in data:
-                        result_data = data["result"]
-
-                        # 处理audio_info
-                        if "audio_info" in result_data and isinstance(result_data["audio_info"], dict):
-                            from .models import AudioInfo
-                            result_data["audio_info"] = AudioInfo(**result_data["audio_info"])
-
-                        # 处理utterances
-                        if "utterances" in result_data and isinstance(result_data["utterances"], list):
-                            from .models import ASRUtterance
-                            utterances = []
-                            for utterance_data in result_data["utterances"]:
-                                if isinstance(utterance_data, dict):
-                                    utterances.append(ASRUtterance(**utterance_data))
-                                else:
-                                    utterances.append(utterance_data)
-                            result_data["utterances"] = utterances
-
-                        result = ASRResult(**result_data)
-                except Exception as e:
-                    logger.warning(f"Failed to parse result: {e}")
-                    logger.debug(f"Raw response data: {data}")
-            
-            return TaskStatus(
-                status_code=status_code,
-                message=message,
-                result=result
+            self.request_log.poll(
+                "query", task_id, status_code=status_code, message=message, body_bytes=len(response.content)
             )
+            self.request_log.payload("query.response", task_id, body=response.content)
+            return self._raw_result(status_code, message, response.content)
             
         except requests.RequestException as e:
             raise APIError(f"Failed to query result: {str(e)}")
@@ -284,7 +555,9 @@ class ByteDanceASRClient:
         self,
         task_id: str,
         timeout: int = 300,
-        poll_interval: int = 2
+        poll_interval: Optional[float] = None,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None
     ) -> ASRResult:
         """
         等待识别完成并返回结果
@@ -292,19 +565,33 @@ class ByteDanceASRClient:
         Args:
             task_id: 任务ID
             timeout: 超时时间（秒）
-            poll_interval: 轮询间隔（秒）
+            poll_interval: 固定轮询间隔（秒），不指定时使用客户端的自适应轮询策略
+            audio_duration: 音频时长（毫秒），用于估算首次查询时间
+            audio_size: 音频文件大小（字节），没有时长时用于估算
             
         Returns:
             识别结果
         """
         start_time = time.time()
+        schedule = self._start_polling(poll_interval, audio_duration, audio_size, task_id)
+        delay = schedule.first_delay()
+        polls = 0
         
-        while time.time() - start_time < timeout:
-            status = self.get_result(task_id)
+        while True:
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                break
+
+            # 配置了回调时，等待期间一旦收到推送立即返回，轮询只作兜底
+            status = self._wait_before_poll(task_id, min(delay, remaining))
+            if status is None:
+                status = self.get_result(task_id)
+                polls += 1
+                self.poll_counts[task_id] = polls
             
             if status.is_success:
                 if status.result:
-                    logger.info(f"Task completed: {task_id}")
+                    self.request_log.event(logging.INFO, "completed", task_id, polls=polls)
                     return status.result
                 else:
                     raise APIError("Task completed but no result returned")
@@ -312,47 +599,165 @@ class ByteDanceASRClient:
             elif status.is_failed:
                 self._handle_error(status.status_code, status.message)
             
-            # 仍在处理中，等待
-            logger.debug(f"Task {task_id} still processing: {status.message}")
-            time.sleep(poll_interval)
+            # 仍在处理中，按策略计算下一次查询时间
+            delay = schedule.next_delay(status.status_code)
+            self.request_log.event(
+                logging.DEBUG, "processing", task_id, message=status.message, next_poll=round(delay, 1)
+            )
         
         raise TimeoutError(f"Task {task_id} timeout after {timeout} seconds")
 
-    def _validate_audio_url(self, url: str) -> bool:
-        """验证音频URL的可访问性"""
+    def _wait_before_poll(self, task_id: str, delay: float) -> Optional[TaskStatus]:
+        """等待下一次查询；期间收到回调推送时返回推送的状态"""
+        if self.callback_registry:
+            if delay > 0:
+                return self.callback_registry.wait(task_id, delay)
+            return self.callback_registry.get(task_id)
+        if delay > 0:
+            time.sleep(delay)
+        return None
+
+    def transcribe_many(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 8,
+        timeout: int = 900,
+        poll_interval: Optional[float] = None,
+        return_exceptions: bool = False,
+        **submit_kwargs
+    ) -> Iterator[Tuple[str, Union[ASRResult, Exception]]]:
+        """
+        批量提交并等待多个音频识别任务
+
+        提交和查询共用一个大小为 concurrency 的线程池；所有未完成任务由同一个
+        调度循环按下一次到期时间排序轮询，任务完成即产出结果，而不是逐个串行等待。
+
+        Args:
+            urls: 音频文件URL列表
+            concurrency: 同时进行中的HTTP请求数上限
+            timeout: 单个任务从提交成功起的超时时间（秒）
+            poll_interval: 固定轮询间隔（秒），不指定时使用客户端的自适应轮询策略
+            return_exceptions: 为True时将失败以 (url, 异常) 形式产出，否则直接抛出
+            **submit_kwargs: 透传给 submit_audio 的参数
+
+        Yields:
+            (url, ASRResult) ，按完成先后顺序
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+
+        pending_urls = iter(urls)
+        urls_exhausted = False
+        # (到期时间, 序号, url, task_id, 截止时间, 轮询调度)
+        schedule = []
+        in_flight = {}
+        seq = 0
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ASRBatch")
         try:
-            logger.info(f"验证音频URL可访问性: {url}")
-            response = self.session.head(url, timeout=10)
-
-            if response.status_code == 200:
-                content_type = response.headers.get('content-type', '')
-                content_length = response.headers.get('content-length', '0')
-                logger.info(f"URL验证成功 - 状态码: {response.status_code}, "
-                           f"内容类型: {content_type}, 大小: {content_length} bytes")
-                return True
-            else:
-                logger.warning(f"URL验证失败 - 状态码: {response.status_code}")
-                return False
+            while True:
+                now = time.monotonic()
 
-        except Exception as e:
-            logger.error(f"URL验证异常: {str(e)}")
-            # 如果HEAD请求失败，尝试GET请求的前几个字节
-            try:
-                logger.info("尝试GET请求验证URL...")
-                response = self.session.get(url, timeout=10, stream=True)
-                if response.status_code == 200:
-                    # 只读取前1024字节来验证
-                    next(response.iter_content(1024))
-                    logger.info("GET请求验证成功")
-                    return True
+                # 到期的轮询优先占用并发额度
+                while schedule and schedule[0][0] <= now and len(in_flight) < concurrency:
+                    _, _, url, task_id, deadline, polls = heapq.heappop(schedule)
+                    future = executor.submit(self.get_result, task_id)
+                    in_flight[future] = ("query", url, task_id, deadline, polls)
+
+                # 剩余额度用于提交新任务
+                while not urls_exhausted and len(in_flight) < concurrency:
+                    url = next(pending_urls, None)
+                    if url is None:
+                        urls_exhausted = True
+                        break
+                    future = executor.submit(self.submit_audio, url, **submit_kwargs)
+                    in_flight[future] = ("submit", url, None, None, None)
+
+                if not in_flight and not schedule and urls_exhausted:
+                    return
+
+                wait_timeout = None
+                if schedule:
+                    wait_timeout = max(0.0, schedule[0][0] - time.monotonic())
+                if in_flight:
+                    done, _ = wait(list(in_flight), timeout=wait_timeout, return_when=FIRST_COMPLETED)
                 else:
-                    logger.warning(f"GET请求验证失败 - 状态码: {response.status_code}")
-                    return False
-            except Exception as e2:
-                logger.error(f"GET请求验证也失败: {str(e2)}")
-                return False
+                    time.sleep(wait_timeout or 0)
+                    done = set()
 
-    def _handle_error(self, status_code: int, message: str):
-        """处理错误"""
-        exception_class = STATUS_CODE_EXCEPTIONS.get(status_code, APIError)
-        raise exception_class(f"API Error {status_code}: {message}", status_code)
+                for future in done:
+                    kind, url, task_id, deadline, polls = in_flight.pop(future)
+                    now = time.monotonic()
+                    try:
+                        if kind == "submit":
+                            task_id = future.result()
+                            polls = self._start_polling(poll_interval, task_id=task_id)
+                            seq += 1
+                            heapq.heappush(schedule, (now + polls.first_delay(), seq, url, task_id, now + timeout, polls))
+                            continue
+
+                        status = future.result()
+                        self.poll_counts[task_id] = polls.polls + 1
+                        if status.is_success:
+                            if not status.result:
+                                raise APIError("Task completed but no result returned")
+                            self.request_log.event(logging.INFO, "completed", task_id, polls=polls.polls + 1)
+                            yield url, status.result
+                        elif status.is_failed:
+                            self._handle_error(status.status_code, status.message)
+                        else:
+                            delay = polls.next_delay(status.status_code)
+                            if now >= deadline:
+                                raise TimeoutError(f"Task {task_id} timeout after {timeout} seconds")
+                            seq += 1
+                            next_due = min(now + delay, deadline)
+                            heapq.heappush(schedule, (next_due, seq, url, task_id, deadline, polls))
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        logger.warning(f"批量任务失败 - URL: {url}, 错误: {e}")
+                        yield url, e
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def check_audio_url(self, url: str) -> AudioURLInfo:
+        """
+        验证音频URL的可访问性并获取内容长度和类型
+
+        同一URL在缓存有效期内只探测一次；通过 url_validator.trust() 登记的URL直接视为可访问。
+        """
+        info = self._cached_audio_url(url)
+        if info is None:
+            info = self._refresh_audio_url(url)
+        return info
+
+    def _refresh_audio_url(self, url: str) -> AudioURLInfo:
+        """探测URL并更新缓存"""
+        info = self._probe_audio_url(url)
+        self._log_audio_url(info)
+        return self.url_validator.put(info)
+
+    def _probe_audio_url(self, url: str) -> AudioURLInfo:
+        """发送HEAD请求探测URL，HEAD不可用时只请求第一个字节"""
+        try:
+            response = self.session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True)
+            info = audio_url_info(url, response.status_code, response.headers)
+            if info.accessible:
+                return info
+            logger.debug("HEAD验证失败（状态码 %s），改用Range GET: %s", response.status_code, url)
+        except requests.RequestException as e:
+            logger.debug("HEAD验证异常（%s），改用Range GET: %s", e, url)
+
+        try:
+            with self.session.get(
+                url, headers=RANGE_HEADERS, timeout=PROBE_TIMEOUT, stream=True, allow_redirects=True
+            ) as response:
+                return audio_url_info(url, response.status_code, response.headers)
+        except requests.RequestException as e:
+            return AudioURLInfo(url=url, accessible=False, error=str(e))
+
+    def _validate_audio_url(self, url: str) -> bool:
+        """验证音频URL的可访问性"""
+        return self.check_audio_url(url).accessible
@@ -31,7 +31,17 @@ class Config:
     DEFAULT_TIMEOUT: int = int(os.getenv("DEFAULT_TIMEOUT", "30"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_DELAY: float = float(os.getenv("RETRY_DELAY", "1.0"))
-    
+
+    # 请求日志配置
+    LOG_BODY_LIMIT: int = int(os.getenv("LOG_BODY_LIMIT", "1024"))  # 请求体/响应体最多记录的字节数
+    LOG_SAMPLE_RATE: float = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))  # 轮询日志按任务采样的比例
+    LOG_FULL_DUMP: bool = os.getenv("LOG_FULL_DUMP", "").lower() in ("1", "true", "yes")  # 记录完整内容
+
+    # 音频URL验证配置
+    URL_VALIDATION: str = os.getenv("URL_VALIDATION", "blocking")  # blocking / pipelined / off
+    URL_VALIDATION_TTL: float = float(os.getenv("URL_VALIDATION_TTL", "600"))  # 验证成功的缓存时间（秒）
+    URL_VALIDATION_FAILURE_TTL: float = float(os.getenv("URL_VALIDATION_FAILURE_TTL", "10"))  # 失败的缓存时间
+
     # 固定值
     RESOURCE_ID: str = "volc.bigasr.auc"
     SEQUENCE: str = "-1"
@@ -0,0 +1,149 @@
+"""
+查询结果解码
+
+查询接口返回的是受信任的上游数据，长会议的结果可达数十MB。逐句 ASRUtterance(**kwargs) 在
+Python 中为每个分句和单词调用一次 pydantic，是解码中最慢的部分。这里的快速路径直接解码响应体字节
+（安装了 orjson 时使用 orjson），再用一次 ASRResult.model_validate 在 pydantic-core 内完成整棵
+模型树的校验；也可以解码为列式分句存储，或者保留原始字节，只在需要时才解码。
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from .models import ASRResult, TaskStatus
+from .utterance_store import UtteranceStore
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 解码失败时日志中保留的响应体长度
+LOG_PREVIEW_BYTES = 200
+
+
+class _QueryResponse(BaseModel):
+    """查询响应体（只关心result字段）"""
+    result: Optional[ASRResult] = None
+
+
+def loads(content: bytes) -> Any:
+    """解码JSON字节（优先使用orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode_asr_result(content: bytes, columnar: bool = False) -> Optional[ASRResult]:
+    """
+    将查询响应体字节解码为ASRResult，没有result字段时返回None
+
+    Args:
+        content: 响应体原始字节
+        columnar: 为True时分句存为列式的 UtteranceStore
+    """
+    if columnar:
+        data = loads(content)
+        return columnar_asr_result(data["result"]) if "result" in data else None
+
+    if not ORJSON_AVAILABLE:
+        # pydantic-core 直接解析字节，不生成中间的字典
+        return _QueryResponse.model_validate_json(content).result
+
+    data = loads(content)
+    if "result" not in data:
+        return None
+    return ASRResult.model_validate(data["result"])
+
+
+def columnar_asr_result(result_data: Dict[str, Any]) -> ASRResult:
+    """由result字段创建ASRResult，分句存为列式的 UtteranceStore（不逐句创建模型）"""
+    utterances = result_data.get("utterances")
+    if not isinstance(utterances, list):
+        return ASRResult.model_validate(result_data)
+    result = ASRResult.model_validate({**result_data, "utterances": None})
+    result.utterances = UtteranceStore.from_utterances(utterances)
+    return result
+
+
+def preview(content: bytes) -> str:
+    """响应体的简短预览，用于日志（避免记录完整的大结果）"""
+    if len(content) <= LOG_PREVIEW_BYTES:
+        return content.decode("utf-8", errors="replace")
+    head = content[:LOG_PREVIEW_BYTES].decode("utf-8", errors="ignore")
+    return f"{head}...（共{len(content)}字节）"
+
+
+class RawResult:
+    """
+    未解码的查询结果
+
+    保存任务状态和响应体原始字节，不创建任何结果模型；需要时再调用 json() 或 decode()，
+    解码结果会被缓存。
+    """
+
+    def __init__(self, status: TaskStatus, content: bytes = b"", columnar: bool = False):
+        """
+        Args:
+            status: 任务状态（不含识别结果）
+            content: 响应体原始字节
+            columnar: decode() 时分句是否存为列式的 UtteranceStore
+        """
+        self.status = status
+        self.content = content
+        self.columnar = columnar
+        self._data: Optional[Dict[str, Any]] = None
+        self._decoded: Optional[TaskStatus] = None
+
+    @property
+    def status_code(self) -> int:
+        return self.status.status_code
+
+    @property
+    def message(self) -> str:
+        return self.status.message
+
+    @property
+    def is_success(self) -> bool:
+        return self.status.is_success
+
+    @property
+    def is_processing(self) -> bool:
+        return self.status.is_processing
+
+    @property
+    def is_failed(self) -> bool:
+        return self.status.is_failed
+
+    def json(self) -> Dict[str, Any]:
+        """解码为字典（不创建模型）"""
+        if self._data is None:
+            self._data = loads(self.content) if self.content else {}
+        return self._data
+
+    def decode(self) -> TaskStatus:
+        """
+        解码为包含识别结果的任务状态
+
+        只有识别成功时才解码结果；结果无法解码时记录警告并返回不含结果的状态，
+        与 get_result 的行为一致。
+        """
+        if self._decoded is not None:
+            return self._decoded
+
+        result = None
+        if self.status.is_success and self.content:
+            try:
+                result = decode_asr_result(self.content, columnar=self.columnar)
+            except Exception as e:
+                logger.warning(f"Failed to parse result: {e}")
+                logger.debug(f"Raw response data: {preview(self.content)}")
+
+        self._decoded = self.status.model_copy(update={"result": result})
+        return self._decoded
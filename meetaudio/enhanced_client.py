@@ -3,20 +3,52 @@
 """
 
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from operator import sub
+from typing import List, Dict, Any, FrozenSet, NamedTuple, Optional, Sequence, Tuple
 from .client import ByteDanceASRClient
 from .models import ASRResult, ASRUtterance
 from .exceptions import ByteDanceASRError
+from .matcher import KeywordClassifier
+from .sentence_index import Sentence, SentenceIndex
+from .utterance_store import UtteranceStore, utterance_texts
 
 logger = logging.getLogger(__name__)
 
+# 没有说话人ID的分句归入的说话人
+UNKNOWN_SPEAKER = "未知说话人"
+
+# 关键信息分类：决策、行动项，以及用于识别截止时间的时间词和提交类动作
+KEY_INFO_CLASSIFIER = KeywordClassifier({
+    "decisions": ["决定", "确定", "同意", "批准", "通过", "否决", "拒绝"],
+    "actions": ["需要", "要求", "安排", "负责", "完成", "执行", "落实"],
+    "time": ["月底", "周内", "明天", "下周", "月", "日", "年"],
+    "deliverables": ["完成", "提交", "汇报"],
+})
+
+
+def _key_categories(categories: FrozenSet[str]) -> List[str]:
+    """句子命中的分类 -> 关键信息类别（截止时间须同时包含时间词和完成、提交、汇报等动作）"""
+    result = [category for category in ("decisions", "actions") if category in categories]
+    if "time" in categories and "deliverables" in categories:
+        result.append("deadlines")
+    return result
+
 
 class MeetingASRClient(ByteDanceASRClient):
     """会议专用语音识别客户端"""
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, columnar: bool = False, **kwargs):
+        """
+        Args:
+            columnar: 为True时识别结果的分句存为列式的 UtteranceStore（长会议内存占用显著降低）；
+                      此时 ASRResult.utterances 是只读的序列而不是 List[ASRUtterance]，
+                      仅在调用方只按下标、迭代、切片访问分句时开启。默认逐句创建 ASRUtterance
+        """
         super().__init__(*args, **kwargs)
         self.speaker_mapping = {}  # 说话人映射
+        self.columnar = columnar
         
     def submit_meeting_audio(
         self,
@@ -85,7 +117,9 @@ class MeetingASRClient(ByteDanceASRClient):
         self,
         task_id: str,
         timeout: int = 900,  # 15分钟超时
-        poll_interval: int = 5
+        poll_interval: Optional[float] = None,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None
     ) -> 'MeetingResult':
         """
         等待会议识别完成
@@ -93,57 +127,192 @@ class MeetingASRClient(ByteDanceASRClient):
         Args:
             task_id: 任务ID
             timeout: 超时时间（秒）
-            poll_interval: 轮询间隔（秒）
+            poll_interval: 固定轮询间隔（秒），不指定时使用自适应轮询策略
+            audio_duration: 音频时长（毫秒），用于估算首次查询时间
+            audio_size: 音频文件大小（字节），没有时长时用于估算
             
         Returns:
             会议结果对象
         """
-        result = self.wait_for_result(task_id, timeout, poll_interval)
+        result = self.wait_for_result(
+            task_id, timeout, poll_interval,
+            audio_duration=audio_duration, audio_size=audio_size
+        )
         return MeetingResult.from_asr_result(result)
 
 
+class Turn(NamedTuple):
+    """发言轮次：同一说话人按时间连续的若干分句"""
+    speaker_id: str
+    start_time: int   # 第一句开始时间（毫秒）
+    end_time: int     # 最后一句结束时间（毫秒）
+    first: int        # 第一句在 utterances_by_time 中的位置
+    last: int         # 最后一句在 utterances_by_time 中的位置（含）
+
+
 class MeetingResult:
     """会议识别结果"""
     
     def __init__(
         self,
         full_text: str,
-        utterances: List[ASRUtterance],
+        utterances: Sequence[ASRUtterance],
         duration: int,
-        speakers: Dict[str, List[ASRUtterance]] = None
+        speakers: Dict[str, Sequence[ASRUtterance]] = None
     ):
+        """
+        Args:
+            full_text: 完整识别文本
+            utterances: 分句列表，也可以是列式存储 UtteranceStore（分句只在访问时生成）
+            duration: 会议时长（毫秒）
+            speakers: 说话人ID到其分句的映射，不指定时按分句的说话人分组
+        """
         self.full_text = full_text
         self.utterances = utterances
         self.duration = duration
-        self.speakers = speakers or {}
+        if speakers is None:
+            speakers = self._group_by_speaker(utterances)
+        self.speakers = speakers
+        self._build_indexes()
         
     @classmethod
     def from_asr_result(cls, asr_result: ASRResult) -> 'MeetingResult':
         """从ASR结果创建会议结果"""
         duration = asr_result.audio_info.duration if asr_result.audio_info else 0
         
-        # 按说话人分组
-        speakers = {}
-        if asr_result.utterances:
-            for utterance in asr_result.utterances:
-                speaker_id = utterance.speaker_id or "未知说话人"
-                if speaker_id not in speakers:
-                    speakers[speaker_id] = []
-                speakers[speaker_id].append(utterance)
-        
         return cls(
             full_text=asr_result.text,
             utterances=asr_result.utterances or [],
-            duration=duration,
-            speakers=speakers
+            duration=duration
         )
+
+    @staticmethod
+    def _group_by_speaker(utterances: Sequence[ASRUtterance]) -> Dict[str, Sequence[ASRUtterance]]:
+        """按说话人分组（列式存储按组选取子存储，不生成分句对象）"""
+        if not isinstance(utterances, UtteranceStore):
+            speakers = {}
+            for utterance in utterances:
+                speakers.setdefault(utterance.speaker_id or UNKNOWN_SPEAKER, []).append(utterance)
+            return speakers
+
+        groups: Dict[str, List[int]] = {}
+        for index, speaker_id in enumerate(utterances.speaker_id_list()):
+            groups.setdefault(speaker_id or UNKNOWN_SPEAKER, []).append(index)
+        return {speaker_id: utterances.take(indexes) for speaker_id, indexes in groups.items()}
+
+    def _build_indexes(self):
+        """建立时间和说话人索引（只在创建时建立一次）"""
+        # 按开始时间排序的分句及开始、结束时间和说话人列，用于二分查找
+        if isinstance(self.utterances, UtteranceStore):
+            self.utterances_by_time: Sequence[ASRUtterance] = self.utterances.sorted_by_start_time()
+            starts = self.utterances_by_time.start_times
+            ends = self.utterances_by_time.end_times
+            speaker_ids = self.utterances_by_time.speaker_id_list()
+        else:
+            self.utterances_by_time = sorted(self.utterances, key=lambda u: u.start_time)
+            starts = [u.start_time for u in self.utterances_by_time]
+            ends = [u.end_time for u in self.utterances_by_time]
+            speaker_ids = [u.speaker_id for u in self.utterances_by_time]
+        speaker_ids = [speaker_id or UNKNOWN_SPEAKER for speaker_id in speaker_ids]
+        durations = list(map(sub, ends, starts))
+        self._starts = starts
+        self._max_length = max(durations, default=0)
+
+        # 每个说话人的分句在 utterances_by_time 中的位置、开始时间和发言时长前缀和
+        self._speaker_offsets: Dict[str, List[int]] = {}
+        for offset, speaker_id in enumerate(speaker_ids):
+            self._speaker_offsets.setdefault(speaker_id, []).append(offset)
+        self._speaker_starts: Dict[str, List[int]] = {}
+        self._speaker_talk_prefix: Dict[str, List[int]] = {}
+        for speaker_id, offsets in self._speaker_offsets.items():
+            self._speaker_starts[speaker_id] = [starts[i] for i in offsets]
+            self._speaker_talk_prefix[speaker_id] = list(accumulate((durations[i] for i in offsets), initial=0))
+
+        # 发言轮次
+        self._turns: List[Turn] = []
+        for offset, speaker_id in enumerate(speaker_ids):
+            previous = self._turns[-1] if self._turns else None
+            if previous is not None and previous.speaker_id == speaker_id:
+                self._turns[-1] = previous._replace(end_time=max(previous.end_time, ends[offset]), last=offset)
+            else:
+                self._turns.append(Turn(speaker_id, starts[offset], ends[offset], offset, offset))
+        self._turn_starts = [turn.start_time for turn in self._turns]
+
+        # 按需拼接的说话人发言内容
+        self._speaker_content: Dict[str, str] = {}
     
     def get_speaker_content(self, speaker_id: str) -> str:
-        """获取指定说话人的发言内容"""
+        """获取指定说话人的发言内容（拼接结果会被缓存）"""
         if speaker_id not in self.speakers:
             return ""
         
-        return " ".join([utterance.text for utterance in self.speakers[speaker_id]])
+        content = self._speaker_content.get(speaker_id)
+        if content is None:
+            content = self._speaker_content[speaker_id] = " ".join(utterance_texts(self.speakers[speaker_id]))
+        return content
+
+    def utterances_in_range(self, start: int, end: int, overlap: bool = False) -> List[ASRUtterance]:
+        """
+        获取时间范围内的分句（按开始时间排序），O(log n + k)
+        
+        Args:
+            start: 开始时间（毫秒，含）
+            end: 结束时间（毫秒，不含）
+            overlap: 为False时返回开始时间在范围内的分句；为True时返回与范围有重叠的分句
+                     （包括开始于 start 之前、持续到范围内的分句）
+        """
+        hi = bisect_left(self._starts, end)
+        if not overlap:
+            return self.utterances_by_time[bisect_left(self._starts, start):hi]
+        # 与范围重叠的分句开始时间不早于 start - 最长分句时长
+        lo = bisect_right(self._starts, start - self._max_length)
+        return [u for u in self.utterances_by_time[lo:hi] if u.end_time > start]
+
+    def speaker_talk_time(
+        self,
+        speaker_id: Optional[str] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ):
+        """
+        说话人发言时长（毫秒），按开始时间在 [start, end) 内的分句统计，每个说话人 O(log n)
+        
+        Args:
+            speaker_id: 说话人ID，为None时返回所有说话人的 {说话人ID: 时长}
+            start: 开始时间（毫秒），None表示会议开始
+            end: 结束时间（毫秒），None表示会议结束
+        """
+        if speaker_id is None:
+            return {sid: self.speaker_talk_time(sid, start, end) for sid in self._speaker_offsets}
+        
+        starts = self._speaker_starts.get(speaker_id)
+        if not starts:
+            return 0
+        prefix = self._speaker_talk_prefix[speaker_id]
+        lo = 0 if start is None else bisect_left(starts, start)
+        hi = len(starts) if end is None else bisect_left(starts, end)
+        return prefix[hi] - prefix[lo] if hi > lo else 0
+
+    def turns(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Turn]:
+        """
+        发言轮次（同一说话人连续的分句合并为一轮），返回开始时间在 [start, end) 内的轮次，O(log n + k)
+        
+        Args:
+            start: 开始时间（毫秒），None表示会议开始
+            end: 结束时间（毫秒），None表示会议结束
+        """
+        lo = 0 if start is None else bisect_left(self._turn_starts, start)
+        hi = len(self._turns) if end is None else bisect_left(self._turn_starts, end)
+        return self._turns[lo:hi]
+
+    def turn_utterances(self, turn: Turn) -> List[ASRUtterance]:
+        """发言轮次包含的分句"""
+        return self.utterances_by_time[turn.first:turn.last + 1]
+
+    @property
+    def sentence_index(self) -> SentenceIndex:
+        """完整文本的句子索引（按句号切分，同一文本只切分一次）"""
+        return SentenceIndex.for_text(self.full_text)
     
     def get_last_speakers(self, count: int = 2) -> List[Tuple[str, str]]:
         """
@@ -155,27 +324,17 @@ class MeetingResult:
         Returns:
             [(说话人ID, 发言内容), ...]
         """
-        if not self.utterances:
-            return []
-        
-        # 按时间排序，获取最后的发言
-        sorted_utterances = sorted(self.utterances, key=lambda x: x.start_time)
-        
-        # 找到最后几位说话人
+        # 从最后一轮发言往前找不同的说话人
         last_speakers = []
         seen_speakers = set()
         
-        # 从后往前遍历
-        for utterance in reversed(sorted_utterances):
-            speaker_id = utterance.speaker_id or "未知说话人"
-            if speaker_id not in seen_speakers:
-                seen_speakers.add(speaker_id)
-                if len(seen_speakers) <= count:
-                    # 获取该说话人的所有发言
-                    speaker_content = self.get_speaker_content(speaker_id)
-                    last_speakers.append((speaker_id, speaker_content))
-                else:
-                    break
+        for turn in reversed(self._turns):
+            if len(seen_speakers) >= count:
+                break
+            if turn.speaker_id not in seen_speakers:
+                seen_speakers.add(turn.speaker_id)
+                # 获取该说话人的所有发言
+                last_speakers.append((turn.speaker_id, self.get_speaker_content(turn.speaker_id)))
         
         # 按发言时间顺序返回
         return list(reversed(last_speakers))
@@ -190,6 +349,22 @@ class MeetingResult:
             "word_count": len(self.full_text),
         }
     
+    def key_sentences(self) -> Dict[str, List[Sentence]]:
+        """
+        按类别列出包含关键信息的句子（一次切分、一次扫描，保留原文顺序和位置）
+        
+        Returns:
+            {"decisions": [...], "actions": [...], "deadlines": [...]}，
+            截止时间为同时包含时间词和完成、提交、汇报等动作的句子
+        """
+        result = {"decisions": [], "actions": [], "deadlines": []}
+        index = self.sentence_index
+        for i, categories in enumerate(index.tag(KEY_INFO_CLASSIFIER)):
+            if categories:
+                for category in _key_categories(categories):
+                    result[category].append(index[i])
+        return result
+    
     def extract_key_information(self) -> Dict[str, List[str]]:
         """
         提取关键信息（简单版本，后续可用AI增强）
@@ -197,45 +372,22 @@ class MeetingResult:
         Returns:
             包含决策点、行动项等的字典
         """
-        # 简单的关键词匹配
-        decisions = []
-        actions = []
-        responsibilities = []
-        deadlines = []
-        
-        text = self.full_text
-        
-        # 决策关键词
-        decision_keywords = ["决定", "确定", "同意", "批准", "通过", "否决", "拒绝"]
-        for keyword in decision_keywords:
-            if keyword in text:
-                # 简单提取包含关键词的句子
-                sentences = text.split("。")
-                for sentence in sentences:
-                    if keyword in sentence:
-                        decisions.append(sentence.strip())
-        
-        # 行动项关键词
-        action_keywords = ["需要", "要求", "安排", "负责", "完成", "执行", "落实"]
-        for keyword in action_keywords:
-            if keyword in text:
-                sentences = text.split("。")
-                for sentence in sentences:
-                    if keyword in sentence:
-                        actions.append(sentence.strip())
-        
-        # 时间关键词
-        time_keywords = ["月底", "周内", "明天", "下周", "月", "日", "年"]
-        for keyword in time_keywords:
-            if keyword in text:
-                sentences = text.split("。")
-                for sentence in sentences:
-                    if keyword in sentence and any(action in sentence for action in ["完成", "提交", "汇报"]):
-                        deadlines.append(sentence.strip())
+        # 按原文顺序去重并限制数量，各类别都取够后不再继续
+        limits = {"decisions": 5, "actions": 5, "deadlines": 3}
+        found: Dict[str, Dict[str, None]] = {category: {} for category in limits}
+        index = self.sentence_index
+        for i, categories in enumerate(index.tag(KEY_INFO_CLASSIFIER)):
+            if not categories:
+                continue
+            for category in _key_categories(categories):
+                if len(found[category]) < limits[category]:
+                    found[category].setdefault(index[i].text.strip())
+            if all(len(found[category]) >= limit for category, limit in limits.items()):
+                break
         
         return {
-            "decisions": list(set(decisions))[:5],  # 去重并限制数量
-            "actions": list(set(actions))[:5],
-            "responsibilities": responsibilities,
-            "deadlines": list(set(deadlines))[:3],
+            "decisions": list(found["decisions"]),
+            "actions": list(found["actions"]),
+            "responsibilities": [],
+            "deadlines": list(found["deadlines"]),
         }
@@ -46,6 +46,11 @@ class InvalidParameterError(ByteDanceASRError):
     pass
 
 
+class TaskCancelledError(ByteDanceASRError):
+    """任务已取消或超过截止时间"""
+    pass
+
+
 # 状态码到异常的映射
 STATUS_CODE_EXCEPTIONS = {
     45000001: InvalidParameterError,
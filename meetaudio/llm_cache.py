@@ -0,0 +1,203 @@
+"""
+大模型响应缓存
+
+同一识别任务的会议纪要经常被重新生成，编辑器工具栏也会对同一段选中文本反复调用润色、扩写。
+这里按请求内容（模型、消息、temperature、max_tokens）的哈希缓存回复：
+
+- 内存层：最近使用的回复，按条数LRU淘汰；
+- 磁盘层（可选）：SQLite（WAL模式），按总字节数淘汰最久未使用的，进程重启后仍可命中；
+  总字节数只在打开时统计一次，之后随写入和淘汰增减，写入时不再扫描全表；
+- 记录命中率和因命中而节省的调用耗时，供状态接口展示。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> str:
+    """请求内容的哈希"""
+    payload = json.dumps([model, messages, temperature, max_tokens], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """大模型响应缓存（线程安全）"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_entries: int = 256,
+        max_disk_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Args:
+            path: SQLite数据库路径，None表示只使用内存层
+            memory_entries: 内存层最多保留的回复数量
+            max_disk_bytes: 磁盘层回复的总字节数上限，超出后淘汰最久未使用的
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        # 键 -> (回复, 原调用耗时)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 磁盘层回复的总字节数（写入和淘汰时增减），由 _disk_lock 保护
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = self._connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " elapsed REAL NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)")
+            self._disk_bytes = self._total_size(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """缓存的回复，未命中时返回None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+
+        if self.path:
+            conn = self._connection()
+            row = conn.execute("SELECT response, elapsed FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                with self._lock:
+                    self.disk_hits += 1
+                    self.saved_seconds += row[1]
+                    self._remember(key, row[0], row[1])
+                return row[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, response: str, elapsed: float):
+        """
+        缓存回复
+
+        Args:
+            key: cache_key() 生成的键
+            response: 回复内容
+            elapsed: 本次调用耗时（秒），命中时计入节省的时间
+        """
+        with self._lock:
+            self._remember(key, response, elapsed)
+
+        if self.path:
+            size = len(response.encode("utf-8"))
+            conn = self._connection()
+            with self._disk_lock:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, response, elapsed, size, last_used) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, response, elapsed, size, time.time())
+                    )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self._disk_bytes += size - (row[0] if row else 0)
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict(conn)
+
+    def _remember(self, key: str, response: str, elapsed: float):
+        """写入内存层（调用方持有锁）"""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (response, elapsed)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _total_size(conn: sqlite3.Connection) -> int:
+        """扫描磁盘层回复的总字节数"""
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        """
+        磁盘层超出上限时，淘汰最久未使用的回复直到不超过上限的90%（调用方持有 _disk_lock）
+
+        淘汰前重新统计一次总字节数，校正其他进程写入同一数据库造成的偏差。
+        """
+        self._disk_bytes = total = self._total_size(conn)
+        if total <= self.max_disk_bytes:
+            return
+        target = total - int(self.max_disk_bytes * 0.9)
+        freed = 0
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used"):
+            keys.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", keys)
+        self._disk_bytes -= freed
+
+    def clear(self):
+        """清空缓存（统计数据保留）"""
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            with self._disk_lock:
+                self._connection().execute("DELETE FROM llm_cache")
+                self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """命中率、节省的调用耗时和缓存大小"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "saved_seconds": round(self.saved_seconds, 2),
+                "memory_entries": len(self._memory),
+            }
+        if self.path:
+            count, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            stats.update(disk_entries=count, disk_bytes=size)
+        return stats
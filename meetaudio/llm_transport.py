@@ -0,0 +1,179 @@
+"""
+大模型调用的共享HTTP传输
+
+每次调用都新建 httpx.Client 会重新创建SSL上下文并建立TCP+TLS连接。LLMTransport 由 AIWriter 持有，
+内部一个长期存在的 httpx.Client（连接池、keep-alive，安装了 h2 时启用 HTTP/2：requirements.txt
+中的 httpx[http2] 会安装 h2，未安装时退回 HTTP/1.1 keep-alive）；
+直接调用和降级使用的 OpenAI 客户端共用这一个连接池，多个线程可同时调用。
+配置了 LLMResponseCache 时，相同请求直接返回缓存的回复。
+传入 on_text 时以 stream=True 调用，边接收SSE增量边回调已生成的文本。
+"""
+
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import httpx
+from openai import OpenAI
+
+from .llm_cache import LLMResponseCache, cache_key
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTransport:
+    """方舟 /chat/completions 调用（线程安全）"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        timeout: float = 300,
+        max_connections: int = 20,
+        http2: Optional[bool] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
+        """
+        Args:
+            api_key: 方舟 API Key
+            base_url: 接口地址，如 https://ark.cn-beijing.volces.com/api/v3
+            timeout: 默认超时时间（秒），单次调用可通过 chat(timeout=...) 覆盖
+            max_connections: 连接池最大连接数（同时也是保持的空闲连接数）
+            http2: 是否启用HTTP/2，默认在安装了 h2 时启用
+            cache: 响应缓存，None表示不缓存
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.cache = cache
+        self.http = httpx.Client(
+            http2=self.http2,
+            timeout=httpx.Timeout(timeout=float(timeout), connect=30.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60
+            )
+        )
+        self._openai: Optional[OpenAI] = None
+
+    @property
+    def openai(self) -> OpenAI:
+        """共用连接池的 OpenAI 客户端"""
+        if self._openai is None:
+            self._openai = OpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                timeout=float(self.timeout),
+                max_retries=1,
+                http_client=self.http
+            )
+        return self._openai
+
+    def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        timeout: Union[float, httpx.Timeout, None] = None,
+        use_cache: bool = True,
+        on_text: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        调用一次对话补全
+
+        Args:
+            use_cache: 为False时不读取缓存（如用户要求重新生成），新的回复仍会写入缓存
+            on_text: 流式调用，每收到一段增量时以已生成的全部文本回调；命中缓存时以完整回复回调一次
+
+        Returns:
+            回复内容
+
+        Raises:
+            httpx.HTTPError: 请求失败或返回错误状态码
+            ValueError: 响应中没有回复内容
+        """
+        key = None
+        if self.cache is not None:
+            key = cache_key(model, messages, temperature, max_tokens)
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    if on_text:
+                        on_text(cached)
+                    return cached
+
+        start = time.perf_counter()
+        request = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        timeout = self.http.timeout if timeout is None else timeout
+        if on_text:
+            content = self._stream(request, timeout, on_text)
+        else:
+            response = self.http.post(
+                f"{self.base_url}/chat/completions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                json=request,
+                timeout=timeout
+            )
+            response.raise_for_status()
+
+            result = response.json()
+            if not result.get("choices"):
+                raise ValueError(f"API响应格式错误: {result}")
+            content = result["choices"][0]["message"]["content"]
+        if key is not None and content and content.strip():
+            self.cache.put(key, content, time.perf_counter() - start)
+        return content
+
+    def _stream(
+        self,
+        request: Dict[str, Any],
+        timeout: Union[float, httpx.Timeout],
+        on_text: Callable[[str], None]
+    ) -> str:
+        """以 stream=True 调用，逐行解析 data: 事件直到 [DONE]，返回完整回复"""
+        content = ""
+        with self.http.stream(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json=dict(request, stream=True),
+            timeout=timeout
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    # 继续读完响应体，连接才能放回连接池
+                    continue
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise ValueError(f"API流式响应错误: {chunk['error']}")
+                choices = chunk.get("choices")
+                if not choices:
+                    continue
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    content += delta
+                    on_text(content)
+        return content
+
+    def close(self):
+        """关闭连接池"""
+        self.http.close()
@@ -0,0 +1,186 @@
+"""
+多关键词匹配、替换与分类
+
+将一组关键词组织成前缀树，再编译为一个正则表达式：整段文本只扫描一次，
+每个位置优先匹配最长的关键词（O(文本长度 + 匹配数)），替代逐个关键词调用 re.sub。
+新增关键词时只向前缀树插入新节点，正则表达式在下次匹配前按需重新生成。
+"""
+
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
+
+# 前缀树中标记“到此为一个完整关键词”的键
+_END = ""
+
+
+class TermMatcher:
+    """关键词匹配器（线程安全）"""
+
+    def __init__(self, mapping: Optional[Dict[str, str]] = None, word_boundary: bool = False):
+        """
+        Args:
+            mapping: 关键词到替换文本的映射
+            word_boundary: 为True时关键词两端须满足 \\b 词边界（与 re 的 \\b 语义一致）。
+                           注意汉字属于 \\w，连续中文里的关键词不满足词边界，只有被标点、空白
+                           或字符串首尾隔开时才会匹配
+        """
+        self.word_boundary = word_boundary
+        self._mapping: Dict[str, str] = {}
+        self._trie: Dict[str, dict] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._lock = threading.Lock()
+        if mapping:
+            self.add(mapping)
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._mapping
+
+    def add(self, mapping: Dict[str, str]):
+        """添加或更新关键词（已有关键词只更新替换文本）"""
+        with self._lock:
+            for term, replacement in mapping.items():
+                if not term:
+                    continue
+                if term not in self._mapping:
+                    node = self._trie
+                    for char in term:
+                        node = node.setdefault(char, {})
+                    node[_END] = True
+                    self._pattern = None
+                self._mapping[term] = replacement
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        从左到右查找不重叠的关键词，同一位置取最长的
+
+        Yields:
+            (起始位置, 结束位置, 关键词)
+        """
+        pattern = self._compiled()
+        if pattern is None:
+            return
+        for match in pattern.finditer(text):
+            yield match.start(), match.end(), match.group()
+
+    def replace(self, text: str) -> str:
+        """将文本中的关键词替换为对应文本（替换结果不会被再次匹配）"""
+        pattern = self._compiled()
+        if pattern is None:
+            return text
+        mapping = self._mapping
+        return pattern.sub(lambda match: mapping[match.group()], text)
+
+    def _compiled(self) -> Optional[re.Pattern]:
+        """获取（必要时重新生成）匹配用的正则表达式"""
+        pattern = self._pattern
+        if pattern is None and self._mapping:
+            with self._lock:
+                if self._pattern is None:
+                    body = self._trie_regex(self._trie)
+                    if self.word_boundary:
+                        body = r"\b(?:" + body + r")\b"
+                    self._pattern = re.compile(body)
+                pattern = self._pattern
+        return pattern
+
+    @classmethod
+    def _trie_regex(cls, node: dict) -> str:
+        """将前缀树转换为正则表达式；可选的后缀是贪婪的，因此回溯时先尝试更长的关键词"""
+        branches = []
+        single_chars = []
+        for char, child in sorted((k, v) for k, v in node.items() if k != _END):
+            if len(child) == 1 and _END in child:
+                single_chars.append(char)
+            else:
+                branches.append(re.escape(char) + cls._trie_regex(child))
+
+        if len(single_chars) == 1:
+            branches.append(re.escape(single_chars[0]))
+        elif single_chars:
+            branches.append("[" + "".join(cls._escape_in_class(c) for c in single_chars) + "]")
+
+        if _END in node:
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    @staticmethod
+    def _escape_in_class(char: str) -> str:
+        """字符集中需要转义的字符"""
+        return "\\" + char if char in "\\]^-[" else char
+
+
+class KeywordClassifier:
+    """
+    多类别关键词分类器
+
+    所有类别的关键词编译为一个正则表达式，一次 findall 即可得到文本命中的全部类别。
+    匹配不重叠、同一位置取最长的关键词，因此每个关键词的类别中合并了它所包含的其他关键词的类别
+    （如"月底"同时带有"月"的类别）；首尾部分重叠的关键词（如"下周"与"周内"）另行检查，结果与逐个关键词
+    判断 `keyword in text` 一致。
+    """
+
+    _EMPTY: FrozenSet[str] = frozenset()
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """
+        Args:
+            categories: 类别名到关键词列表的映射，同一关键词可属于多个类别
+        """
+        self.categories = {name: tuple(keywords) for name, keywords in categories.items()}
+        tags: Dict[str, Set[str]] = {}
+        for name, keywords in self.categories.items():
+            for keyword in keywords:
+                if keyword:
+                    tags.setdefault(keyword, set()).add(name)
+
+        self._tags: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset().union(*(tags[inner] for inner in tags if inner in keyword))
+            for keyword in tags
+        }
+        # 结尾与之部分重叠、可能因匹配不重叠而被漏掉的关键词
+        self._partners: Dict[str, Tuple[str, ...]] = {}
+        for keyword in tags:
+            partners = tuple(
+                other for other in tags
+                if other not in keyword and any(
+                    other.startswith(keyword[i:]) for i in range(1, len(keyword))
+                )
+            )
+            if partners:
+                self._partners[keyword] = partners
+        self._overlapping = frozenset(self._partners)
+
+        self._findall = None
+        if tags:
+            alternatives = "|".join(re.escape(k) for k in sorted(tags, key=len, reverse=True))
+            self._findall = re.compile(alternatives).findall
+        # 命中的关键词组合 -> 类别，组合数量通常很少
+        self._combinations: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+    def classify(self, text: str) -> FrozenSet[str]:
+        """文本命中的所有类别"""
+        if self._findall is None:
+            return self._EMPTY
+        found = self._findall(text)
+        if not found:
+            return self._EMPTY
+
+        keywords = frozenset(found)
+        categories = self._combinations.get(keywords)
+        if categories is None:
+            categories = frozenset().union(*(self._tags[k] for k in keywords))
+            if len(self._combinations) < 4096:
+                self._combinations[keywords] = categories
+
+        if not self._overlapping.isdisjoint(keywords):
+            for keyword in self._overlapping.intersection(keywords):
+                for partner in self._partners[keyword]:
+                    if not self._tags[partner] <= categories and partner in text:
+                        categories = categories | self._tags[partner]
+        return categories
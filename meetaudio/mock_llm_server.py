@@ -0,0 +1,197 @@
+"""
+本地模拟大模型服务
+
+实现与方舟（OpenAI兼容）相同的 /chat/completions 接口，每次调用按设定的延迟返回，
+stream=True 时以SSE逐字返回（首字前等待 delay，之后每字等待 token_delay），
+可让前若干次调用失败以测试重试，并记录调用次数、连接数和最大并发数，
+用于离线开发和测量会议纪要生成的端到端耗时。
+
+    python -m meetaudio.mock_llm_server --port 8091 --delay 2
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_reply(messages: List[Dict[str, Any]]) -> str:
+    """根据最后一条消息生成固定格式的回复（包含消息长度，便于测试区分不同调用）"""
+    prompt = messages[-1].get("content", "") if messages else ""
+    return f"模拟纪要要点：共{len(prompt)}字。"
+
+
+class MockLLMServer:
+    """模拟大模型服务"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        delay: float = 0.0,
+        fail_first: int = 0,
+        reply_factory: Optional[Callable[[List[Dict[str, Any]]], str]] = None,
+        token_delay: float = 0.0
+    ):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示随机端口
+            delay: 每次调用的处理时间（秒），流式调用时为首字前的等待时间
+            fail_first: 前若干次调用返回HTTP 500
+            reply_factory: 根据请求消息生成回复内容
+            token_delay: 流式调用时每个字之间的间隔（秒）
+        """
+        self.delay = delay
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.reply_factory = reply_factory or default_reply
+        self.prompts: List[str] = []
+        self.call_count = 0
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """与 ARK_BASE_URL 对应的地址"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v3"
+
+    def start(self) -> "MockLLMServer":
+        threading.Thread(target=self._server.serve_forever, name="MockLLMServer", daemon=True).start()
+        logger.info(f"模拟大模型服务已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _complete(self, request_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """处理一次调用，需要模拟失败时返回None"""
+        messages = request_data.get("messages", [])
+        with self._lock:
+            self.call_count += 1
+            failed = self.call_count <= self.fail_first
+            if not failed and messages:
+                self.prompts.append(messages[-1].get("content", ""))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.active -= 1
+        if failed:
+            return None
+        return {
+            "model": request_data.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.reply_factory(messages)},
+                "finish_reason": "stop",
+            }],
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头和响应体分两次写出，keep-alive 连接上需关闭 Nagle 算法，否则每次响应约延迟40ms
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if not self.path.endswith("/chat/completions"):
+                    self._reply(404, {"error": {"message": "not found"}})
+                    return
+                try:
+                    request_data = json.loads(body or b"{}")
+                except ValueError:
+                    self._reply(400, {"error": {"message": "invalid json"}})
+                    return
+                response = server._complete(request_data)
+                if response is None:
+                    self._reply(500, {"error": {"message": "mock failure"}})
+                elif request_data.get("stream"):
+                    self._stream(response)
+                else:
+                    self._reply(200, response)
+
+            def _stream(self, response: Dict[str, Any]):
+                """以分块传输逐字发送 chat.completion.chunk 事件"""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                content = response["choices"][0]["message"]["content"]
+                for i, char in enumerate(content):
+                    if i and server.token_delay:
+                        time.sleep(server.token_delay)
+                    chunk = {
+                        "model": response["model"],
+                        "choices": [{"index": 0, "delta": {"content": char}, "finish_reason": None}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text: str):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+            def _reply(self, code: int, data: Dict[str, Any]):
+                body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("mock llm server: " + format, *args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟大模型服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--delay", type=float, default=2.0, help="每次调用的处理时间（秒）")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="流式调用时每个字之间的间隔（秒）")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockLLMServer(args.host, args.port, delay=args.delay, token_delay=args.token_delay)
+    print(f"ARK_BASE_URL={server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
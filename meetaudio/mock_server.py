@@ -0,0 +1,245 @@
+"""
+本地模拟识别服务
+
+实现与火山引擎大模型录音文件识别相同的 submit / query 接口和响应头，
+在设定的处理时间后将任务置为完成，并向提交时携带的 callback 地址推送结果，
+用于离线开发和测试回调、轮询等逻辑。
+
+    python -m meetaudio.mock_server --port 8090 --processing-time 5
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def default_result(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """根据提交的请求生成一个固定的识别结果"""
+    url = request_data.get("audio", {}).get("url", "")
+    text = f"这是模拟识别结果。音频地址：{url}"
+    return {
+        "audio_info": {"duration": 2000},
+        "result": {
+            "text": text,
+            "utterances": [
+                {"text": text, "start_time": 0, "end_time": 2000, "definite": True}
+            ]
+        }
+    }
+
+
+class MockASRServer:
+    """模拟识别服务"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        processing_time: float = 1.0,
+        result_factory: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        fire_callbacks: bool = True,
+        audio_size: int = 1024,
+        allow_head: bool = True
+    ):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示随机端口
+            processing_time: 任务从提交到完成的时间（秒）
+            result_factory: 根据提交请求生成完成后的响应体
+            fire_callbacks: 是否在任务完成时推送回调
+            audio_size: 模拟音频文件的字节数
+            allow_head: 为False时音频地址拒绝HEAD请求（模拟只允许GET的签名URL）
+        """
+        self.processing_time = processing_time
+        self.result_factory = result_factory or default_result
+        self.fire_callbacks = fire_callbacks
+        self.audio_size = audio_size
+        self.allow_head = allow_head
+        self.audio_requests = 0
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.query_count = 0
+        self.callbacks_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def submit_url(self) -> str:
+        return f"{self.base_url}/api/v3/auc/bigmodel/submit"
+
+    @property
+    def query_url(self) -> str:
+        return f"{self.base_url}/api/v3/auc/bigmodel/query"
+
+    def audio_url(self, name: str = "meeting.mp3") -> str:
+        """可通过URL验证的模拟音频地址"""
+        return f"{self.base_url}/audio/{name}"
+
+    def start(self) -> "MockASRServer":
+        threading.Thread(target=self._server.serve_forever, name="MockASRServer", daemon=True).start()
+        logger.info(f"模拟识别服务已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockASRServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _submit(self, request_id: str, request_data: Dict[str, Any]) -> str:
+        task = {
+            "request": request_data,
+            "done_at": time.monotonic() + self.processing_time,
+        }
+        with self._lock:
+            self.tasks[request_id] = task
+
+        if self.fire_callbacks and request_data.get("callback"):
+            timer = threading.Timer(self.processing_time, self._send_callback, args=(request_id,))
+            timer.daemon = True
+            timer.start()
+        return request_id
+
+    def _send_callback(self, request_id: str):
+        task = self.tasks[request_id]
+        request_data = task["request"]
+        body = dict(self.result_factory(request_data))
+        body["callback_data"] = request_data.get("callback_data", request_id)
+        req = urllib.request.Request(
+            request_data["callback"],
+            data=json.dumps(body, ensure_ascii=False).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "X-Api-Status-Code": "20000000",
+                "X-Api-Message": "OK",
+            },
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=10):
+                pass
+            with self._lock:
+                self.callbacks_sent += 1
+        except Exception as e:
+            logger.warning(f"模拟回调推送失败: {e}")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_HEAD(self):
+                if self.path.startswith("/audio/"):
+                    with server._lock:
+                        server.audio_requests += 1
+                    if not server.allow_head:
+                        self._reply(403, b"", head=True)
+                        return
+                    headers = {"Content-Type": "audio/mpeg", "Content-Length": str(server.audio_size)}
+                    self._reply(200, b"", headers, head=True)
+                else:
+                    self._reply(404, b"")
+
+            def do_GET(self):
+                if self.path.startswith("/audio/"):
+                    with server._lock:
+                        server.audio_requests += 1
+                    if self.headers.get("Range") == "bytes=0-0":
+                        headers = {"Content-Type": "audio/mpeg", "Content-Range": f"bytes 0-0/{server.audio_size}"}
+                        self._reply(206, b"\0", headers)
+                    else:
+                        self._reply(200, b"\0" * server.audio_size, {"Content-Type": "audio/mpeg"})
+                else:
+                    self._reply(404, b"")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                request_id = self.headers.get("X-Api-Request-Id", "")
+
+                if self.path.endswith("/submit"):
+                    try:
+                        request_data = json.loads(body or b"{}")
+                    except ValueError:
+                        self._status(45000001, "invalid json")
+                        return
+                    server._submit(request_id or str(uuid.uuid4()), request_data)
+                    self._status(20000000, "OK", extra={"X-Tt-Logid": uuid.uuid4().hex})
+                elif self.path.endswith("/query"):
+                    with server._lock:
+                        server.query_count += 1
+                        task = server.tasks.get(request_id)
+                    if task is None:
+                        self._status(45000000, "cannot find task")
+                    elif time.monotonic() < task["done_at"]:
+                        self._status(20000001, "Processing")
+                    else:
+                        payload = json.dumps(server.result_factory(task["request"]), ensure_ascii=False)
+                        self._status(20000000, "OK", payload.encode("utf-8"))
+                else:
+                    self._reply(404, b"")
+
+            def _status(self, code: int, message: str, body: bytes = b"", extra: Optional[Dict[str, str]] = None):
+                headers = {
+                    "Content-Type": "application/json",
+                    "X-Api-Status-Code": str(code),
+                    "X-Api-Message": message,
+                }
+                headers.update(extra or {})
+                self._reply(200, body, headers)
+
+            def _reply(self, code: int, body: bytes, headers: Optional[Dict[str, str]] = None, head: bool = False):
+                self.send_response(code)
+                headers = headers or {}
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                if "Content-Length" not in headers:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("mock asr server: " + format, *args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟识别服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--processing-time", type=float, default=5.0, help="任务处理时间（秒）")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockASRServer(args.host, args.port, processing_time=args.processing_time)
+    print(f"BYTEDANCE_SUBMIT_URL={server.submit_url}")
+    print(f"BYTEDANCE_QUERY_URL={server.query_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 """
 
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
 
 
 class WordInfo(BaseModel):
@@ -36,6 +36,13 @@ class ASRResult(BaseModel):
     utterances: Optional[List[ASRUtterance]] = Field(default=None, description="分句信息")
     audio_info: Optional[AudioInfo] = Field(default=None, description="音频信息")
 
+    @field_serializer("utterances", mode="wrap")
+    def _serialize_utterances(self, utterances, handler):
+        """分句可能是列式存储（UtteranceStore），序列化前展开为列表"""
+        if utterances is not None and not isinstance(utterances, list):
+            utterances = list(utterances)
+        return handler(utterances)
+
 
 class SubmitRequest(BaseModel):
     """提交任务请求"""
@@ -0,0 +1,154 @@
+"""
+自适应轮询策略
+
+根据音频时长（或文件大小）估算处理耗时：首次查询推迟到预计完成前，
+处理中/排队中时按指数退避并加入随机抖动，接近预计完成时间时再缩短间隔。
+"""
+
+import random
+import time
+from typing import Optional
+
+# 处理中 / 排队中
+STATUS_PROCESSING = 20000001
+STATUS_QUEUED = 20000002
+
+
+class PollingPolicy:
+    """轮询策略（每个客户端一个实例，每个任务通过 start() 创建独立的调度状态）"""
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff_factor: float = 1.6,
+        jitter: float = 0.2,
+        realtime_factor: float = 0.1,
+        base_latency: float = 3.0,
+        bytes_per_second: int = 16000,
+        first_poll_ratio: float = 0.8
+    ):
+        """
+        Args:
+            min_interval: 最小轮询间隔（秒）
+            max_interval: 最大轮询间隔（秒）
+            backoff_factor: 指数退避因子
+            jitter: 随机抖动比例（0.2 表示 ±20%）
+            realtime_factor: 预计处理耗时与音频时长之比
+            base_latency: 与时长无关的固定处理耗时（秒）
+            bytes_per_second: 仅知道文件大小时用于换算时长的码率（默认约128kbps）
+            first_poll_ratio: 首次查询时间占预计处理耗时的比例
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.realtime_factor = realtime_factor
+        self.base_latency = base_latency
+        self.bytes_per_second = bytes_per_second
+        self.first_poll_ratio = first_poll_ratio
+
+    @classmethod
+    def fixed(cls, interval: float) -> "PollingPolicy":
+        """固定间隔轮询（兼容显式传入 poll_interval 的调用方）"""
+        return cls(
+            min_interval=interval,
+            max_interval=interval,
+            backoff_factor=1.0,
+            jitter=0.0,
+            realtime_factor=0.0,
+            base_latency=0.0,
+            first_poll_ratio=0.0
+        )
+
+    def estimate_processing_time(
+        self,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None
+    ) -> Optional[float]:
+        """
+        估算处理耗时
+
+        Args:
+            audio_duration: 音频时长（毫秒）
+            audio_size: 音频文件大小（字节）
+
+        Returns:
+            预计处理耗时（秒），无法估算时返回None
+        """
+        if audio_duration:
+            seconds = audio_duration / 1000
+        elif audio_size and self.bytes_per_second:
+            seconds = audio_size / self.bytes_per_second
+        else:
+            return None
+        return self.base_latency + seconds * self.realtime_factor
+
+    def start(
+        self,
+        audio_duration: Optional[int] = None,
+        audio_size: Optional[int] = None
+    ) -> "PollSchedule":
+        """为一个任务创建轮询调度"""
+        return PollSchedule(self, self.estimate_processing_time(audio_duration, audio_size))
+
+
+class PollSchedule:
+    """单个任务的轮询调度状态"""
+
+    def __init__(self, policy: PollingPolicy, estimate: Optional[float]):
+        self.policy = policy
+        self.estimate = estimate
+        self.polls = 0
+        self.started_at = time.monotonic()
+        # 预计完成时间的起算点；排队期间会随之顺延
+        self._anchor = self.started_at
+        self._backoff_step = 0
+        self._queued = False
+        self._overdue = False
+
+    def first_delay(self) -> float:
+        """首次查询前的等待时间（无法估算时立即查询）"""
+        if self.estimate:
+            return max(self.policy.min_interval, self.estimate * self.policy.first_poll_ratio)
+        return 0.0
+
+    def next_delay(self, status_code: int) -> float:
+        """
+        记录一次查询结果并返回下一次查询前的等待时间
+
+        Args:
+            status_code: 本次查询返回的状态码
+        """
+        self.polls += 1
+        now = time.monotonic()
+        policy = self.policy
+
+        if status_code == STATUS_QUEUED:
+            self._queued = True
+        elif status_code == STATUS_PROCESSING and self._queued:
+            # 排队结束才开始真正处理，重新锚定预计完成时间
+            self._queued = False
+            self._anchor = now
+            self._backoff_step = 0
+            self._overdue = False
+
+        if self.estimate and not self._queued and not self._overdue:
+            if now >= self._anchor + self.estimate:
+                # 越过预计完成时间后，从最小间隔重新开始退避
+                self._overdue = True
+                self._backoff_step = 0
+
+        delay = min(policy.max_interval, policy.min_interval * policy.backoff_factor ** self._backoff_step)
+        # 达到最大间隔后不再增加退避步数，长时间等待时指数不会无限增长而溢出
+        if delay < policy.max_interval:
+            self._backoff_step += 1
+
+        if self.estimate and not self._queued and not self._overdue:
+            # 接近预计完成时间时，不要越过它
+            remaining = self._anchor + self.estimate - now
+            delay = min(delay, max(policy.min_interval, remaining))
+
+        if policy.jitter:
+            delay *= random.uniform(1 - policy.jitter, 1 + policy.jitter)
+        return max(0.0, delay)
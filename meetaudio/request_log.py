@@ -0,0 +1,142 @@
+"""
+客户端请求日志
+
+提交和查询每次都会记录请求与响应；长会议的查询响应可达数MB，用 f-string 拼接日志时，即使日志级别
+关闭也要先把请求头、请求体和响应体格式化成字符串。这里的日志按事件结构化记录：
+
+- 字段以 LogRecord 属性（event、task_id、asr_fields）附带，便于结构化日志处理器直接使用；
+- 消息和 asr_fields 中的字段值只在确实被读取时才格式化；
+- 请求头中的密钥始终脱敏（消息和 asr_fields 中都是），请求体和响应体截断到 LOG_BODY_LIMIT 字节；
+- 轮询类事件按任务采样，未被采样的任务只以 DEBUG 级别记录；
+- LOG_FULL_DUMP 打开时恢复完整的请求体和响应体（请求头仍然脱敏）。
+"""
+
+import json
+import logging
+import zlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .config import config
+
+# 需要脱敏的请求头/响应头（小写）
+SENSITIVE_HEADERS = frozenset({"x-api-access-key", "x-api-app-key", "authorization", "cookie", "set-cookie"})
+
+_REDACTED = "***"
+
+
+def redact_headers(headers: "Mapping[str, str]") -> Dict[str, str]:
+    """复制请求头并隐藏密钥（保留末4位便于核对）"""
+    return {
+        key: (_REDACTED + value[-4:] if len(value) > 8 else _REDACTED)
+        if key.lower() in SENSITIVE_HEADERS else value
+        for key, value in headers.items()
+    }
+
+
+def truncate_body(body: Union[bytes, str, Any], limit: Optional[int]) -> str:
+    """
+    将请求体或响应体转换为日志文本，超过 limit 字节时截断
+
+    Args:
+        body: 字节、字符串或可JSON序列化的对象
+        limit: 最大字节数，None表示不截断
+    """
+    if isinstance(body, str):
+        data = body.encode("utf-8")
+    elif isinstance(body, (bytes, bytearray)):
+        data = bytes(body)
+    else:
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+
+    if limit is None or len(data) <= limit:
+        return data.decode("utf-8", errors="replace")
+    return data[:limit].decode("utf-8", errors="ignore") + f"...（共{len(data)}字节）"
+
+
+class _Fields(Mapping):
+    """
+    日志字段（只读映射）
+
+    headers 读取时脱敏，body 读取时截断，结果缓存；输出消息时才格式化为 key=value。
+    """
+
+    __slots__ = ("fields", "full", "_rendered")
+
+    def __init__(self, fields: Dict[str, Any], full: bool):
+        self.fields = fields
+        self.full = full
+        self._rendered: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._rendered:
+            value = self.fields[key]
+            if key == "headers":
+                value = redact_headers(value)
+            elif key == "body":
+                value = truncate_body(value, None if self.full else config.LOG_BODY_LIMIT)
+            self._rendered[key] = value
+        return self._rendered[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __str__(self) -> str:
+        return " ".join(f"{key}={self[key]}" for key in self.fields)
+
+
+class RequestLogger:
+    """识别请求的结构化日志"""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        sample_rate: Optional[float] = None,
+        full_dump: Optional[bool] = None
+    ):
+        """
+        Args:
+            logger: 输出日志的 logger
+            sample_rate: 轮询类事件按任务采样的比例（0~1），默认 config.LOG_SAMPLE_RATE
+            full_dump: 是否记录完整的请求体和响应体，默认 config.LOG_FULL_DUMP
+        """
+        self.logger = logger
+        self.sample_rate = config.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.full_dump = config.LOG_FULL_DUMP if full_dump is None else full_dump
+
+    def sampled(self, task_id: str) -> bool:
+        """任务是否被采样（同一任务的结果固定）"""
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        return zlib.crc32(task_id.encode("utf-8")) < self.sample_rate * 2 ** 32
+
+    def event(self, level: int, event: str, task_id: str = "", **fields):
+        """
+        记录一个事件
+
+        Args:
+            level: 日志级别
+            event: 事件名，如 "submit"、"query"
+            task_id: 任务ID
+            **fields: 附加字段；headers 会被脱敏，body 会被截断（仅在输出或读取 asr_fields 时处理）
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        rendered = _Fields(fields, self.full_dump)
+        self.logger.log(
+            level, "%s task=%s %s", event, task_id, rendered,
+            extra={"event": event, "task_id": task_id, "asr_fields": rendered}
+        )
+
+    def poll(self, event: str, task_id: str, **fields):
+        """记录轮询类事件：被采样的任务为 INFO，其余为 DEBUG"""
+        self.event(logging.INFO if self.sampled(task_id) else logging.DEBUG, event, task_id, **fields)
+
+    def payload(self, event: str, task_id: str, **fields):
+        """记录请求头、请求体、响应体等详细内容（DEBUG，打开 full_dump 时为 INFO）"""
+        self.event(logging.INFO if self.full_dump else logging.DEBUG, event, task_id, **fields)
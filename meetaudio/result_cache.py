@@ -0,0 +1,171 @@
+"""
+任务结果缓存
+
+以任务ID为键缓存查询结果：处理中等非终态只保留很短时间，终态结果常驻内存（按LRU淘汰）。
+同一任务的并发查询只会向上游发出一次请求（single-flight），其余调用者等待并共享结果。
+完成的转写结果只解析和序列化一次，之后直接从内存返回。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .models import TaskStatus
+
+# 任务不存在（提交后短时间内可能查不到）、服务繁忙、响应缺少状态码：都可能在稍后变化
+TRANSIENT_STATUS_CODES = {0, 45000000, 55000031}
+
+
+def is_terminal(status: TaskStatus) -> bool:
+    """任务状态是否不会再变化"""
+    if status.is_success:
+        return status.result is not None
+    return status.is_failed and status.status_code not in TRANSIENT_STATUS_CODES
+
+
+class CachedStatus:
+    """缓存条目：任务状态及其序列化结果"""
+
+    __slots__ = ("status", "payload", "terminal", "expires_at")
+
+    def __init__(self, status: TaskStatus, payload: Any, terminal: bool, expires_at: Optional[float]):
+        self.status = status
+        self.payload = payload
+        self.terminal = terminal
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: float) -> bool:
+        return self.expires_at is None or now < self.expires_at
+
+
+class _Flight:
+    """一次进行中的上游查询"""
+
+    __slots__ = ("event", "entry", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.entry: Optional[CachedStatus] = None
+        self.error: Optional[BaseException] = None
+
+
+class ResultCache:
+    """任务结果缓存（线程安全）"""
+
+    def __init__(
+        self,
+        serializer: Optional[Callable[[TaskStatus], Any]] = None,
+        processing_ttl: float = 2.0,
+        max_entries: int = 256
+    ):
+        """
+        Args:
+            serializer: 将任务状态转换为响应数据，每次上游查询只调用一次
+            processing_ttl: 非终态结果的缓存时间（秒）
+            max_entries: 最多缓存的任务数量，超出后淘汰最久未使用的
+        """
+        self.serializer = serializer
+        self.processing_ttl = processing_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedStatus]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get(self, task_id: str, fetch: Callable[[], TaskStatus]) -> CachedStatus:
+        """
+        获取任务状态，缓存未命中时调用 fetch 查询上游
+
+        同一任务同时只有一个 fetch 在执行，其余调用者等待它的结果（或异常）。
+
+        Args:
+            task_id: 任务ID
+            fetch: 查询上游的函数
+
+        Returns:
+            缓存条目
+        """
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None and entry.is_fresh(time.monotonic()):
+                self._entries.move_to_end(task_id)
+                self.hits += 1
+                return entry
+
+            flight = self._flights.get(task_id)
+            leader = flight is None
+            if leader:
+                flight = self._flights[task_id] = _Flight()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry
+
+        try:
+            flight.entry = self.put(task_id, fetch())
+            return flight.entry
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(task_id, None)
+            flight.event.set()
+
+    def put(self, task_id: str, status: TaskStatus) -> CachedStatus:
+        """
+        写入任务状态（例如来自回调或长轮询的结果）
+
+        已缓存终态结果时直接返回它：终态不会再变化，不再重复解析和序列化。
+        """
+        with self._lock:
+            current = self._entries.get(task_id)
+            if current is not None and current.terminal:
+                self._entries.move_to_end(task_id)
+                return current
+
+        terminal = is_terminal(status)
+        payload = self.serializer(status) if self.serializer else None
+        expires_at = None if terminal else time.monotonic() + self.processing_ttl
+        entry = CachedStatus(status, payload, terminal, expires_at)
+
+        with self._lock:
+            current = self._entries.get(task_id)
+            if current is not None and current.terminal:
+                # 序列化期间其他线程已写入终态结果
+                return current
+            self._entries[task_id] = entry
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def peek(self, task_id: str) -> Optional[CachedStatus]:
+        """获取未过期的缓存条目，不查询上游"""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None and entry.is_fresh(time.monotonic()):
+                return entry
+            return None
+
+    def invalidate(self, task_id: str):
+        """移除任务的缓存"""
+        with self._lock:
+            self._entries.pop(task_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "terminal": sum(1 for e in self._entries.values() if e.terminal),
+                "hits": self.hits,
+                "misses": self.misses
+            }
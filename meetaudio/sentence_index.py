@@ -0,0 +1,106 @@
+"""
+句子索引
+
+按句号将文本一次性切分为句子并记录每句在原文中的位置，每个句子用多类别关键词分类器扫描一次
+即得到它命中的全部类别。同一文本的索引会被缓存，关键信息提取、分段和下一步工作提取共用同一份切分结果。
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from .matcher import KeywordClassifier
+
+
+class Sentence(NamedTuple):
+    """句子及其在原文中的位置"""
+    index: int   # 句子序号
+    text: str    # 句子原文（不含句号，未去除空白）
+    start: int   # 在原文中的起始位置
+    end: int     # 结束位置（不含）
+
+
+class SentenceIndex:
+    """文本的句子索引（切分方式与 text.split(delimiter) 一致）"""
+
+    _cache: "OrderedDict[str, SentenceIndex]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_size = 8
+
+    def __init__(self, text: str, delimiter: str = "。"):
+        """
+        Args:
+            text: 原文
+            delimiter: 句子分隔符
+        """
+        self.text = text
+        self.delimiter = delimiter
+        # 分类器 id -> (分类器, 各句类别)；同时持有分类器引用，避免 id 被复用
+        self._tags: Dict[int, Tuple[KeywordClassifier, List[FrozenSet[str]]]] = {}
+
+        self._parts = text.split(delimiter)
+        step = len(delimiter)
+        self._starts: List[int] = list(accumulate((len(part) + step for part in self._parts[:-1]), initial=0))
+        self._sentences: Optional[List[Sentence]] = None
+
+    @property
+    def sentences(self) -> List[Sentence]:
+        """全部句子（首次访问时生成）"""
+        if self._sentences is None:
+            self._sentences = list(map(self.__getitem__, range(len(self._parts))))
+        return self._sentences
+
+    @classmethod
+    def for_text(cls, text: str) -> "SentenceIndex":
+        """获取文本的句子索引（按句号切分），最近使用的若干文本的索引会被复用"""
+        with cls._cache_lock:
+            index = cls._cache.get(text)
+            if index is not None:
+                cls._cache.move_to_end(text)
+                return index
+
+        index = cls(text)
+        with cls._cache_lock:
+            cls._cache[text] = index
+            while len(cls._cache) > cls._cache_size:
+                cls._cache.popitem(last=False)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def __iter__(self) -> Iterator[Sentence]:
+        return iter(self.sentences)
+
+    def __getitem__(self, index: int) -> Sentence:
+        if index < 0:
+            index += len(self._parts)
+        part = self._parts[index]
+        start = self._starts[index]
+        return Sentence(index, part, start, start + len(part))
+
+    def sentence_at(self, offset: int) -> Sentence:
+        """原文中某个位置所在的句子（位于分隔符上时返回其前一句）"""
+        return self[max(0, bisect_right(self._starts, offset) - 1)]
+
+    def tag(self, classifier: KeywordClassifier) -> List[FrozenSet[str]]:
+        """
+        每个句子命中的关键词类别（结果按分类器缓存）
+
+        Returns:
+            与 sentences 一一对应的类别集合列表
+        """
+        cached = self._tags.get(id(classifier))
+        if cached is not None:
+            return cached[1]
+
+        tags = list(map(classifier.classify, self._parts))
+        self._tags[id(classifier)] = (classifier, tags)
+        return tags
+
+    def matching(self, classifier: KeywordClassifier, category: str) -> List[Sentence]:
+        """命中指定类别的句子（按原文顺序）"""
+        tags = self.tag(classifier)
+        return [self[i] for i, hit in enumerate(tags) if category in hit]
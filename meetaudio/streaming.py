@@ -0,0 +1,196 @@
+"""
+查询结果流式解析
+
+多小时会议开启分句和单词时间戳后，查询响应可达数十MB。一次性读取响应体、解析为字典、再转换为模型，
+同一份数据会在内存中同时存在三份。这里边读取响应体边解析：result.utterances 数组中的分句逐个解码，
+追加到列式存储后即释放，内存峰值只与单个分句（以及全文 text 字段）的大小有关，而与会议时长无关。
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from .models import ASRResult
+from .utterance_store import UtteranceStoreBuilder
+
+# 每次从响应体读取的字节数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# items() 中代表单个分句的键
+UTTERANCE = "utterances[]"
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """在按块到达的JSON文本上逐个读取值"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """读取下一块（丢弃已解析的部分），没有更多数据时返回False"""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """下一个非空白字符，没有更多数据时返回空字符串"""
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer) and buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(buffer):
+                return buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """读取一个属于 chars 的结构字符"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at stream position, got {char or 'end of data'!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        读取一个完整的JSON值
+
+        缓冲区中的数据不足时继续读取，直到可读数据量翻倍再重试，避免对大字段反复解析。
+        解码成功后还要求后面至少有一个字符，否则 "12" 可能只是 "123" 的前半部分。
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            wanted = 2 * (len(self._buffer) - self._pos) + 1
+            while len(self._buffer) - self._pos < wanted and self._fill():
+                pass
+
+    def object_keys(self) -> Iterator[str]:
+        """逐个读取对象的键；每次产出后调用方须读取（或跳过）对应的值"""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key, got {key!r}")
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def array_items(self) -> Iterator[Any]:
+        """逐个读取数组元素"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+class ResultStreamParser:
+    """
+    查询响应体的流式解析器
+
+    items() 逐个产出 result 中的内容：(UTTERANCE, 分句字典) 以及 (字段名, 值)；
+    utterances 数组本身先以 ("utterances", []) 产出，之后逐个产出其中的分句；
+    响应体中 result 以外的字段被跳过。
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        Args:
+            chunks: 响应体字节块，如 response.iter_content(STREAM_CHUNK_SIZE)
+        """
+        self._reader = _StreamReader(chunks)
+        self.has_result = False
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        reader = self._reader
+        if not reader.peek():
+            return
+        for key in reader.object_keys():
+            if key != "result" or reader.peek() != "{":
+                reader.value()
+                continue
+            self.has_result = True
+            for field in reader.object_keys():
+                if field == "utterances" and reader.peek() == "[":
+                    yield field, []
+                    for utterance in reader.array_items():
+                        yield UTTERANCE, utterance
+                else:
+                    yield field, reader.value()
+
+
+class ResultBuilder:
+    """由流式解析产出的内容逐步构建 ASRResult（分句存为列式的 UtteranceStore）"""
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.utterances = UtteranceStoreBuilder()
+        self._has_utterances = False
+
+    def add_utterance(self, utterance: Dict[str, Any]):
+        """追加一句（追加后分句字典即可释放）"""
+        self._has_utterances = True
+        self.utterances.append(utterance)
+
+    def set_field(self, key: str, value: Any):
+        """设置 result 中的字段（utterances 列表中的分句逐句追加）"""
+        if key == "utterances" and isinstance(value, list):
+            self._has_utterances = True
+            self.utterances.extend(value)
+            return
+        self.fields[key] = value
+
+    def feed(self, chunks: Iterable[bytes]) -> bool:
+        """
+        边读取边解析响应体
+
+        Returns:
+            响应体是否包含 result 字段
+        """
+        parser = ResultStreamParser(chunks)
+        for key, value in parser.items():
+            if key == UTTERANCE:
+                self.add_utterance(value)
+            else:
+                self.set_field(key, value)
+        return parser.has_result
+
+    def build(self) -> ASRResult:
+        """生成识别结果"""
+        if not self._has_utterances:
+            return ASRResult.model_validate(self.fields)
+        result = ASRResult.model_validate({**self.fields, "utterances": None})
+        result.utterances = self.utterances.build()
+        return result
@@ -0,0 +1,142 @@
+"""
+音频URL验证
+
+提交前确认音频URL可以访问，避免识别服务在下载阶段才报错。验证结果按URL缓存：
+
+- 同一URL在 URL_VALIDATION_TTL 内只探测一次，失败结果只缓存 URL_VALIDATION_FAILURE_TTL；
+- 本服务自己上传的对象（如 TOSClient.upload_file）通过 trust() 登记，提交时不再探测；
+- 探测时记录内容长度和类型，内容长度用于估算处理耗时和首次查询时间。
+
+探测先发 HEAD；HEAD 不可用时（部分对象存储的签名URL只允许GET）改为只请求第一个字节的 Range GET。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Mapping, NamedTuple, Optional
+
+from .config import config
+
+# 提交前的验证方式：先验证再提交 / 验证与提交同时进行 / 不验证
+URL_VALIDATION_MODES = ("blocking", "pipelined", "off")
+
+# 单次探测的超时时间（秒）
+PROBE_TIMEOUT = 10
+
+# HEAD 不可用时只请求第一个字节
+RANGE_HEADERS = {"Range": "bytes=0-0"}
+
+
+class AudioURLInfo(NamedTuple):
+    """音频URL的验证结果"""
+    url: str
+    accessible: bool
+    status_code: Optional[int] = None
+    content_length: Optional[int] = None
+    content_type: Optional[str] = None
+    trusted: bool = False
+    error: Optional[str] = None
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def audio_url_info(url: str, status_code: int, headers: Mapping[str, str]) -> AudioURLInfo:
+    """
+    由 HEAD 或 Range GET 的响应生成验证结果
+
+    206 响应的 Content-Length 只是本次返回的字节数，文件大小取自 Content-Range（bytes 0-0/总大小）。
+    """
+    content_length = None
+    if status_code == 206:
+        content_range = headers.get("content-range", "")
+        content_length = _parse_int(content_range.rpartition("/")[2])
+    elif status_code == 200:
+        content_length = _parse_int(headers.get("content-length"))
+
+    return AudioURLInfo(
+        url=url,
+        accessible=status_code in (200, 206),
+        status_code=status_code,
+        content_length=content_length,
+        content_type=headers.get("content-type") or None
+    )
+
+
+class URLValidator:
+    """音频URL验证结果缓存（线程安全）"""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        failure_ttl: Optional[float] = None,
+        max_entries: int = 1024
+    ):
+        """
+        Args:
+            ttl: 验证成功（及可信URL）的缓存时间（秒），默认 config.URL_VALIDATION_TTL
+            failure_ttl: 验证失败的缓存时间（秒），默认 config.URL_VALIDATION_FAILURE_TTL
+            max_entries: 最多缓存的URL数量，超出后淘汰最久未使用的
+        """
+        self.ttl = config.URL_VALIDATION_TTL if ttl is None else ttl
+        self.failure_ttl = config.URL_VALIDATION_FAILURE_TTL if failure_ttl is None else failure_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[AudioURLInfo]:
+        """未过期的验证结果，没有时返回None"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[url]
+            self.misses += 1
+            return None
+
+    def put(self, info: AudioURLInfo) -> AudioURLInfo:
+        """缓存验证结果"""
+        ttl = self.ttl if info.accessible else self.failure_ttl
+        with self._lock:
+            if ttl > 0:
+                self._entries[info.url] = (info, time.monotonic() + ttl)
+                self._entries.move_to_end(info.url)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(info.url, None)
+        return info
+
+    def trust(
+        self,
+        url: str,
+        content_length: Optional[int] = None,
+        content_type: Optional[str] = None
+    ) -> AudioURLInfo:
+        """登记本服务刚上传的对象，提交时不再探测"""
+        return self.put(AudioURLInfo(
+            url=url, accessible=True, content_length=content_length, content_type=content_type, trusted=True
+        ))
+
+    def invalidate(self, url: str):
+        """移除URL的验证结果（如对象已删除）"""
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def clear(self):
+        """清空所有验证结果"""
+        with self._lock:
+            self._entries.clear()
+
+
+# 进程内共享的验证结果，上传客户端和识别客户端通过它传递可信URL
+url_validator = URLValidator()
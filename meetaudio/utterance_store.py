@@ -0,0 +1,263 @@
+"""
+列式分句存储
+
+长会议开启单词级信息后，识别结果中有数十万个 ASRUtterance / WordInfo 对象，每个 pydantic 对象只保存
+几个整数和一小段文本，却要占用数百字节。UtteranceStore 将开始/结束时间、说话人、声道等字段存为
+array 数组，文本拼接为一个字符串并记录每句的起止位置；只有访问某个分句时才临时生成 ASRUtterance。
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .models import ASRUtterance, WordInfo
+
+# 可选字段缺失时在数组中的取值
+_MISSING = -1
+
+
+class UtteranceStore(Sequence):
+    """
+    只读的分句序列（列式存储，按下标访问时生成 ASRUtterance）
+
+    通过 take() 重排或筛选得到的新存储与原存储共用文本和单词数据，只复制各列的下标数组。
+    """
+
+    def __init__(self):
+        # 每句一行
+        self.start_times = array("q")
+        self.end_times = array("q")
+        self._speaker_codes = array("i")   # speaker_ids 中的下标，无说话人为 -1
+        self._channels = array("i")        # 无声道为 -1
+        self._definite = array("b")
+        self._text_starts = array("q")     # 在文本缓冲区中的起止位置
+        self._text_ends = array("q")
+        self._word_starts = array("q")     # 单词在单词列中的起止下标，没有单词信息（None）时为 -1
+        self._word_ends = array("q")
+
+        # 说话人ID表
+        self.speaker_ids: List[str] = []
+        self._speaker_codes_by_id: Dict[str, int] = {}
+
+        # 文本缓冲区及单词列（可被多个存储共用）
+        self._text = ""
+        self._words = _WordColumns()
+
+    @classmethod
+    def from_utterances(cls, utterances: Iterable[Union[ASRUtterance, Dict[str, Any]]]) -> "UtteranceStore":
+        """
+        由分句创建存储
+
+        Args:
+            utterances: ASRUtterance 对象或接口返回的分句字典（字段与 ASRUtterance 相同）
+        """
+        builder = UtteranceStoreBuilder()
+        builder.extend(utterances)
+        return builder.build()
+
+    def _speaker_code(self, speaker_id: Optional[str]) -> int:
+        if speaker_id is None:
+            return _MISSING
+        code = self._speaker_codes_by_id.get(speaker_id)
+        if code is None:
+            code = self._speaker_codes_by_id[speaker_id] = len(self.speaker_ids)
+            self.speaker_ids.append(speaker_id)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.start_times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("utterance index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[ASRUtterance]:
+        return map(self._materialize, range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} utterances)"
+
+    def _materialize(self, index: int) -> ASRUtterance:
+        """生成第 index 句的 ASRUtterance（不做校验）"""
+        channel = self._channels[index]
+        return ASRUtterance.model_construct(
+            text=self.text(index),
+            start_time=self.start_times[index],
+            end_time=self.end_times[index],
+            definite=bool(self._definite[index]),
+            words=self.words(index),
+            channel_id=None if channel == _MISSING else channel,
+            speaker_id=self.speaker_id(index)
+        )
+
+    def text(self, index: int) -> str:
+        """第 index 句的文本"""
+        return self._text[self._text_starts[index]:self._text_ends[index]]
+
+    def texts(self) -> Iterator[str]:
+        """按顺序返回每句文本（不生成分句对象）"""
+        text = self._text
+        return (text[start:end] for start, end in zip(self._text_starts, self._text_ends))
+
+    def speaker_id(self, index: int) -> Optional[str]:
+        """第 index 句的说话人ID"""
+        code = self._speaker_codes[index]
+        return None if code == _MISSING else self.speaker_ids[code]
+
+    def speaker_id_list(self) -> List[Optional[str]]:
+        """每句的说话人ID"""
+        table = self.speaker_ids + [None]   # 下标 -1 对应 None
+        return [table[code] for code in self._speaker_codes]
+
+    def words(self, index: int) -> Optional[List[WordInfo]]:
+        """第 index 句的单词信息"""
+        start = self._word_starts[index]
+        if start == _MISSING:
+            return None
+        return [self._words.materialize(i) for i in range(start, self._word_ends[index])]
+
+    @property
+    def word_count(self) -> int:
+        """单词总数"""
+        return sum(end - start for start, end in zip(self._word_starts, self._word_ends))
+
+    def take(self, indexes: Iterable[int]) -> "UtteranceStore":
+        """按给定下标顺序选取分句，返回共用文本和单词数据的新存储"""
+        indexes = list(indexes)
+        store = type(self)()
+        for name in ("start_times", "end_times", "_speaker_codes", "_channels", "_definite",
+                     "_text_starts", "_text_ends", "_word_starts", "_word_ends"):
+            column = getattr(self, name)
+            setattr(store, name, array(column.typecode, [column[i] for i in indexes]))
+        store.speaker_ids = self.speaker_ids
+        store._speaker_codes_by_id = self._speaker_codes_by_id
+        store._text = self._text
+        store._words = self._words
+        return store
+
+    def sorted_by_start_time(self) -> "UtteranceStore":
+        """按开始时间排序（稳定排序）"""
+        return self.take(sorted(range(len(self)), key=self.start_times.__getitem__))
+
+    def to_list(self) -> List[ASRUtterance]:
+        """生成全部 ASRUtterance 对象"""
+        return list(self)
+
+
+class UtteranceStoreBuilder:
+    """
+    逐句追加分句，最后生成 UtteranceStore
+
+    每句的字段追加到数组后，原分句对象或字典即可释放；文本每累积一批合并一次，
+    不为每句长期保留一个字符串对象，适合边解析响应边构建。
+    """
+
+    def __init__(self):
+        self._store = UtteranceStore()
+        self._texts = _TextBuffer()
+        self._word_texts = _TextBuffer()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def append(self, utterance: Union[ASRUtterance, Dict[str, Any]]):
+        """追加一句（ASRUtterance 对象或接口返回的分句字典）"""
+        store = self._store
+        get = utterance.get if isinstance(utterance, dict) else utterance.__dict__.get
+
+        store.start_times.append(int(get("start_time")))
+        store.end_times.append(int(get("end_time")))
+        store._speaker_codes.append(store._speaker_code(get("speaker_id")))
+        channel = get("channel_id")
+        store._channels.append(_MISSING if channel is None else int(channel))
+        definite = get("definite")
+        store._definite.append(1 if definite is None or definite else 0)
+
+        start, end = self._texts.add(get("text"))
+        store._text_starts.append(start)
+        store._text_ends.append(end)
+
+        utterance_words = get("words")
+        if utterance_words is None:
+            store._word_starts.append(_MISSING)
+            store._word_ends.append(_MISSING)
+            return
+        words = store._words
+        store._word_starts.append(len(words.start_times))
+        for word in utterance_words:
+            word_get = word.get if isinstance(word, dict) else word.__dict__.get
+            words.start_times.append(int(word_get("start_time")))
+            words.end_times.append(int(word_get("end_time")))
+            words.blank_durations.append(int(word_get("blank_duration") or 0))
+            start, end = self._word_texts.add(word_get("text"))
+            words.text_starts.append(start)
+            words.text_ends.append(end)
+        store._word_ends.append(len(words.start_times))
+
+    def extend(self, utterances: Iterable[Union[ASRUtterance, Dict[str, Any]]]):
+        """依次追加多句"""
+        for utterance in utterances:
+            self.append(utterance)
+
+    def build(self) -> UtteranceStore:
+        """生成存储（之后不应再追加）"""
+        store = self._store
+        store._text = self._texts.getvalue()
+        store._words.text = self._word_texts.getvalue()
+        return store
+
+
+class _TextBuffer:
+    """只追加的文本缓冲区，每累积一批文本合并为一段"""
+
+    _BATCH = 4096
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._pending: List[str] = []
+        self._length = 0
+
+    def add(self, text: str):
+        """追加文本，返回其在缓冲区中的 (起始, 结束) 位置"""
+        start = self._length
+        self._length += len(text)
+        self._pending.append(text)
+        if len(self._pending) >= self._BATCH:
+            self._chunks.append("".join(self._pending))
+            self._pending = []
+        return start, self._length
+
+    def getvalue(self) -> str:
+        return "".join(self._chunks + self._pending)
+
+
+class _WordColumns:
+    """单词信息列"""
+
+    def __init__(self):
+        self.start_times = array("q")
+        self.end_times = array("q")
+        self.blank_durations = array("q")
+        self.text_starts = array("q")
+        self.text_ends = array("q")
+        self.text = ""
+
+    def materialize(self, index: int) -> WordInfo:
+        return WordInfo.model_construct(
+            text=self.text[self.text_starts[index]:self.text_ends[index]],
+            start_time=self.start_times[index],
+            end_time=self.end_times[index],
+            blank_duration=self.blank_durations[index]
+        )
+
+
+def utterance_texts(utterances: Sequence) -> Iterable[str]:
+    """分句文本（列式存储时不生成分句对象）"""
+    if isinstance(utterances, UtteranceStore):
+        return utterances.texts()
+    return [utterance.text for utterance in utterances]
@@ -0,0 +1,143 @@
+"""
+任务结果订阅
+
+同一任务无论有多少等待者，都只由一个后台轮询线程调用 wait_for_result，
+等待者只在条件变量上阻塞、在结果到达时被统一唤醒。
+配合 gevent 等协程 worker 或 Server-Sent Events，长时间等待不再独占 Web 工作线程。
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from .models import ASRResult
+from .exceptions import APIError, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+Outcome = Union[ASRResult, Exception]
+
+
+class TaskWatcher:
+    """任务结果订阅器：每个任务一个后台轮询，任意数量的等待者"""
+
+    def __init__(self, client=None, timeout: int = 1800, max_entries: int = 1000):
+        """
+        Args:
+            client: 用于轮询的 ByteDanceASRClient（可稍后通过 client 属性设置或替换）
+            timeout: 后台轮询的最长时间（秒）
+            max_entries: 最多保留的已完成任务结果数量
+        """
+        self.client = client
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._outcomes: "OrderedDict[str, Outcome]" = OrderedDict()
+        self._pollers: Dict[str, threading.Thread] = {}
+        # 各任务正在等待的等待者数量；轮询失败的异常只保留到这些等待者都被唤醒
+        self._waiters: Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    @property
+    def active_pollers(self) -> int:
+        """正在运行的后台轮询数量"""
+        with self._condition:
+            return len(self._pollers)
+
+    def watch(self, task_id: str, **wait_kwargs: Any) -> bool:
+        """
+        确保任务有一个后台轮询
+
+        Args:
+            task_id: 任务ID
+            **wait_kwargs: 传给 wait_for_result 的其他参数（audio_duration 等）
+
+        Returns:
+            是否新启动了轮询（已有轮询或已有结果时返回False）
+        """
+        with self._condition:
+            if task_id in self._outcomes or task_id in self._pollers:
+                return False
+            if self.client is None:
+                raise APIError("ASR客户端未初始化")
+
+            poller = threading.Thread(
+                target=self._poll,
+                args=(self.client, task_id, wait_kwargs),
+                name=f"TaskWatcher-{task_id}",
+                daemon=True
+            )
+            self._pollers[task_id] = poller
+        poller.start()
+        logger.info(f"开始后台轮询任务: {task_id}")
+        return True
+
+    def wait_outcome(self, task_id: str, timeout: Optional[float] = None) -> Optional[Outcome]:
+        """
+        订阅任务并等待结果，不抛出异常
+
+        Returns:
+            识别结果或轮询失败的异常；在 timeout 内未完成时返回None
+        """
+        with self._condition:
+            self._waiters[task_id] = self._waiters.get(task_id, 0) + 1
+        try:
+            self.watch(task_id)
+            with self._condition:
+                self._condition.wait_for(lambda: task_id in self._outcomes, timeout)
+                return self._outcomes.get(task_id)
+        finally:
+            with self._condition:
+                self._waiters[task_id] -= 1
+                if not self._waiters[task_id]:
+                    del self._waiters[task_id]
+                    # 失败不缓存：最后一个等待者离开后移除异常，下次等待时重新轮询
+                    if isinstance(self._outcomes.get(task_id), Exception):
+                        del self._outcomes[task_id]
+
+    def wait(self, task_id: str, timeout: Optional[float] = None) -> ASRResult:
+        """
+        订阅任务并等待识别结果
+
+        Args:
+            task_id: 任务ID
+            timeout: 本次等待的超时时间（秒），不影响后台轮询
+
+        Returns:
+            识别结果
+        """
+        outcome = self.wait_outcome(task_id, timeout)
+        if outcome is None:
+            raise TimeoutError(f"Task {task_id} timeout after {timeout} seconds")
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def discard(self, task_id: str):
+        """移除已完成任务的结果，下次等待时重新轮询（失败的结果在等待者被唤醒后自动移除）"""
+        with self._condition:
+            self._outcomes.pop(task_id, None)
+
+    def _poll(self, client, task_id: str, wait_kwargs: Dict[str, Any]):
+        start = time.monotonic()
+        try:
+            outcome: Outcome = client.wait_for_result(
+                task_id, timeout=wait_kwargs.pop("timeout", self.timeout), **wait_kwargs
+            )
+        except Exception as e:
+            outcome = e
+
+        with self._condition:
+            self._pollers.pop(task_id, None)
+            # 没有等待者时不保留失败，下次等待时重新轮询
+            if not (isinstance(outcome, Exception) and not self._waiters.get(task_id)):
+                self._outcomes[task_id] = outcome
+            while len(self._outcomes) > self.max_entries:
+                self._outcomes.popitem(last=False)
+            self._condition.notify_all()
+
+        logger.info(
+            f"后台轮询结束: {task_id} ({'失败' if isinstance(outcome, Exception) else '完成'}, "
+            f"耗时 {time.monotonic() - start:.1f}s)"
+        )
@@ -0,0 +1,172 @@
+"""
+AI撰稿引擎分段生成测试
+"""
+
+import re
+import time
+
+import pytest
+
+from meetaudio.ai_writer import AIWriter
+from meetaudio.cancellation import CancelToken
+from meetaudio.exceptions import TaskCancelledError
+from meetaudio.mock_llm_server import MockLLMServer
+
+MEETING_INFO = {"topic": "安全工作会议"}
+
+
+def meeting_text(chunks):
+    """生成 chunks*200 句的会议记录（每200句约3800token）"""
+    sentence = "机务部门汇报了本月航班保障情况并提出改进措施"
+    return "。".join(f"{sentence}{i:05d}" for i in range(chunks * 200)) + "。"
+
+
+def reply(messages):
+    """分段摘要回复“第N段要点”，合并摘要回复其中各段标题，最终纪要回复固定内容"""
+    prompt = messages[-1]["content"]
+    if messages[0]["role"] == "system":
+        return "<meeting_minutes>会议纪要正文</meeting_minutes>"
+    if "合并为一份摘要" in prompt:
+        return "合并要点：" + "、".join(re.findall(r"## (分段[\d-]+)摘要", prompt))
+    index = re.search(r"片段：(\d+)/", prompt).group(1)
+    return f"第{index}段要点：" + "航班保障" * 20
+
+
+@pytest.fixture
+def llm_server(monkeypatch):
+    with MockLLMServer(delay=0.05, reply_factory=reply) as server:
+        monkeypatch.setenv("ARK_API_KEY", "test-key")
+        monkeypatch.setenv("ARK_BASE_URL", server.base_url)
+        yield server
+
+
+def make_writer(server, **kwargs):
+    return AIWriter(api_key="test-key", base_url=server.base_url, **kwargs)
+
+
+def final_prompt(server):
+    return next(p for p in reversed(server.prompts) if "## 分段" in p and "合并为一份摘要" not in p)
+
+
+class TestChunkedGenerate:
+    """分段生成测试类"""
+
+    def test_concurrent_map_preserves_order(self, llm_server):
+        """测试分段摘要并发生成，合并时保持原顺序"""
+        writer = make_writer(llm_server, chunk_concurrency=4, reduce_max_length=100_000)
+        result = writer._chunked_ai_generate(meeting_text(8), {}, MEETING_INFO, "model")
+
+        assert result["meeting_summary"] == "会议纪要正文"
+        assert 1 < llm_server.max_active <= 4
+        headers = re.findall(r"## 分段(\d+)摘要\n第(\d+)段要点", final_prompt(llm_server))
+        total = len(writer.chunker.split(meeting_text(8)))
+        assert headers == [(str(i), str(i)) for i in range(1, total + 1)]
+
+    def test_chunk_retry(self, llm_server, monkeypatch):
+        """测试单个分段失败后重试，不影响其余分段"""
+        monkeypatch.setattr("meetaudio.ai_writer.CHUNK_RETRY_DELAY", 0)
+        llm_server.fail_first = 2
+        writer = make_writer(llm_server, chunk_concurrency=2, chunk_retries=2, reduce_max_length=100_000)
+        writer.client = None  # 不降级到OpenAI客户端，只测试分段重试
+        writer._chunked_ai_generate(meeting_text(3), {}, MEETING_INFO, "model")
+        assert "失败" not in final_prompt(llm_server)
+
+        llm_server.fail_first = llm_server.call_count + 100
+        summary = writer._generate_chunk_summary("内容", 0, 1, MEETING_INFO, "model")
+        assert summary.startswith("分段1摘要生成失败")
+
+    def test_hierarchical_reduce(self, llm_server):
+        """测试合并摘要超出预算时逐级合并相邻摘要"""
+        writer = make_writer(llm_server, chunk_concurrency=4, reduce_max_length=400)
+        writer._chunked_ai_generate(meeting_text(10), {}, MEETING_INFO, "model")
+
+        merges = [p for p in llm_server.prompts if "合并为一份摘要" in p]
+        assert merges
+        combined = final_prompt(llm_server)
+        labels = re.findall(r"## 分段(\d+)-(\d+)摘要", combined)
+        assert labels and labels[0][0] == "1"
+        # 相邻分组首尾相接，覆盖全部分段
+        for (_, end), (start, _) in zip(labels, labels[1:]):
+            assert int(start) == int(end) + 1
+
+    def test_cancel_while_waiting(self, llm_server):
+        """测试等待分段摘要期间被取消时尽快退出"""
+        llm_server.delay = 2
+        writer = make_writer(llm_server, chunk_concurrency=2)
+        start = time.monotonic()
+        with pytest.raises(TaskCancelledError):
+            writer._chunked_ai_generate(meeting_text(4), {}, MEETING_INFO, "model", CancelToken(timeout=0.3))
+        assert time.monotonic() - start < 1.5
+
+    def test_summary_call_capped_by_cancel_token(self, llm_server):
+        """测试分段摘要调用的超时不超过取消令牌的剩余时间"""
+        llm_server.delay = 2
+        writer = make_writer(llm_server, chunk_retries=0)
+        start = time.monotonic()
+        with pytest.raises(TaskCancelledError):
+            writer._summarize_with_retry("内容", "model", "分段1", CancelToken(timeout=0.3))
+        assert time.monotonic() - start < 1.5
+
+
+class TestStreamingGenerate:
+    """流式生成测试类"""
+
+    def test_streams_final_minutes_only(self, llm_server):
+        """测试分段生成时只有最终纪要流式回调"""
+        writer = make_writer(llm_server, chunk_concurrency=4, reduce_max_length=100_000)
+        seen = []
+        result = writer._chunked_ai_generate(meeting_text(3), {}, MEETING_INFO, "model", on_text=seen.append)
+        assert result["meeting_summary"] == "会议纪要正文"
+        assert seen[-1] == "<meeting_minutes>会议纪要正文</meeting_minutes>"
+        assert all("段要点" not in text for text in seen)
+
+    def test_cancel_while_streaming(self, llm_server):
+        """测试接收流式回复期间被取消时立即中断"""
+        llm_server.delay = 0
+        llm_server.token_delay = 0.05
+        writer = make_writer(llm_server)
+        seen = []
+        start = time.monotonic()
+        with pytest.raises(TaskCancelledError):
+            writer._direct_api_call("model", "系统", "用户", CancelToken(timeout=0.3), on_text=seen.append)
+        assert time.monotonic() - start < 1
+        assert 0 < len(seen) < len("<meeting_minutes>会议纪要正文</meeting_minutes>")
+
+
+@pytest.mark.slow
+class TestStreamingLatency:
+    """流式生成首字耗时测试"""
+
+    def test_time_to_first_token(self, llm_server):
+        """测试首字前0.2秒、每字5毫秒的回复，流式调用的首字耗时与完整生成耗时"""
+        llm_server.delay = 0.2
+        llm_server.token_delay = 0.005
+        llm_server.reply_factory = lambda messages: "<meeting_minutes>" + "会议纪要正文" * 50 + "</meeting_minutes>"
+        writer = make_writer(llm_server)
+        first = []
+        start = time.perf_counter()
+        writer._direct_api_call(
+            "model", "系统", "用户", on_text=lambda text: first or first.append(time.perf_counter() - start)
+        )
+        total = time.perf_counter() - start
+        print(f"\n首字耗时: {first[0]:.3f}s, 完整生成: {total:.3f}s")
+        assert first[0] < total * 0.5
+
+
+@pytest.mark.slow
+class TestChunkedGenerateLatency:
+    """分段生成端到端耗时测试"""
+
+    def test_end_to_end_latency(self, llm_server):
+        """测试10段会议记录在每次调用0.3秒延迟下，串行与并发的端到端耗时"""
+        llm_server.delay = 0.3
+        content = meeting_text(10)
+        elapsed = {}
+        for concurrency in (1, 4, 10):
+            writer = make_writer(llm_server, chunk_concurrency=concurrency, reduce_max_length=100_000)
+            start = time.perf_counter()
+            writer._chunked_ai_generate(content, {}, MEETING_INFO, "model")
+            elapsed[concurrency] = time.perf_counter() - start
+        print("\n" + ", ".join(f"并发{c}: {t:.2f}s" for c, t in elapsed.items()))
+        assert elapsed[4] < elapsed[1] * 0.6
+        assert elapsed[10] < elapsed[4]
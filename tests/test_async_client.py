@@ -0,0 +1,124 @@
+"""
+异步客户端测试
+"""
+
+import json
+import pytest
+import httpx
+
+from meetaudio.async_client import AsyncByteDanceASRClient
+from meetaudio.models import ASRResult, ASRUtterance
+from meetaudio.exceptions import AuthenticationError, InvalidParameterError, ServiceBusyError
+
+
+def make_client(handler):
+    """创建使用MockTransport的异步客户端"""
+    client = AsyncByteDanceASRClient(
+        app_key="test_app_key",
+        access_key="test_access_key"
+    )
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncByteDanceASRClient:
+    """AsyncByteDanceASRClient测试类"""
+
+    def test_init_without_credentials(self, monkeypatch):
+        """测试没有凭据时初始化失败"""
+        monkeypatch.setattr("meetaudio.client.config.APP_KEY", "")
+        monkeypatch.setattr("meetaudio.client.config.ACCESS_KEY", "")
+        with pytest.raises(AuthenticationError):
+            AsyncByteDanceASRClient()
+
+    @pytest.mark.asyncio
+    async def test_submit_audio_success(self):
+        """测试成功提交音频，并记录X-Tt-Logid"""
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(200)
+            body = json.loads(request.content)
+            assert body["audio"]["url"] == "http://example.com/test.mp3"
+            assert request.headers["X-Api-App-Key"] == "test_app_key"
+            return httpx.Response(200, headers={
+                "X-Api-Status-Code": "20000000",
+                "X-Api-Message": "OK",
+                "X-Tt-Logid": "logid-1"
+            })
+
+        async with make_client(handler) as client:
+            task_id = await client.submit_audio("http://example.com/test.mp3")
+
+        assert task_id
+        assert client._task_logids[task_id] == "logid-1"
+
+    @pytest.mark.asyncio
+    async def test_submit_audio_invalid_params(self):
+        """测试状态码映射到同一异常类型"""
+        def handler(request):
+            if request.method == "HEAD":
+                return httpx.Response(200)
+            return httpx.Response(200, headers={
+                "X-Api-Status-Code": "45000001",
+                "X-Api-Message": "Invalid parameters"
+            })
+
+        async with make_client(handler) as client:
+            with pytest.raises(InvalidParameterError):
+                await client.submit_audio("http://example.com/test.mp3")
+
+    @pytest.mark.asyncio
+    async def test_get_result_parses_models(self):
+        """测试查询结果解析为相同的数据模型"""
+        payload = {
+            "result": {
+                "text": "你好世界",
+                "utterances": [{"text": "你好世界", "start_time": 0, "end_time": 1000}],
+                "audio_info": {"duration": 1000}
+            }
+        }
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"X-Api-Status-Code": "20000000", "X-Api-Message": "OK"},
+                json=payload
+            )
+
+        async with make_client(handler) as client:
+            status = await client.get_result("task-1")
+
+        assert status.is_success
+        assert isinstance(status.result, ASRResult)
+        assert isinstance(status.result.utterances[0], ASRUtterance)
+        assert status.result.audio_info.duration == 1000
+
+    @pytest.mark.asyncio
+    async def test_wait_for_result_success(self):
+        """测试先处理中、后成功"""
+        responses = iter([
+            httpx.Response(200, headers={"X-Api-Status-Code": "20000001", "X-Api-Message": "Processing"}),
+            httpx.Response(
+                200,
+                headers={"X-Api-Status-Code": "20000000", "X-Api-Message": "OK"},
+                json={"result": {"text": "test text"}}
+            ),
+        ])
+
+        async with make_client(lambda request: next(responses)) as client:
+            result = await client.wait_for_result("task-1", timeout=10, poll_interval=0)
+
+        assert result.text == "test text"
+
+    @pytest.mark.asyncio
+    async def test_wait_for_result_failed(self):
+        """测试失败状态抛出映射的异常"""
+        def handler(request):
+            return httpx.Response(200, headers={
+                "X-Api-Status-Code": "55000031",
+                "X-Api-Message": "Service busy"
+            })
+
+        async with make_client(handler) as client:
+            with pytest.raises(ServiceBusyError):
+                await client.wait_for_result("task-1", timeout=10, poll_interval=0)
@@ -0,0 +1,571 @@
+"""
+Web演示异步任务管理器测试
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+WEB_DEMO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web_demo")
+
+
+@pytest.fixture
+def atm(tmp_path, monkeypatch):
+    """在临时目录中导入 async_task_manager（模块导入时会创建全局实例和持久化目录）"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(WEB_DEMO_DIR)
+    sys.modules.pop("async_task_manager", None)
+    module = importlib.import_module("async_task_manager")
+    yield module
+    sys.modules.pop("async_task_manager", None)
+
+
+@pytest.fixture
+def manager(atm, tmp_path):
+    managers = []
+
+    def create(**kwargs):
+        kwargs.setdefault("persist_dir", str(tmp_path / "tasks"))
+        m = atm.AsyncTaskManager(**kwargs)
+        managers.append(m)
+        return m
+
+    yield create
+    for m in managers:
+        m.stop()
+
+
+def pid_handler(task_data, task):
+    """进程池处理器：汇报进度并返回子进程PID"""
+    task.progress = 50
+    time.sleep(0.2)
+    return {"pid": os.getpid(), "x": task_data["x"]}
+
+
+def docx_handler(task_data, task):
+    """生成Word文档（CPU密集）"""
+    from meetaudio.document_generator import DocumentGenerator
+    return len(DocumentGenerator().generate_simple_doc("会议纪要", task_data["content"]))
+
+
+def append_handler(task_data, task):
+    """把任务ID追加写入文件，用于统计执行次数"""
+    with open(task_data["log"], "a") as f:
+        f.write(f"{task.task_id}\n")
+    return {"pid": os.getpid()}
+
+
+def run_shared_worker(atm, persist_dir, duration):
+    """子进程：运行一个共享任务管理器一段时间"""
+    m = atm.SharedAsyncTaskManager(max_workers=2, persist_dir=persist_dir, poll_interval=0.02)
+    m.register_handler("append", append_handler)
+    m.start()
+    time.sleep(duration)
+    m.stop()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+class TestDispatch:
+    """就绪队列调度测试"""
+
+    def test_worker_wakes_on_submit(self, manager):
+        """测试空闲工作线程在提交后立即开始执行"""
+        m = manager(max_workers=1)
+        started = threading.Event()
+        m.register_handler("echo", lambda data, task: started.set() or data)
+        m.start()
+        time.sleep(0.05)  # 让工作线程进入等待
+
+        t0 = time.monotonic()
+        task_id = m.submit_task("echo", {"x": 1})
+        assert started.wait(2)
+        assert time.monotonic() - t0 < 0.5
+        assert wait_until(lambda: m.get_task_result(task_id) == {"x": 1})
+
+    def test_priority_then_fifo_order(self, manager, atm):
+        """测试按优先级、同优先级按提交顺序执行"""
+        m = manager(max_workers=1)
+        order = []
+        m.register_handler("record", lambda data, task: order.append(data["name"]))
+        for name, priority in [("low-1", 0), ("high", 5), ("low-2", 0), ("mid", 1)]:
+            m.submit_task("record", {"name": name}, priority=priority)
+        m.start()
+
+        assert wait_until(lambda: len(order) == 4)
+        assert order == ["high", "mid", "low-1", "low-2"]
+
+    def test_pending_tasks_reloaded_into_queue(self, manager, tmp_path):
+        """测试重启后未执行的任务重新进入就绪队列"""
+        m = manager()
+        m.register_handler("echo", lambda data, task: data)
+        task_id = m.submit_task("echo", {"x": 1})
+        m.stop()
+
+        restarted = manager()
+        restarted.register_handler("echo", lambda data, task: data)
+        restarted.start()
+        assert wait_until(lambda: restarted.get_task_result(task_id) == {"x": 1})
+
+    def test_stop_wakes_idle_workers(self, manager):
+        """测试停止时等待中的工作线程立即退出"""
+        m = manager(max_workers=2)
+        m.start()
+        time.sleep(0.05)
+        m.stop()
+        for thread in m.worker_threads:
+            thread.join(1)
+            assert not thread.is_alive()
+
+
+class TestExecutors:
+    """执行方式测试"""
+
+    def test_process_executor(self, manager):
+        """测试进程池执行并回传进度"""
+        m = manager(max_workers=1)
+        m.register_handler("pid", pid_handler, executor="process")
+        m.start()
+        task_id = m.submit_task("pid", {"x": 1})
+
+        assert wait_until(lambda: m.get_task_status(task_id)["progress"] == 50)
+        assert wait_until(lambda: m.get_task_result(task_id) is not None, timeout=10)
+        result = m.get_task_result(task_id)
+        assert result["x"] == 1
+        assert result["pid"] != os.getpid()
+        assert m.get_task_status(task_id)["progress"] == 100
+
+    def test_inline_executor(self, manager):
+        """测试同步执行：提交返回时任务已完成"""
+        m = manager()
+        m.register_handler("echo", lambda data, task: data, executor="inline")
+        task_id = m.submit_task("echo", {"x": 1})
+        assert m.get_task_result(task_id) == {"x": 1}
+
+    def test_unknown_executor(self, manager):
+        """测试未知执行方式"""
+        with pytest.raises(ValueError):
+            manager().register_handler("echo", lambda data, task: data, executor="gpu")
+
+
+class TestCancellation:
+    """任务取消与超时测试"""
+
+    def test_cancel_pending_task(self, manager):
+        """测试取消等待中的任务后不再执行"""
+        m = manager(max_workers=1)
+        gate = threading.Event()
+        executed = []
+        m.register_handler("block", lambda data, task: gate.wait(5))
+        m.register_handler("echo", lambda data, task: executed.append(data))
+        m.start()
+
+        m.submit_task("block", {})
+        task_id = m.submit_task("echo", {"x": 1})
+        assert m.cancel_task(task_id)
+        assert not m.cancel_task(task_id)
+        gate.set()
+
+        assert m.get_task_status(task_id)["status"] == "cancelled"
+        time.sleep(0.1)
+        assert executed == []
+
+    def test_cancel_running_task_cooperatively(self, manager):
+        """测试执行中的处理器通过取消令牌退出"""
+        m = manager(max_workers=1)
+
+        def handler(data, task):
+            while True:
+                task.cancel_token.sleep(0.01)
+
+        m.register_handler("loop", handler)
+        m.register_handler("echo", lambda data, task: data)
+        m.start()
+
+        task_id = m.submit_task("loop", {})
+        assert wait_until(lambda: m.get_task_status(task_id)["status"] == "running")
+        assert m.cancel_task(task_id)
+        assert m.get_task_status(task_id)["status"] == "cancelled"
+
+        follow_up = m.submit_task("echo", {"x": 1})
+        assert wait_until(lambda: m.get_task_result(follow_up) == {"x": 1})
+        assert m.get_task_status(task_id)["status"] == "cancelled"
+        assert wait_until(lambda: len([t for t in m.worker_threads if t.is_alive()]) == 1)
+
+    def test_timeout_frees_worker(self, manager):
+        """测试不响应取消的处理器超时后被标记失败，工作线程槽位立即可用"""
+        m = manager(max_workers=1, task_timeout=0.2)
+        gate = threading.Event()
+        m.register_handler("stuck", lambda data, task: gate.wait(5))
+        m.register_handler("echo", lambda data, task: data)
+        m.start()
+
+        stuck = m.submit_task("stuck", {})
+        follow_up = m.submit_task("echo", {"x": 1})
+        try:
+            assert wait_until(lambda: m.get_task_result(follow_up) == {"x": 1}, timeout=2)
+            status = m.get_task_status(stuck)
+            assert status["status"] == "failed"
+            assert status["error"] == "任务执行超时"
+        finally:
+            gate.set()
+        time.sleep(0.05)
+        assert m.get_task_status(stuck)["status"] == "failed"
+
+    def test_process_task_timeout(self, manager):
+        """测试进程池任务超时后工作线程停止等待"""
+        m = manager(max_workers=1, task_timeout=0.1)
+        m.register_handler("pid", pid_handler, executor="process")
+        m.start()
+
+        task_id = m.submit_task("pid", {"x": 1})
+        assert wait_until(lambda: m.get_task_status(task_id)["status"] == "failed")
+        assert m.get_task_status(task_id)["error"] == "任务执行超时"
+
+    def test_cancel_in_shared_store(self, atm, tmp_path):
+        """测试取消其他进程提交的任务，执行中的持有者在续约时得知取消"""
+        import task_persistence
+        store = task_persistence.SharedTaskStore(str(tmp_path / "shared.db"), lease_seconds=30)
+        store.insert(make_record("task-1"))
+        store.insert(make_record("task-2"))
+
+        assert store.cancel("task-1")
+        assert store.load("task-1")["status"] == "cancelled"
+        assert store.claim("worker-a", ["echo"])["task_id"] == "task-2"
+        assert store.cancel("task-2")
+        assert not store.renew("task-2", "worker-a")
+        assert not store.cancel("task-2")
+
+        # 已结束的任务可以用同一ID重新提交，未结束的不行
+        store.insert(make_record("task-1"))
+        assert store.load("task-1")["status"] == "pending"
+        with pytest.raises(Exception):
+            store.insert(make_record("task-1"))
+
+
+class TestPartialText:
+    """流式生成部分文本测试"""
+
+    def test_partial_text_wakes_waiters(self, manager):
+        """测试处理器更新部分文本时唤醒等待者，执行中的状态附带部分文本，结束后不再附带"""
+        m = manager(max_workers=1)
+        gate = threading.Event()
+
+        def handler(data, task):
+            task.partial_text = "会议"
+            gate.wait(5)
+            task.partial_text = "会议纪要"
+            return {"ok": True}
+
+        m.register_handler("stream", handler)
+        m.start()
+
+        revision = m.wait_for_update(-1, timeout=0)
+        task_id = m.submit_task("stream", {})
+        revision = m.wait_for_update(revision, timeout=2)
+        assert wait_until(lambda: m.get_task_status(task_id).get("partial_text") == "会议")
+
+        gate.set()
+        start = time.monotonic()
+        while m.get_task_status(task_id)["status"] != "completed":
+            revision = m.wait_for_update(revision, timeout=2)
+        assert time.monotonic() - start < 1
+        assert "partial_text" not in m.get_task_status(task_id)
+
+    def test_wait_times_out(self, manager):
+        """测试没有更新时等待到超时"""
+        m = manager()
+        revision = m.wait_for_update(-1, timeout=0)
+        start = time.monotonic()
+        assert m.wait_for_update(revision, timeout=0.1) == revision
+        assert time.monotonic() - start >= 0.09
+
+
+class TestSharedStore:
+    """多进程共享任务存储测试"""
+
+    def test_lease_expiry_and_fencing(self, atm, tmp_path):
+        """测试租约过期后可被接管，原持有者的结果被拒绝"""
+        import task_persistence
+        store = task_persistence.SharedTaskStore(str(tmp_path / "shared.db"), lease_seconds=0.1)
+        store.insert(make_record("task-1"))
+
+        assert store.claim("worker-a", ["echo"])["task_id"] == "task-1"
+        assert store.claim("worker-b", ["echo"]) is None
+        time.sleep(0.15)
+        assert store.claim("worker-b", ["echo"])["task_id"] == "task-1"
+
+        done = make_record("task-1", status="completed", completed_at="2025-01-01T00:00:00")
+        assert not store.complete(done, "worker-a")
+        assert store.complete(done, "worker-b")
+        assert store.load("task-1")["status"] == "completed"
+        assert store.claim("worker-a", ["echo"]) is None
+
+    def test_status_visible_across_managers(self, atm, tmp_path):
+        """测试一个管理器提交的任务可由另一个管理器执行和查询"""
+        submitter = atm.SharedAsyncTaskManager(persist_dir=str(tmp_path / "shared"), poll_interval=0.02)
+        worker = atm.SharedAsyncTaskManager(persist_dir=str(tmp_path / "shared"), poll_interval=0.02)
+        try:
+            submitter.register_handler("echo", lambda data, task: data)
+            worker.register_handler("echo", lambda data, task: data)
+            worker.start()
+
+            task_id = submitter.submit_task("echo", {"x": 1})
+            assert submitter.get_task_status(task_id) is not None
+            assert wait_until(lambda: submitter.get_task_result(task_id) == {"x": 1})
+            assert worker.get_task_status(task_id)["status"] == "completed"
+        finally:
+            worker.stop()
+            submitter.stop()
+
+    def test_partial_text_visible_across_managers(self, atm, tmp_path):
+        """测试执行中任务的部分文本写入共享存储，其他管理器查询时可见，结束后不再附带"""
+        submitter = atm.SharedAsyncTaskManager(persist_dir=str(tmp_path / "shared"), poll_interval=0.02)
+        worker = atm.SharedAsyncTaskManager(
+            persist_dir=str(tmp_path / "shared"), poll_interval=0.02, partial_text_interval=0.05
+        )
+        gate = threading.Event()
+
+        def handler(data, task):
+            task.partial_text = "会议"
+            task.partial_text = "会议纪要"
+            gate.wait(5)
+            return {"ok": True}
+
+        try:
+            submitter.register_handler("stream", handler)
+            worker.register_handler("stream", handler)
+            worker.start()
+
+            task_id = submitter.submit_task("stream", {})
+            # 第二次更新被节流，由心跳补写
+            assert wait_until(lambda: submitter.get_task_status(task_id).get("partial_text") == "会议纪要")
+            assert submitter.get_task_status(task_id)["status"] == "running"
+
+            gate.set()
+            assert wait_until(lambda: submitter.get_task_status(task_id)["status"] == "completed")
+            assert "partial_text" not in submitter.get_task_status(task_id)
+        finally:
+            gate.set()
+            worker.stop()
+            submitter.stop()
+
+    def test_exactly_once_across_processes(self, atm, tmp_path):
+        """测试多个 worker 进程并发领取时每个任务只执行一次"""
+        import multiprocessing
+        persist_dir = str(tmp_path / "shared")
+        log = str(tmp_path / "executions.log")
+        submitter = atm.SharedAsyncTaskManager(persist_dir=persist_dir)
+        submitter.register_handler("append", append_handler)
+        task_ids = [submitter.submit_task("append", {"log": log}) for _ in range(60)]
+
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=run_shared_worker, args=(atm, persist_dir, 2.0)) for _ in range(3)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(30)
+
+        with open(log) as f:
+            executed = f.read().split()
+        assert sorted(executed) == sorted(task_ids)
+        assert all(submitter.get_task_status(t)["status"] == "completed" for t in task_ids)
+        assert len({submitter.get_task_result(t)["pid"] for t in task_ids}) > 1
+
+
+@pytest.fixture(params=["sqlite", "journal"])
+def persistence_factory(request, atm, tmp_path):
+    """创建指定后端的持久化实例（同一目录可多次打开以模拟重启）"""
+    import task_persistence
+    opened = []
+
+    def create():
+        p = task_persistence.create_persistence(request.param, str(tmp_path / "tasks"))
+        opened.append(p)
+        return p
+
+    yield create
+    for p in opened:
+        try:
+            p.close()
+        except Exception:
+            pass
+
+
+def make_record(task_id, status="pending", completed_at=None, result=None):
+    return {
+        "task_id": task_id,
+        "task_type": "echo",
+        "priority": 0,
+        "status": status,
+        "result": result,
+        "error": None,
+        "created_at": "2025-01-01T00:00:00",
+        "started_at": None,
+        "completed_at": completed_at,
+        "progress": 100 if completed_at else 0,
+        "task_data": {"text": "会议\t内容\n第二行"}
+    }
+
+
+class TestPersistence:
+    """持久化后端测试"""
+
+    def test_replays_only_active_tasks(self, persistence_factory):
+        """测试重启后只回放未结束的任务，历史任务按需读取"""
+        p = persistence_factory()
+        p.save(make_record("pending-1"))
+        p.save(make_record("running-1", status="running"))
+        p.save(make_record("done-1", status="completed", completed_at="2025-01-01T00:01:00", result={"a": 1}))
+        p.save(make_record("done-2", status="pending"))
+        p.save(make_record("done-2", status="failed", completed_at="2025-01-01T00:02:00"))
+        p.close()
+
+        reopened = persistence_factory()
+        assert sorted(r["task_id"] for r in reopened.load_active()) == ["pending-1", "running-1"]
+        assert reopened.load("done-1")["result"] == {"a": 1}
+        assert reopened.load("pending-1")["task_data"]["text"] == "会议\t内容\n第二行"
+        assert reopened.load("missing") is None
+
+    def test_delete_and_purge(self, persistence_factory):
+        """测试删除和按结束时间清理"""
+        p = persistence_factory()
+        p.save(make_record("old", status="completed", completed_at="2025-01-01T00:00:00"))
+        p.save(make_record("new", status="completed", completed_at="2025-01-02T00:00:00"))
+        p.save(make_record("gone"))
+        p.flush()
+        p.delete("gone")
+        p.purge("2025-01-01T12:00:00")
+        p.close()
+
+        reopened = persistence_factory()
+        assert reopened.load("old") is None
+        assert reopened.load("gone") is None
+        assert reopened.load("new") is not None
+        assert reopened.load_active() == []
+
+    def test_writes_are_batched(self, persistence_factory):
+        """测试同一任务的多次状态变化合并为一次写入"""
+        p = persistence_factory()
+        batches = []
+        original = p._write_batch
+        p._write_batch = lambda puts, deletes: batches.append(len(puts)) or original(puts, deletes)
+
+        for progress in range(50):
+            record = make_record("task-1")
+            record["progress"] = progress
+            p.save(record)
+        p.flush()
+
+        assert sum(batches) < 50
+        assert p.load("task-1")["progress"] == 49
+
+    def test_manager_restart(self, manager, atm, tmp_path):
+        """测试管理器重启后继续执行未完成任务，并能查询历史任务"""
+        m = manager()
+        m.register_handler("echo", lambda data, task: data)
+        m.start()
+        done_id = m.submit_task("echo", {"x": 1})
+        assert wait_until(lambda: m.get_task_result(done_id) == {"x": 1})
+        m.stop()
+        pending_id = m.submit_task("echo", {"x": 2})
+        m.persistence.close()
+
+        restarted = manager()
+        assert set(restarted.tasks) == {pending_id}
+        assert restarted.get_task_result(done_id) == {"x": 1}
+
+        restarted.register_handler("echo", lambda data, task: data)
+        restarted.start()
+        assert wait_until(lambda: restarted.get_task_result(pending_id) == {"x": 2})
+
+
+@pytest.mark.slow
+class TestDispatchBenchmark:
+    """调度性能基准（pytest -m slow）"""
+
+    def test_submit_to_start_latency(self, manager):
+        """测试提交到开始执行的延迟"""
+        m = manager(max_workers=1)
+        started = threading.Event()
+        m.register_handler("noop", lambda data, task: started.set())
+        m.start()
+
+        latencies = []
+        for _ in range(200):
+            started.clear()
+            t0 = time.perf_counter()
+            m.submit_task("noop", {})
+            assert started.wait(2)
+            latencies.append(time.perf_counter() - t0)
+
+        latencies.sort()
+        p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+        print(f"\nsubmit-to-start latency p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms")
+        assert p50 < 0.05
+
+    def test_throughput_with_retained_tasks(self, manager, atm):
+        """测试保留1万个已完成任务时的调度吞吐"""
+        m = manager(max_workers=2)
+        for i in range(10000):
+            task = atm.AsyncTask(f"done-{i}", "noop", {})
+            task.status = atm.TaskStatus.COMPLETED
+            m.tasks[task.task_id] = task
+        # 基准只衡量调度本身
+        m._save_task = lambda task: None
+
+        done = []
+        m.register_handler("noop", lambda data, task: done.append(1))
+        m.start()
+
+        count = 2000
+        t0 = time.perf_counter()
+        for _ in range(count):
+            m.submit_task("noop", {})
+        assert wait_until(lambda: len(done) == count, timeout=30)
+        elapsed = time.perf_counter() - t0
+        print(f"\nthroughput with 10k retained tasks: {count / elapsed:.0f} tasks/s")
+        assert count / elapsed > 500
+
+    def test_cold_start_with_historical_tasks(self, manager, persistence_factory):
+        """测试10万个历史任务时的冷启动耗时"""
+        p = persistence_factory()
+        for i in range(100000):
+            p.save(make_record(f"done-{i}", status="completed", completed_at="2025-01-01T00:00:00",
+                               result={"minutes": "纪要" * 50}))
+        for i in range(10):
+            p.save(make_record(f"pending-{i}"))
+        p.close()
+
+        t0 = time.perf_counter()
+        restarted = manager(persistence=persistence_factory())
+        elapsed = time.perf_counter() - t0
+        print(f"\ncold start with 100k historical tasks: {elapsed * 1000:.1f}ms")
+        assert len(restarted.tasks) == 10
+        assert elapsed < 1.0
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_docx_throughput(self, manager, executor):
+        """测试4个工作者时Word文档生成吞吐（线程 vs 进程池）"""
+        m = manager(max_workers=4)
+        m.register_handler("docx", docx_handler, executor=executor)
+        m.start()
+        content = "会议讨论了项目进展和下一步工作安排。" * 2000
+
+        count = 16
+        t0 = time.perf_counter()
+        task_ids = [m.submit_task("docx", {"content": content}) for _ in range(count)]
+        assert wait_until(lambda: all(m.get_task_result(t) for t in task_ids), timeout=120)
+        elapsed = time.perf_counter() - t0
+        print(f"\ndocx throughput ({executor}, 4 workers, {os.cpu_count()} CPUs): {count / elapsed:.1f} docs/s")
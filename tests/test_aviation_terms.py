@@ -0,0 +1,220 @@
+"""
+民航术语处理与关键词匹配测试
+"""
+
+import random
+import re
+import time
+
+import pytest
+
+from meetaudio.aviation_terms import AviationTermsProcessor
+from meetaudio.matcher import TermMatcher
+
+
+def legacy_normalize(processor, text):
+    """原实现：每个术语一次 \\b 包裹的 re.sub"""
+    result = text
+    for pattern, replacement in processor.colloquial_patterns:
+        result = re.sub(pattern, replacement, result)
+    for colloquial, formal in processor.term_mapping.items():
+        pattern = r'\b' + re.escape(colloquial) + r'\b'
+        result = re.sub(pattern, formal, result)
+    return re.sub(r'\s+', ' ', result).strip()
+
+
+def legacy_entities(text):
+    """原实现：每个关键词一次 re.findall"""
+    entities = {"departments": [], "positions": [], "aircraft_types": []}
+    for keyword in ["部", "中心", "处", "科", "组", "队"]:
+        entities["departments"].extend(re.findall(r'[\u4e00-\u9fa5]+' + keyword, text))
+    for pos in ["总经理", "书记", "主任", "经理", "主管", "专员", "员"]:
+        if pos in text:
+            entities["positions"].append(pos)
+    entities["aircraft_types"].extend(re.findall(r'[A-Z]\d{3}|ARJ\d+|C\d{3}', text))
+    return {key: set(values) for key, values in entities.items()}
+
+
+def random_transcript(processor, length, seed=0):
+    """由术语、中文、数字、英文和标点随机拼成的转写文本"""
+    rng = random.Random(seed)
+    terms = list(processor.term_mapping)
+    fillers = [
+        "今天", "我们讨论一下", "大概3", "5个亿", "嗯嗯", "A320", "OK", "的", "1200多万",
+        "安全管理部", "运行控制中心", "财务处", "部门", "中心组", "总经理", "专员", "ARJ21", "C919", "XA3201"
+    ]
+    separators = ["，", "。", " ", "、", "\n", "", "", "：", "-", "/"]
+    parts = []
+    size = 0
+    while size < length:
+        part = rng.choice(terms) if rng.random() < 0.4 else rng.choice(fillers)
+        part += rng.choice(separators)
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+class TestTermMatcher:
+    """TermMatcher测试类"""
+
+    def test_longest_match_first(self):
+        """测试同一位置优先替换最长的关键词，且替换结果不再被匹配"""
+        matcher = TermMatcher({"运控": "运行控制", "运控中心": "运行控制中心", "控制": "X"})
+        assert matcher.replace("运控中心和运控") == "运行控制中心和运行控制"
+        assert list(matcher.finditer("a运控中心")) == [(1, 5, "运控中心")]
+
+    def test_word_boundary(self):
+        """测试词边界：汉字属于 \\w，连续中文中的关键词不会被替换"""
+        matcher = TermMatcher({"总": "总经理", "MEL": "最低设备清单"}, word_boundary=True)
+        assert matcher.replace("总，请看MEL") == "总经理，请看MEL"
+        assert matcher.replace("总结 MEL。") == "总结 最低设备清单。"
+        assert matcher.replace("MELT") == "MELT"
+
+    def test_boundary_falls_back_to_shorter_term(self):
+        """测试最长关键词不满足词边界时回退到较短的关键词"""
+        matcher = TermMatcher({"AB": "1", "ABC": "2"}, word_boundary=True)
+        assert matcher.replace("ABC ABCD AB") == "2 ABCD 1"
+
+    def test_incremental_add(self):
+        """测试新增关键词后立即生效，已有关键词可更新替换文本"""
+        matcher = TermMatcher({"a.b": "x"})
+        assert matcher.replace("a.b a+b") == "x a+b"
+        matcher.add({"a+b": "y", "a.b": "z"})
+        assert matcher.replace("a.b a+b [a]") == "z y [a]"
+        assert len(matcher) == 2
+        assert "a+b" in matcher
+
+    def test_empty(self):
+        """测试没有关键词时原样返回"""
+        assert TermMatcher().replace("文本") == "文本"
+        assert list(TermMatcher().finditer("文本")) == []
+
+
+class TestAviationTermsProcessor:
+    """AviationTermsProcessor测试类"""
+
+    @pytest.mark.parametrize("text", [
+        "飞机，客机。货机",
+        "川航 川航集团 3U",
+        "总、副总、总工：书记",
+        "运控中心 运控 机务部 机务",
+        "320和321, 737/787 ARJ C919",
+        "SMS QAR FOQA MEL CDL",
+        "大概30架飞机 差不多5个亿 1200多万",
+        "三重一大，双控，四不两直",
+        "我们今天总结一下飞机的情况",
+        "  延误   取消\n\n返航  ",
+        "",
+    ])
+    def test_equivalent_to_regex_per_term(self, text):
+        """测试与逐个术语 re.sub 的结果一致"""
+        processor = AviationTermsProcessor()
+        assert processor.normalize_text(text) == legacy_normalize(processor, text)
+
+    def test_equivalent_on_random_transcripts(self):
+        """测试随机转写文本上与原实现结果一致"""
+        processor = AviationTermsProcessor()
+        for seed in range(20):
+            text = random_transcript(processor, 2000, seed)
+            assert processor.normalize_text(text) == legacy_normalize(processor, text)
+
+    def test_cjk_word_boundary(self):
+        """测试 \\b 在中文中的实际效果：只有被标点或空白隔开的术语才会被替换"""
+        processor = AviationTermsProcessor()
+        assert processor.normalize_text("飞机") == "航空器"
+        assert processor.normalize_text("这架飞机延误了") == "这架飞机延误了"
+        assert processor.normalize_text("这架 飞机 延误了") == "这架 航空器 延误了"
+
+    def test_add_custom_terms(self):
+        """测试自定义术语立即生效"""
+        processor = AviationTermsProcessor()
+        processor.add_custom_terms({"成都天府": "成都天府国际机场", "总": "总裁"})
+        assert processor.normalize_text("成都天府，总") == "成都天府国际机场，总裁"
+        assert processor.get_formal_term("成都天府") == "成都天府国际机场"
+
+    @pytest.mark.parametrize("text", [
+        "安全管理部和运行控制中心的总经理",
+        "部部，中心中心，部",
+        "机务维修部门财务处处长、飞行队队员",
+        "A320、ARJ21和C919，XA3201，B7871",
+        "书记主任经理主管专员",
+        "",
+    ])
+    def test_entities_equivalent_to_findall(self, text):
+        """测试实体提取结果与逐个关键词 re.findall 一致"""
+        entities = AviationTermsProcessor().extract_aviation_entities(text)
+        expected = legacy_entities(text)
+        assert {key: set(entities[key]) for key in expected} == expected
+        assert entities["airports"] == entities["routes"] == entities["regulations"] == []
+
+    def test_entities_equivalent_on_random_transcripts(self):
+        """测试随机转写文本上实体提取与原实现一致"""
+        processor = AviationTermsProcessor()
+        for seed in range(20):
+            text = random_transcript(processor, 2000, seed)
+            entities = processor.extract_aviation_entities(text)
+            assert {key: set(entities[key]) for key in ("departments", "positions", "aircraft_types")} \
+                == legacy_entities(text)
+            assert all(len(values) == len(set(values)) for values in entities.values())
+
+    def test_scan_entities_spans(self):
+        """测试实体带有类型和位置"""
+        text = "请安全管理部总经理确认A320。"
+        entities = AviationTermsProcessor().scan_entities(text)
+        assert [(e.type, e.text) for e in entities] == [
+            ("departments", "请安全管理部"), ("positions", "总经理"), ("positions", "经理"), ("aircraft_types", "A320")
+        ]
+        assert all(text[e.start:e.end] == e.text for e in entities)
+        assert all(e.utterance_index is None for e in entities)
+
+    def test_scan_utterance_entities(self):
+        """测试按分句提取实体并记录分句序号"""
+        from meetaudio.models import ASRUtterance
+        utterances = [
+            ASRUtterance(text="大家好", start_time=0, end_time=1000),
+            ASRUtterance(text="运行控制中心汇报", start_time=1000, end_time=2000),
+            "C919的情况",
+        ]
+        entities = AviationTermsProcessor().scan_utterance_entities(utterances)
+        assert [(e.utterance_index, e.type, e.text, e.start) for e in entities] == [
+            (1, "departments", "运行控制中心", 0), (2, "aircraft_types", "C919", 0)
+        ]
+
+
+@pytest.mark.slow
+class TestTermMatcherBenchmark:
+    """术语替换性能测试"""
+
+    def test_three_hour_transcript(self):
+        """测试约20万字（3小时会议）转写文本的术语规范化耗时"""
+        processor = AviationTermsProcessor()
+        text = random_transcript(processor, 200_000)
+
+        start = time.perf_counter()
+        expected = legacy_normalize(processor, text)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = processor.normalize_text(text)
+        single_pass = time.perf_counter() - start
+
+        print(f"\n逐个术语 re.sub: {legacy * 1000:.1f}ms, 单次扫描: {single_pass * 1000:.1f}ms")
+        assert result == expected
+        assert single_pass < legacy
+
+    def test_entity_extraction(self):
+        """测试约20万字转写文本的实体提取耗时"""
+        processor = AviationTermsProcessor()
+        text = random_transcript(processor, 200_000)
+
+        start = time.perf_counter()
+        expected = legacy_entities(text)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        entities = processor.scan_entities(text)
+        single_pass = time.perf_counter() - start
+
+        print(f"\n逐个关键词 findall: {legacy * 1000:.1f}ms, 单次扫描（含位置）: {single_pass * 1000:.1f}ms, "
+              f"实体数: {len(entities)}")
+        assert {e.text for e in entities if e.type == "departments"} == expected["departments"]
@@ -0,0 +1,160 @@
+"""
+回调接收测试
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from unittest.mock import patch
+
+from meetaudio.callback import CallbackReceiver, CallbackRegistry, parse_callback
+from meetaudio.enhanced_client import MeetingASRClient
+from meetaudio.mock_server import MockASRServer
+from meetaudio.models import ASRResult, TaskStatus
+
+
+RESULT_BODY = {
+    "audio_info": {"duration": 1000},
+    "result": {"text": "测试文本", "utterances": []}
+}
+
+
+class TestParseCallback:
+    """parse_callback测试类"""
+
+    def test_success_from_headers(self):
+        """测试从请求头读取任务ID和状态码"""
+        task_id, status = parse_callback(
+            json.dumps(RESULT_BODY).encode("utf-8"),
+            {"X-Api-Request-Id": "task-1", "X-Api-Status-Code": "20000000", "X-Api-Message": "OK"}
+        )
+        assert task_id == "task-1"
+        assert status.is_success
+        assert status.result.text == "测试文本"
+
+    def test_task_id_from_callback_data(self):
+        """测试从callback_data读取任务ID，缺少状态码但带结果时视为成功"""
+        task_id, status = parse_callback(dict(RESULT_BODY, callback_data="task-2"))
+        assert task_id == "task-2"
+        assert status.is_success
+
+    def test_failure_without_result(self):
+        """测试失败回调不要求识别结果"""
+        task_id, status = parse_callback({"id": "task-3", "code": 45000006, "message": "Invalid audio URI"})
+        assert task_id == "task-3"
+        assert status.is_failed
+        assert status.result is None
+
+    @pytest.mark.parametrize("payload, headers", [
+        (b"not json", {}),
+        (b"[]", {}),
+        (json.dumps(RESULT_BODY).encode("utf-8"), {}),
+        (b'{"id": "task-4"}', {}),
+        (b'{"id": "task-4", "code": "abc"}', {}),
+        (b'{"id": "task-4", "code": 20000000}', {}),
+    ])
+    def test_invalid_payload(self, payload, headers):
+        """测试非法推送被拒绝"""
+        with pytest.raises(ValueError):
+            parse_callback(payload, headers)
+
+
+class TestCallbackRegistry:
+    """CallbackRegistry测试类"""
+
+    def test_wait_wakes_on_publish(self):
+        """测试推送到达时立即唤醒等待者"""
+        registry = CallbackRegistry()
+        status = TaskStatus(status_code=20000000, message="OK", result=ASRResult(text="测试文本"))
+        threading.Timer(0.05, registry.publish, args=("task-1", status)).start()
+
+        start = time.monotonic()
+        assert registry.wait("task-1", timeout=5) is status
+        assert time.monotonic() - start < 1
+
+    def test_wait_timeout(self):
+        """测试超时返回None"""
+        assert CallbackRegistry().wait("missing", timeout=0.01) is None
+
+    def test_alias_and_eviction(self):
+        """测试别名映射和容量淘汰"""
+        registry = CallbackRegistry(max_entries=2)
+        registry.alias("request-id", "task-1")
+        registry.publish("request-id", TaskStatus(status_code=20000000, message="OK", result=ASRResult(text="")))
+        assert registry.get("task-1") is not None
+
+        registry.publish("task-2", TaskStatus(status_code=45000006, message="Invalid audio URI"))
+        registry.publish("task-3", TaskStatus(status_code=45000006, message="Invalid audio URI"))
+        assert registry.get("task-1") is None
+
+    def test_non_terminal_not_stored(self):
+        """测试处理中、成功但无结果的推送不登记，等待者继续等待"""
+        registry = CallbackRegistry()
+        registry.publish("task-1", TaskStatus(status_code=20000001, message="Processing"))
+        registry.publish("task-1", TaskStatus(status_code=20000000, message="OK"))
+        assert registry.get("task-1") is None
+        assert registry.wait("task-1", timeout=0.01) is None
+
+    def test_non_terminal_push_keeps_polling(self):
+        """测试收到处理中推送后，等待结果仍按间隔查询上游直到完成（不会空转）"""
+        registry = CallbackRegistry()
+        with MockASRServer(processing_time=0.3, fire_callbacks=False) as server, \
+                patch("meetaudio.client.config.SUBMIT_URL", server.submit_url), \
+                patch("meetaudio.client.config.QUERY_URL", server.query_url):
+            client = MeetingASRClient(app_key="app", access_key="key", callback_registry=registry)
+            task_id = client.submit_meeting_audio(server.audio_url())
+            registry.publish(task_id, TaskStatus(status_code=20000001, message="Processing"))
+
+            result = client.wait_for_result(task_id, timeout=10, poll_interval=0.1)
+        assert result.text
+        assert 1 <= client.get_poll_count(task_id) < 50
+
+
+class TestCallbackReceiver:
+    """CallbackReceiver测试类"""
+
+    def _post(self, url, body, headers=None):
+        req = urllib.request.Request(url, data=body, headers=headers or {}, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=5) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def test_rejects_invalid_requests(self):
+        """测试令牌错误和非法请求体被拒绝"""
+        with CallbackReceiver(token="secret") as receiver:
+            base = receiver.url.split("?")[0]
+            assert self._post(base + "?token=wrong", b"{}") == 403
+            assert self._post(receiver.url, b"not json") == 400
+            assert self._post(
+                receiver.url, json.dumps(RESULT_BODY).encode("utf-8"),
+                {"X-Api-Request-Id": "task-1", "X-Api-Status-Code": "20000000"}
+            ) == 200
+            assert receiver.registry.get("task-1").is_success
+
+    def test_end_to_end_with_mock_server(self):
+        """测试回调唤醒等待：只需一次确认查询，且无需等满轮询间隔"""
+        with MockASRServer(processing_time=0.3) as server, CallbackReceiver() as receiver:
+            client = MeetingASRClient(
+                app_key="test_app_key",
+                access_key="test_access_key",
+                callback_url=receiver.url,
+                callback_registry=receiver.registry
+            )
+            with patch("meetaudio.client.config.SUBMIT_URL", server.submit_url), \
+                    patch("meetaudio.client.config.QUERY_URL", server.query_url):
+                task_id = client.submit_meeting_audio(server.audio_url())
+
+                start = time.monotonic()
+                result = client.wait_for_meeting_result(task_id, timeout=30, poll_interval=20)
+                elapsed = time.monotonic() - start
+
+        assert "模拟识别结果" in result.full_text
+        assert elapsed < 5
+        assert server.callbacks_sent == 1
+        assert client.get_poll_count(task_id) <= 1
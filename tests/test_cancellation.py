@@ -0,0 +1,49 @@
+"""
+取消令牌测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from meetaudio.cancellation import CancelToken
+from meetaudio.exceptions import TaskCancelledError
+
+
+class TestCancelToken:
+    """CancelToken测试类"""
+
+    def test_cancel(self):
+        """测试取消后抛出异常"""
+        token = CancelToken()
+        token.raise_if_cancelled()
+        assert token.remaining() is None
+        assert token.cap_timeout(60) == 60
+
+        token.cancel()
+        assert token.cancelled
+        with pytest.raises(TaskCancelledError, match="任务已取消"):
+            token.raise_if_cancelled()
+
+    def test_deadline(self):
+        """测试超过截止时间后视为超时，单次超时不超过剩余时间"""
+        token = CancelToken(timeout=0.1)
+        assert not token.cancelled
+        assert token.cap_timeout(60) <= 0.1
+
+        time.sleep(0.12)
+        assert token.cancelled
+        assert token.reason == "timeout"
+        with pytest.raises(TaskCancelledError, match="任务执行超时"):
+            token.raise_if_cancelled()
+
+    def test_sleep_interrupted(self):
+        """测试等待可被取消立即打断"""
+        token = CancelToken()
+        threading.Timer(0.05, token.cancel).start()
+
+        start = time.monotonic()
+        with pytest.raises(TaskCancelledError):
+            token.sleep(5)
+        assert time.monotonic() - start < 1
@@ -0,0 +1,147 @@
+"""
+按token预算分段测试
+"""
+
+import time
+
+import pytest
+
+from meetaudio.ai_writer import AIWriter
+from meetaudio.chunker import TokenChunker, estimate_tokens
+
+
+def meeting_text(sentences):
+    """生成带说话人轮次的会议记录"""
+    lines = []
+    for i in range(sentences):
+        if i % 50 == 0:
+            lines.append(f"\n{'党委书记' if i % 100 == 0 else '总经理'}发言：\n")
+        lines.append(f"机务部门汇报了本月航班保障情况{i:05d}，完成率达到98.5%！")
+    return "".join(lines)
+
+
+class TestEstimateTokens:
+    """token估算测试类"""
+
+    def test_estimate(self):
+        """测试中文按字、英文按单词长度、标点逐个估算"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("会议决定") == 3
+        assert estimate_tokens("meeting minutes") == 2 + 2
+        assert estimate_tokens("完成率98.5%。") == 3 + 2 + 3
+
+
+class TestTokenChunker:
+    """TokenChunker测试类"""
+
+    def test_segments(self):
+        """测试在中英文句末标点和换行处切分，保留原文，不切开小数"""
+        chunker = TokenChunker(100)
+        text = "会议开始。“请汇报！”Version 3.5 is ready. OK? 好的；\n总经理发言：\n同意"
+        segments = chunker.segments(text)
+        assert "".join(s.text for s in segments) == text
+        assert [s.text for s in segments] == [
+            "会议开始。", "“请汇报！”", "Version 3.5 is ready.", " OK?", " 好的；", "\n", "总经理发言：\n", "同意"
+        ]
+        assert [s.text for s in segments if s.speaker] == ["总经理发言：\n"]
+
+    def test_split_within_budget(self):
+        """测试各段不超过预算，不重叠时按顺序覆盖全文"""
+        text = meeting_text(500)
+        chunker = TokenChunker(300)
+        chunks = chunker.split(text)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+        assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+    def test_overlap(self):
+        """测试新分段先重复上一段末尾不超过重叠预算的句子"""
+        chunker = TokenChunker(300, overlap_tokens=60)
+        chunks = chunker.split(meeting_text(500))
+        assert all(estimate_tokens(chunk) <= 300 for chunk in chunks)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            first = chunker.segments(chunk)[0].text
+            assert first in previous
+
+        total = sum(estimate_tokens(chunk) for chunk in chunks)
+        assert total > estimate_tokens(meeting_text(500))
+
+    def test_speaker_header_kept_with_turn(self):
+        """测试放得下说话人标题行、放不下其后发言时，标题行移到下一段"""
+        # 甲的发言共42token，标题行4token恰好放得下
+        chunks = TokenChunker(46).split("甲：\n" + "第一句话。" * 10 + "\n乙发言：\n" + "第二句话。" * 3)
+        assert chunks == ["甲：\n" + "第一句话。" * 10, "乙发言：\n" + "第二句话。" * 3]
+
+    def test_long_sentence_hard_split(self):
+        """测试没有标点的长段落按预算硬切"""
+        text = "航班保障" * 1000
+        chunks = TokenChunker(500).split(text)
+        assert "".join(chunks) == text
+        assert all(estimate_tokens(chunk) <= 500 for chunk in chunks)
+
+    @pytest.mark.parametrize("max_tokens, overlap, text", [
+        (6000, 200, "中" * 20000 + "abc " * 20000),
+        (100, 0, "中" * 500 + "a" * 2000),
+        (7, 0, "ab中c,d" * 50),
+    ])
+    def test_mixed_script_hard_split_within_budget(self, max_tokens, overlap, text):
+        """测试中英文混排、没有句末标点的长段落硬切后每段都不超过预算"""
+        chunks = TokenChunker(max_tokens, overlap_tokens=overlap).split(text)
+        assert all(estimate_tokens(chunk) <= max_tokens for chunk in chunks)
+        assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+    def test_invalid_budget(self):
+        """测试非法的预算和重叠"""
+        with pytest.raises(ValueError):
+            TokenChunker(0)
+        with pytest.raises(ValueError):
+            TokenChunker(100, overlap_tokens=50)
+
+    def test_ai_writer_config(self, monkeypatch):
+        """测试AIWriter按环境变量配置分段预算"""
+        monkeypatch.setenv("ARK_CHUNK_TOKENS", "3000")
+        monkeypatch.setenv("ARK_CHUNK_OVERLAP_TOKENS", "100")
+        writer = AIWriter(api_key="test-key", base_url="http://127.0.0.1:9/api/v3")
+        assert (writer.chunker.max_tokens, writer.chunker.overlap_tokens) == (3000, 100)
+        writer = AIWriter(api_key="test-key", base_url="http://127.0.0.1:9/api/v3", chunk_overlap_tokens=0)
+        assert writer.chunker.overlap_tokens == 0
+
+
+@pytest.mark.slow
+class TestChunkerBenchmark:
+    """分段性能测试"""
+
+    @staticmethod
+    def split_by_chars(content, max_length=6000):
+        """原按句号、字符数分段的实现（逐句拼接字符串）"""
+        chunks = []
+        current_chunk = ""
+        for sentence in content.split("。"):
+            test_chunk = current_chunk + sentence + "。"
+            if len(test_chunk) > max_length and current_chunk:
+                chunks.append(current_chunk.strip())
+                current_chunk = sentence + "。"
+            else:
+                current_chunk = test_chunk
+        if current_chunk.strip():
+            chunks.append(current_chunk.strip())
+        return chunks
+
+    def test_linear_time_and_chunk_count(self):
+        """测试约3小时会议（2万句）分段耗时随文本长度线性增长，以及与按字符分段的段数对比"""
+        def timed(text):
+            best = float("inf")
+            for _ in range(3):
+                start = time.perf_counter()
+                TokenChunker(6000, overlap_tokens=200).split(text)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        small, large = meeting_text(5_000), meeting_text(20_000)
+        small_time, large_time = timed(small), timed(large)
+        chunks = TokenChunker(6000, overlap_tokens=200).split(large)
+        legacy = self.split_by_chars(large.replace("！", "。"))
+        print(f"\n5千句: {small_time * 1000:.1f}ms, 2万句: {large_time * 1000:.1f}ms; "
+              f"按字符分段: {len(legacy)}段, 按token分段: {len(chunks)}段")
+        assert large_time < small_time * 4 * 2
+        assert len(chunks) < len(legacy)
@@ -4,6 +4,8 @@
 
 import pytest
 import uuid
+import threading
+import time
 from unittest.mock import Mock, patch
 
 from meetaudio.client import ByteDanceASRClient
@@ -236,3 +238,80 @@ class TestByteDanceASRClient:
         # 测试未知错误
         with pytest.raises(APIError):
             client._handle_error(99999999, "Unknown error")
+
+
+class TestTranscribeMany:
+    """transcribe_many批量接口测试类"""
+
+    @staticmethod
+    def make_client():
+        return ByteDanceASRClient(
+            app_key="test_app_key",
+            access_key="test_access_key"
+        )
+
+    def test_yields_results_as_tasks_finish(self):
+        """测试按完成先后产出结果，而非提交顺序"""
+        # 每个任务需要查询的次数：a最慢，c最快
+        polls_needed = {"task-a": 3, "task-b": 2, "task-c": 1}
+        polls = {task_id: 0 for task_id in polls_needed}
+
+        def fake_get_result(task_id):
+            polls[task_id] += 1
+            if polls[task_id] >= polls_needed[task_id]:
+                return TaskStatus(status_code=20000000, message="OK", result=ASRResult(text=task_id))
+            return TaskStatus(status_code=20000001, message="Processing")
+
+        client = self.make_client()
+        urls = ["http://x/a.mp3", "http://x/b.mp3", "http://x/c.mp3"]
+        with patch.object(client, "submit_audio", side_effect=lambda url, **kw: "task-" + url[-5]), \
+                patch.object(client, "get_result", side_effect=fake_get_result):
+            results = list(client.transcribe_many(urls, concurrency=3, poll_interval=0.01))
+
+        assert [url for url, _ in results] == ["http://x/c.mp3", "http://x/b.mp3", "http://x/a.mp3"]
+        assert all(isinstance(result, ASRResult) for _, result in results)
+
+    def test_concurrency_is_bounded(self):
+        """测试同时进行中的请求数不超过concurrency"""
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def tracked(value):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return value
+
+        client = self.make_client()
+        urls = [f"http://x/{i}.mp3" for i in range(20)]
+        done = TaskStatus(status_code=20000000, message="OK", result=ASRResult(text="ok"))
+        with patch.object(client, "submit_audio", side_effect=lambda url, **kw: tracked(url)), \
+                patch.object(client, "get_result", side_effect=lambda task_id: tracked(done)):
+            results = list(client.transcribe_many(urls, concurrency=4, poll_interval=0))
+
+        assert len(results) == 20
+        assert peak[0] <= 4
+
+    def test_return_exceptions(self):
+        """测试失败任务以异常形式产出"""
+        def fake_get_result(task_id):
+            if task_id == "bad":
+                return TaskStatus(status_code=45000002, message="Empty audio")
+            return TaskStatus(status_code=20000000, message="OK", result=ASRResult(text=task_id))
+
+        client = self.make_client()
+        with patch.object(client, "submit_audio", side_effect=lambda url, **kw: url), \
+                patch.object(client, "get_result", side_effect=fake_get_result):
+            results = dict(client.transcribe_many(["good", "bad"], poll_interval=0, return_exceptions=True))
+
+        assert results["good"].text == "good"
+        assert isinstance(results["bad"], AudioFormatError)
+
+        with patch.object(client, "submit_audio", side_effect=lambda url, **kw: url), \
+                patch.object(client, "get_result", side_effect=fake_get_result):
+            with pytest.raises(AudioFormatError):
+                list(client.transcribe_many(["bad"], poll_interval=0))
@@ -0,0 +1,144 @@
+"""
+查询结果解码测试
+"""
+
+import gc
+import json
+import logging
+import time
+import tracemalloc
+from unittest.mock import Mock, patch
+
+import pytest
+
+from meetaudio import decoding
+from meetaudio.client import ByteDanceASRClient, parse_asr_result
+from meetaudio.decoding import RawResult, decode_asr_result, preview
+from meetaudio.models import TaskStatus
+from meetaudio.utterance_store import UtteranceStore
+from tests.test_utterance_store import raw_utterances
+
+
+def payload(utterances=20, words=2, text="全文"):
+    return {"result": {
+        "text": text, "utterances": raw_utterances(utterances, words), "audio_info": {"duration": 1000}
+    }}
+
+
+def encode(data):
+    return json.dumps(data, ensure_ascii=False).encode()
+
+
+class TestDecodeASRResult:
+    """decode_asr_result测试类"""
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_same_models_as_kwargs_parsing(self, orjson_available):
+        """测试快速解码与逐句创建模型的结果一致（有无orjson）"""
+        if orjson_available and not decoding.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        data = payload()
+        with patch.object(decoding, "ORJSON_AVAILABLE", orjson_available):
+            result = decode_asr_result(encode(data))
+            assert decode_asr_result(b'{"code": 0}') is None
+        assert result == parse_asr_result(json.loads(encode(data)))
+
+    def test_columnar(self):
+        """测试解码为列式分句存储"""
+        data = payload()
+        result = decode_asr_result(encode(data), columnar=True)
+        assert isinstance(result.utterances, UtteranceStore)
+        assert result.model_dump() == parse_asr_result(data).model_dump()
+        assert decode_asr_result(encode({"result": {"text": "无分句"}}), columnar=True).utterances is None
+
+    def test_invalid_payload(self):
+        """测试不合法的响应体抛出 ValueError"""
+        with pytest.raises(ValueError):
+            decode_asr_result(b"not json")
+        with pytest.raises(ValueError):
+            decode_asr_result(b'{"result": {"utterances": []}}')
+
+    def test_preview_truncates(self):
+        """测试日志预览只保留开头部分"""
+        content = encode(payload(200))
+        text = preview(content)
+        assert len(text) < 300 and text.endswith(f"（共{len(content)}字节）")
+        assert preview(b'{"a": 1}') == '{"a": 1}'
+
+
+class TestRawResult:
+    """RawResult测试类"""
+
+    def test_lazy_decode(self):
+        """测试只在调用 decode() 时解码，结果被缓存"""
+        raw = RawResult(TaskStatus(status_code=20000000, message="OK"), encode(payload()))
+        assert raw.is_success and raw.json()["result"]["text"] == "全文"
+        with patch.object(decoding, "decode_asr_result", wraps=decode_asr_result) as decode:
+            status = raw.decode()
+            assert raw.decode() is status
+        decode.assert_called_once()
+        assert status.result.audio_info.duration == 1000
+
+    def test_not_decoded_unless_success(self):
+        """测试处理中或失败的状态不解码结果"""
+        raw = RawResult(TaskStatus(status_code=20000001, message="Processing"), b"{}")
+        assert raw.is_processing and raw.decode().result is None
+
+    def test_failure_logs_preview_only(self, caplog):
+        """测试解码失败时记录警告，调试日志只包含响应体预览"""
+        content = b'{"result": {"utterances": "' + b"x" * 10_000 + b'"}}'
+        raw = RawResult(TaskStatus(status_code=20000000, message="OK"), content)
+        with caplog.at_level(logging.DEBUG, logger="meetaudio.decoding"):
+            assert raw.decode().result is None
+        assert "Failed to parse result" in caplog.text
+        assert "x" * 1000 not in caplog.text
+
+    @patch("meetaudio.client.requests.Session.post")
+    def test_client_query_raw(self, mock_post):
+        """测试客户端返回原始字节，decode() 与 get_result 结果一致"""
+        content = encode(payload())
+        mock_post.return_value = Mock(
+            headers={"X-Api-Status-Code": "20000000", "X-Api-Message": "OK"}, content=content
+        )
+        client = ByteDanceASRClient(app_key="app", access_key="key")
+        raw = client.query_raw("task-1")
+        assert raw.content == content
+        assert raw.decode() == client.get_result("task-1")
+
+
+@pytest.mark.slow
+class TestDecodeBenchmark:
+    """解码性能测试"""
+
+    def test_ten_megabyte_payload(self):
+        """测试约10MB结果（2600句、10万个单词）的解码耗时和内存峰值"""
+        content = encode(payload(2600, 40, text="全文" * 100_000))
+        cases = {
+            "json + 逐句模型": lambda: parse_asr_result(json.loads(content)),
+            "快速解码": lambda: decode_asr_result(content),
+            "列式存储": lambda: decode_asr_result(content, columnar=True),
+            "原始字节": lambda: RawResult(TaskStatus(status_code=20000000, message="OK"), content),
+        }
+
+        timings = {}
+        peaks = {}
+        lines = [f"\n结果大小: {len(content) / 2**20:.1f}MB"]
+        for name, decode in cases.items():
+            runs = []
+            for _ in range(3):
+                # 各方式从相同的堆状态开始计时，避免前面测试遗留的对象触发的回收计入其中一种
+                gc.collect()
+                start = time.perf_counter()
+                decode()
+                runs.append(time.perf_counter() - start)
+            timings[name] = min(runs)
+            tracemalloc.start()
+            decode()
+            peaks[name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            lines.append(f"{name}: {timings[name] * 1000:.1f}ms, 内存峰值 {peaks[name] / 2**20:.1f}MB")
+        print("\n".join(lines))
+
+        assert timings["快速解码"] < timings["json + 逐句模型"]
+        assert timings["列式存储"] < timings["json + 逐句模型"]
+        assert peaks["列式存储"] < peaks["快速解码"]
@@ -0,0 +1,205 @@
+"""
+大模型响应缓存测试
+"""
+
+import time
+
+import pytest
+
+from meetaudio.ai_writer import AIWriter
+from meetaudio.llm_cache import LLMResponseCache, cache_key
+from meetaudio.llm_transport import LLMTransport
+from meetaudio.mock_llm_server import MockLLMServer
+
+MESSAGES = [{"role": "system", "content": "系统"}, {"role": "user", "content": "你好"}]
+
+
+@pytest.fixture
+def llm_server():
+    with MockLLMServer() as server:
+        yield server
+
+
+class TestCacheKey:
+    """缓存键测试类"""
+
+    def test_stable(self):
+        """测试相同请求生成相同的键"""
+        assert cache_key("model", MESSAGES, 0.3, 1000) == cache_key("model", list(MESSAGES), 0.3, 1000)
+
+    def test_each_field_changes_key(self):
+        """测试模型、系统提示词、用户提示词、temperature、max_tokens 任一不同都生成不同的键"""
+        keys = {
+            cache_key("model", MESSAGES, 0.3, 1000),
+            cache_key("other", MESSAGES, 0.3, 1000),
+            cache_key("model", [{"role": "system", "content": "系统2"}, MESSAGES[1]], 0.3, 1000),
+            cache_key("model", [MESSAGES[0], {"role": "user", "content": "你好！"}], 0.3, 1000),
+            cache_key("model", MESSAGES, 0.7, 1000),
+            cache_key("model", MESSAGES, 0.3, 2000),
+        }
+        assert len(keys) == 6
+
+
+class TestLLMResponseCache:
+    """LLMResponseCache测试类"""
+
+    def test_memory_lru(self):
+        """测试内存层按条数淘汰最久未使用的回复"""
+        cache = LLMResponseCache(memory_entries=2)
+        cache.put("a", "回复a", 1.0)
+        cache.put("b", "回复b", 1.0)
+        assert cache.get("a") == "回复a"
+        cache.put("c", "回复c", 1.0)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "回复a" and cache.get("c") == "回复c"
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """测试磁盘层在新实例中仍可命中，并回填内存层"""
+        path = str(tmp_path / "llm_cache.db")
+        LLMResponseCache(path).put("key", "缓存的回复", 2.5)
+
+        cache = LLMResponseCache(path)
+        assert cache.get("key") == "缓存的回复"
+        assert cache.get("key") == "缓存的回复"
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+        assert stats["saved_seconds"] == 5.0
+
+    def test_disk_eviction(self, tmp_path):
+        """测试磁盘层超出字节上限时淘汰最久未使用的回复"""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.db"), memory_entries=0, max_disk_bytes=1000)
+        for i in range(5):
+            cache.put(f"key{i}", "x" * 300, 1.0)
+            time.sleep(0.01)
+
+        stats = cache.stats()
+        assert stats["disk_bytes"] <= 1000
+        assert cache.get("key0") is None
+        assert cache.get("key4") == "x" * 300
+
+    def test_running_disk_size(self, tmp_path):
+        """测试磁盘层总字节数随写入、覆盖、淘汰增减，只在打开和淘汰时扫描全表"""
+        path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(path, memory_entries=0, max_disk_bytes=1000)
+        cache.put("a", "x" * 300, 1.0)
+        cache.put("a", "x" * 100, 1.0)
+
+        statements = []
+        cache._connection().set_trace_callback(statements.append)
+        cache.put("b", "y" * 200, 1.0)
+        assert not any("SUM" in statement for statement in statements)
+        assert cache._disk_bytes == cache.stats()["disk_bytes"] == 300
+        assert LLMResponseCache(path)._disk_bytes == 300
+
+        cache.put("c", "z" * 800, 1.0)
+        assert cache._disk_bytes == cache.stats()["disk_bytes"] <= 900
+        cache.clear()
+        assert cache._disk_bytes == 0
+
+    def test_stats(self, tmp_path):
+        """测试命中率和节省的调用耗时"""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+        assert cache.get("key") is None
+        cache.put("key", "回复", 1.5)
+        cache.get("key")
+        cache.get("key")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+        assert stats["saved_seconds"] == 3.0
+        assert stats["disk_entries"] == 1
+
+        cache.clear()
+        assert cache.get("key") is None
+        assert cache.stats()["disk_entries"] == 0
+
+
+class TestCachedTransport:
+    """带缓存的大模型调用测试类"""
+
+    def test_repeated_call_served_from_cache(self, llm_server):
+        """测试相同请求第二次不再调用大模型，参数不同时仍会调用"""
+        cache = LLMResponseCache()
+        transport = LLMTransport("test-key", llm_server.base_url, cache=cache)
+        try:
+            first = transport.chat("model", MESSAGES)
+            assert transport.chat("model", MESSAGES) == first
+            assert llm_server.call_count == 1
+
+            transport.chat("model", MESSAGES, max_tokens=2000)
+            assert llm_server.call_count == 2
+        finally:
+            transport.close()
+        assert cache.stats()["hits"] == 1
+
+    def test_opt_out(self, llm_server):
+        """测试 use_cache=False 时重新调用，并用新的回复更新缓存"""
+        replies = iter(["旧回复", "新回复"])
+        llm_server.reply_factory = lambda messages: next(replies)
+        transport = LLMTransport("test-key", llm_server.base_url, cache=LLMResponseCache())
+        try:
+            assert transport.chat("model", MESSAGES) == "旧回复"
+            assert transport.chat("model", MESSAGES, use_cache=False) == "新回复"
+            assert transport.chat("model", MESSAGES) == "新回复"
+        finally:
+            transport.close()
+        assert llm_server.call_count == 2
+
+    def test_errors_not_cached(self, llm_server):
+        """测试调用失败不写入缓存"""
+        llm_server.fail_first = 1
+        transport = LLMTransport("test-key", llm_server.base_url, cache=LLMResponseCache())
+        try:
+            with pytest.raises(Exception):
+                transport.chat("model", MESSAGES)
+            assert transport.chat("model", MESSAGES)
+        finally:
+            transport.close()
+        assert llm_server.call_count == 2
+
+    def test_ai_writer_cache(self, llm_server, tmp_path):
+        """测试AIWriter配置缓存后重复增强同一段文本只调用一次，未配置时不缓存"""
+        cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+        writer = AIWriter(api_key="test-key", base_url=llm_server.base_url, response_cache=cache)
+        try:
+            first = writer.enhance_content("会议决定加强培训", "rewrite")
+            assert writer.enhance_content("会议决定加强培训", "rewrite") == first
+            writer.enhance_content("会议决定加强培训", "rewrite", use_cache=False)
+        finally:
+            writer.close()
+        assert llm_server.call_count == 2
+
+        writer = AIWriter(api_key="test-key", base_url=llm_server.base_url)
+        try:
+            writer.enhance_content("会议决定加强培训", "rewrite")
+            writer.enhance_content("会议决定加强培训", "rewrite")
+        finally:
+            writer.close()
+        assert llm_server.call_count == 4
+
+
+@pytest.mark.slow
+class TestCachedRegenerateLatency:
+    """重新生成纪要的耗时测试"""
+
+    def test_regenerate_minutes(self, llm_server):
+        """测试每次调用0.2秒延迟下，分段生成的纪要第二次从缓存返回"""
+        llm_server.delay = 0.2
+        content = "。".join(f"机务部门汇报了本月航班保障情况{i:05d}" for i in range(800)) + "。"
+        cache = LLMResponseCache()
+        writer = AIWriter(api_key="test-key", base_url=llm_server.base_url, response_cache=cache)
+        elapsed = []
+        try:
+            for _ in range(2):
+                start = time.perf_counter()
+                writer._chunked_ai_generate(content, {}, {"topic": "安全工作会议"}, "model")
+                elapsed.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+        stats = cache.stats()
+        print(f"\n首次生成: {elapsed[0]:.2f}s, 重新生成: {elapsed[1]:.3f}s, "
+              f"命中率: {stats['hit_rate']:.0%}, 节省: {stats['saved_seconds']:.2f}s")
+        assert elapsed[1] < elapsed[0] * 0.1
+        assert stats["saved_seconds"] >= 0.2
@@ -0,0 +1,124 @@
+"""
+大模型共享传输测试
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from meetaudio.ai_writer import AIWriter
+from meetaudio.llm_cache import LLMResponseCache
+from meetaudio.llm_transport import LLMTransport
+from meetaudio.mock_llm_server import MockLLMServer
+
+MESSAGES = [{"role": "user", "content": "你好"}]
+
+
+@pytest.fixture
+def llm_server():
+    with MockLLMServer() as server:
+        yield server
+
+
+@pytest.fixture
+def transport(llm_server):
+    transport = LLMTransport("test-key", llm_server.base_url)
+    yield transport
+    transport.close()
+
+
+class TestLLMTransport:
+    """LLMTransport测试类"""
+
+    def test_reuses_connection(self, llm_server, transport):
+        """测试多次调用复用同一连接，OpenAI客户端也共用连接池"""
+        for _ in range(10):
+            assert transport.chat("model", MESSAGES) == "模拟纪要要点：共2字。"
+        response = transport.openai.chat.completions.create(model="model", messages=MESSAGES)
+        assert response.choices[0].message.content == "模拟纪要要点：共2字。"
+        assert llm_server.call_count == 11
+        assert llm_server.connections == 1
+
+    def test_concurrent_calls(self, llm_server, transport):
+        """测试多个线程同时调用，连接数不超过并发数"""
+        llm_server.delay = 0.05
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            replies = list(executor.map(lambda _: transport.chat("model", MESSAGES), range(20)))
+        assert len(set(replies)) == 1
+        assert llm_server.max_active > 1 and llm_server.connections <= 4
+
+    def test_errors(self, llm_server, transport):
+        """测试错误状态码抛出异常"""
+        llm_server.fail_first = 1
+        with pytest.raises(httpx.HTTPStatusError):
+            transport.chat("model", MESSAGES)
+        assert transport.chat("model", MESSAGES)
+
+    def test_stream(self, llm_server, transport):
+        """测试流式调用逐段回调已生成的文本，读完响应后连接可复用"""
+        seen = []
+        content = transport.chat("model", MESSAGES, on_text=seen.append)
+        assert content == transport.chat("model", MESSAGES)
+        assert seen[-1] == content and len(seen) == len(content)
+        assert all(b.startswith(a) for a, b in zip(seen, seen[1:]))
+        assert llm_server.connections == 1
+
+    def test_stream_cached(self, llm_server):
+        """测试流式调用的回复写入缓存，命中时以完整回复回调一次"""
+        transport = LLMTransport("test-key", llm_server.base_url, cache=LLMResponseCache())
+        try:
+            content = transport.chat("model", MESSAGES, on_text=lambda text: None)
+            seen = []
+            assert transport.chat("model", MESSAGES, on_text=seen.append) == content
+        finally:
+            transport.close()
+        assert seen == [content] and llm_server.call_count == 1
+
+    def test_ai_writer_paths_share_transport(self, llm_server):
+        """测试AIWriter的生成、增强和文本处理都通过同一连接池"""
+        writer = AIWriter(api_key="test-key", base_url=llm_server.base_url)
+        try:
+            assert writer.client is writer.transport.openai
+            writer.enhance_content("会议决定加强培训", "rewrite")
+            writer.process_text_with_prompt("请润色：\"会议决定加强培训\"")
+            writer._direct_api_call("model", "系统", "用户")
+        finally:
+            writer.close()
+        assert llm_server.call_count == 3 and llm_server.connections == 1
+
+
+@pytest.mark.slow
+class TestLLMTransportLatency:
+    """连接池调用开销测试"""
+
+    def test_added_latency_per_call(self, llm_server, transport):
+        """测试每次调用新建 httpx.Client 与共享连接池的额外耗时（p50/p99）"""
+        def fresh_client():
+            with httpx.Client(timeout=httpx.Timeout(timeout=300.0)) as client:
+                response = client.post(
+                    f"{llm_server.base_url}/chat/completions",
+                    headers={"Authorization": "Bearer test-key"},
+                    json={"model": "model", "messages": MESSAGES}
+                )
+                response.raise_for_status()
+                return response.json()["choices"][0]["message"]["content"]
+
+        def pooled():
+            return transport.chat("model", MESSAGES)
+
+        def percentiles(func, runs=200):
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            cuts = statistics.quantiles(timings, n=100)
+            return cuts[49], cuts[98]
+
+        before, after = percentiles(fresh_client), percentiles(pooled)
+        print(f"\n每次新建客户端: p50 {before[0]:.2f}ms, p99 {before[1]:.2f}ms; "
+              f"共享连接池: p50 {after[0]:.2f}ms, p99 {after[1]:.2f}ms")
+        assert after[0] < before[0]
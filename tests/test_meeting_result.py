@@ -0,0 +1,150 @@
+"""
+会议结果说话人与时间索引测试
+"""
+
+import random
+import time
+
+import pytest
+
+from meetaudio.enhanced_client import MeetingResult, Turn, UNKNOWN_SPEAKER
+from meetaudio.models import ASRResult, ASRUtterance, AudioInfo
+
+
+def make_utterances(count, speakers=("A", "B", "C"), seed=0):
+    """随机生成按时间递增的分句（同一说话人常连续发言，偶有重叠）"""
+    rng = random.Random(seed)
+    utterances = []
+    t = 0
+    speaker = speakers[0]
+    for i in range(count):
+        if rng.random() < 0.3:
+            speaker = rng.choice(speakers)
+        length = rng.randint(500, 8000)
+        start = max(0, t - rng.choice([0, 0, 0, 300]))
+        utterances.append(ASRUtterance(
+            text=f"第{i}句", start_time=start, end_time=start + length,
+            speaker_id=speaker if rng.random() > 0.02 else None
+        ))
+        t = start + length + rng.randint(0, 500)
+    rng.shuffle(utterances)
+    return utterances
+
+
+def make_result(utterances):
+    return MeetingResult.from_asr_result(ASRResult(
+        text="。".join(u.text for u in utterances), utterances=utterances, audio_info=AudioInfo(duration=1000)
+    ))
+
+
+def legacy_last_speakers(result, count):
+    """原实现：排序全部分句，从后往前找说话人"""
+    sorted_utterances = sorted(result.utterances, key=lambda x: x.start_time)
+    last_speakers = []
+    seen = set()
+    for utterance in reversed(sorted_utterances):
+        speaker_id = utterance.speaker_id or "未知说话人"
+        if speaker_id not in seen:
+            seen.add(speaker_id)
+            if len(seen) <= count:
+                content = " ".join(u.text for u in result.speakers[speaker_id])
+                last_speakers.append((speaker_id, content))
+            else:
+                break
+    return list(reversed(last_speakers))
+
+
+class TestMeetingResultIndexes:
+    """MeetingResult索引测试类"""
+
+    def test_speakers_grouped_without_explicit_mapping(self):
+        """测试直接构造时也按说话人分组"""
+        utterances = [
+            ASRUtterance(text="你好", start_time=0, end_time=1000, speaker_id="A"),
+            ASRUtterance(text="收到", start_time=1000, end_time=2000),
+        ]
+        result = MeetingResult(full_text="你好收到", utterances=utterances, duration=2000)
+        assert list(result.speakers) == ["A", UNKNOWN_SPEAKER]
+        assert result.get_speaker_content(UNKNOWN_SPEAKER) == "收到"
+        assert result.get_speaker_content("nobody") == ""
+
+    def test_last_speakers_matches_legacy(self):
+        """测试最后几位说话人与原实现一致"""
+        result = make_result(make_utterances(300))
+        for count in range(0, 5):
+            assert result.get_last_speakers(count) == legacy_last_speakers(result, count)
+        assert make_result([]).get_last_speakers() == []
+
+    def test_utterances_in_range(self):
+        """测试按时间范围查询分句"""
+        utterances = make_utterances(500)
+        result = make_result(utterances)
+        for start, end in [(0, 10_000), (50_000, 120_000), (10**9, 10**9 + 1), (-5, 0)]:
+            expected = sorted(
+                (u for u in utterances if start <= u.start_time < end), key=lambda u: u.start_time
+            )
+            assert [id(u) for u in result.utterances_in_range(start, end)] == [id(u) for u in expected]
+            overlapping = {id(u) for u in utterances if u.start_time < end and u.end_time > start}
+            assert {id(u) for u in result.utterances_in_range(start, end, overlap=True)} == overlapping
+
+    def test_speaker_talk_time(self):
+        """测试说话人发言时长统计"""
+        utterances = make_utterances(500)
+        result = make_result(utterances)
+
+        def expected(speaker_id, start=-1, end=10**12):
+            return sum(
+                u.end_time - u.start_time for u in utterances
+                if (u.speaker_id or UNKNOWN_SPEAKER) == speaker_id and start <= u.start_time < end
+            )
+
+        totals = result.speaker_talk_time()
+        assert totals == {speaker_id: expected(speaker_id) for speaker_id in result.speakers}
+        assert result.speaker_talk_time("B", 100_000, 400_000) == expected("B", 100_000, 400_000)
+        assert result.speaker_talk_time("B", 400_000, 100_000) == 0
+        assert result.speaker_talk_time("nobody") == 0
+
+    def test_turns(self):
+        """测试发言轮次"""
+        utterances = [
+            ASRUtterance(text="一", start_time=0, end_time=1000, speaker_id="A"),
+            ASRUtterance(text="二", start_time=1000, end_time=2500, speaker_id="A"),
+            ASRUtterance(text="三", start_time=2600, end_time=3000, speaker_id="B"),
+            ASRUtterance(text="四", start_time=3000, end_time=4000, speaker_id="A"),
+        ]
+        result = make_result(list(reversed(utterances)))
+        assert result.turns() == [
+            Turn("A", 0, 2500, 0, 1), Turn("B", 2600, 3000, 2, 2), Turn("A", 3000, 4000, 3, 3)
+        ]
+        assert result.turns(1000, 3000) == [Turn("B", 2600, 3000, 2, 2)]
+        assert [u.text for u in result.turn_utterances(result.turns()[0])] == ["一", "二"]
+
+    def test_speaker_content_cached(self):
+        """测试说话人发言内容只拼接一次"""
+        result = make_result(make_utterances(100))
+        assert result.get_speaker_content("A") is result.get_speaker_content("A")
+
+
+@pytest.mark.slow
+class TestMeetingResultIndexBenchmark:
+    """索引查询性能测试"""
+
+    def test_large_meeting_queries(self):
+        """测试2万句会议上的查询耗时"""
+        result = make_result(make_utterances(20_000))
+
+        start = time.perf_counter()
+        for _ in range(20):
+            legacy_last_speakers(result, 2)
+        legacy = (time.perf_counter() - start) / 20
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            result.get_last_speakers(2)
+            result.utterances_in_range(3_600_000, 3_660_000)
+            result.speaker_talk_time("A", 0, 3_600_000)
+            result.turns(3_600_000, 3_660_000)
+        indexed = (time.perf_counter() - start) / 1000
+
+        print(f"\n原 get_last_speakers: {legacy * 1000:.2f}ms, 索引查询（四项合计）: {indexed * 1000:.3f}ms")
+        assert indexed * 20 < legacy
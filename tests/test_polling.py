@@ -0,0 +1,124 @@
+"""
+轮询策略测试
+"""
+
+import pytest
+from unittest.mock import patch
+
+from meetaudio.client import ByteDanceASRClient
+from meetaudio.models import ASRResult, TaskStatus
+from meetaudio.polling import PollingPolicy, STATUS_PROCESSING, STATUS_QUEUED
+
+
+class TestPollingPolicy:
+    """PollingPolicy测试类"""
+
+    def test_estimate_from_duration_and_size(self):
+        """测试根据时长或文件大小估算处理耗时"""
+        policy = PollingPolicy(realtime_factor=0.1, base_latency=3.0, bytes_per_second=16000)
+
+        # 2小时音频
+        assert policy.estimate_processing_time(audio_duration=7200 * 1000) == pytest.approx(723.0)
+        # 仅有文件大小：16000字节/秒，100秒
+        assert policy.estimate_processing_time(audio_size=1600000) == pytest.approx(13.0)
+        assert policy.estimate_processing_time() is None
+
+    def test_first_delay_uses_estimate(self):
+        """测试首次查询推迟到预计完成前"""
+        policy = PollingPolicy(realtime_factor=0.1, base_latency=0.0, first_poll_ratio=0.8)
+
+        assert policy.start(audio_duration=1000 * 1000).first_delay() == pytest.approx(80.0)
+        # 无法估算时立即查询
+        assert policy.start().first_delay() == 0.0
+
+    def test_exponential_backoff_is_capped(self):
+        """测试处理中时指数退避并受最大间隔限制"""
+        policy = PollingPolicy(min_interval=1.0, max_interval=10.0, backoff_factor=2.0, jitter=0.0)
+        schedule = policy.start()
+
+        delays = [schedule.next_delay(STATUS_PROCESSING) for _ in range(6)]
+
+        assert delays == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+        assert schedule.polls == 6
+
+    def test_long_wait_does_not_overflow(self):
+        """测试长时间等待（大量查询）时退避不会溢出"""
+        policy = PollingPolicy(min_interval=1.0, max_interval=10.0, backoff_factor=2.0, jitter=0.0)
+        schedule = policy.start()
+        for _ in range(5000):
+            delay = schedule.next_delay(STATUS_PROCESSING)
+        assert delay == 10.0
+
+    def test_jitter_bounds(self):
+        """测试抖动范围"""
+        policy = PollingPolicy(min_interval=10.0, max_interval=10.0, jitter=0.2)
+        schedule = policy.start()
+
+        for _ in range(50):
+            assert 8.0 <= schedule.next_delay(STATUS_PROCESSING) <= 12.0
+
+    def test_speeds_up_near_predicted_finish(self):
+        """测试接近预计完成时间时缩短间隔，越过后重新从最小间隔退避"""
+        policy = PollingPolicy(
+            min_interval=1.0, max_interval=60.0, backoff_factor=4.0, jitter=0.0,
+            realtime_factor=0.0, base_latency=20.0
+        )
+        with patch("meetaudio.polling.time.monotonic", return_value=0.0):
+            schedule = policy.start(audio_duration=1000)
+
+        with patch("meetaudio.polling.time.monotonic", return_value=16.0):
+            schedule.next_delay(STATUS_PROCESSING)  # 1
+            schedule.next_delay(STATUS_PROCESSING)  # 4
+            # 退避值为16，但距预计完成只剩4秒
+            assert schedule.next_delay(STATUS_PROCESSING) == pytest.approx(4.0)
+
+        with patch("meetaudio.polling.time.monotonic", return_value=21.0):
+            assert schedule.next_delay(STATUS_PROCESSING) == pytest.approx(1.0)
+            assert schedule.next_delay(STATUS_PROCESSING) == pytest.approx(4.0)
+
+    def test_queue_time_shifts_prediction(self):
+        """测试排队结束后重新锚定预计完成时间"""
+        policy = PollingPolicy(
+            min_interval=1.0, max_interval=60.0, backoff_factor=2.0, jitter=0.0,
+            realtime_factor=0.0, base_latency=30.0
+        )
+        with patch("meetaudio.polling.time.monotonic", return_value=0.0):
+            schedule = policy.start(audio_duration=1000)
+
+        with patch("meetaudio.polling.time.monotonic", return_value=100.0):
+            schedule.next_delay(STATUS_QUEUED)
+
+        # 100秒后开始处理，预计130秒完成，不应被视为已超期
+        with patch("meetaudio.polling.time.monotonic", return_value=110.0):
+            assert schedule.next_delay(STATUS_PROCESSING) == pytest.approx(1.0)
+            assert schedule.next_delay(STATUS_PROCESSING) == pytest.approx(2.0)
+
+    def test_fixed_policy(self):
+        """测试固定间隔策略"""
+        schedule = PollingPolicy.fixed(2).start(audio_duration=3600 * 1000)
+
+        assert schedule.first_delay() == 0.0
+        assert [schedule.next_delay(STATUS_PROCESSING) for _ in range(3)] == [2, 2, 2]
+
+
+class TestClientPolling:
+    """客户端使用轮询策略的测试类"""
+
+    @patch('meetaudio.client.time.sleep')
+    @patch('meetaudio.client.ByteDanceASRClient.get_result')
+    def test_wait_for_result_records_polls(self, mock_get_result, mock_sleep):
+        """测试记录每个任务的查询次数，并按策略等待"""
+        processing = TaskStatus(status_code=STATUS_PROCESSING, message="Processing")
+        done = TaskStatus(status_code=20000000, message="OK", result=ASRResult(text="ok"))
+        mock_get_result.side_effect = [processing, processing, done]
+
+        client = ByteDanceASRClient(
+            app_key="test_app_key",
+            access_key="test_access_key",
+            polling_policy=PollingPolicy(min_interval=1.0, backoff_factor=2.0, jitter=0.0)
+        )
+        result = client.wait_for_result("task-1")
+
+        assert result.text == "ok"
+        assert client.get_poll_count("task-1") == 3
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0]
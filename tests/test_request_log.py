@@ -0,0 +1,167 @@
+"""
+请求日志测试
+"""
+
+import json
+import logging
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from meetaudio.client import ByteDanceASRClient
+from meetaudio.request_log import RequestLogger, redact_headers, truncate_body
+
+ACCESS_KEY = "secret-access-key-1234"
+
+
+class Counted:
+    """被格式化时计数的对象"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "counted"
+
+
+@pytest.fixture
+def request_logger():
+    return RequestLogger(logging.getLogger("test.request_log"), sample_rate=1.0, full_dump=False)
+
+
+class TestRequestLogger:
+    """RequestLogger测试类"""
+
+    def test_redact_headers(self):
+        """测试请求头中的密钥被隐藏"""
+        headers = redact_headers({"X-Api-Access-Key": ACCESS_KEY, "x-api-app-key": "app", "X-Api-Request-Id": "r"})
+        assert headers == {"X-Api-Access-Key": "***1234", "x-api-app-key": "***", "X-Api-Request-Id": "r"}
+
+    def test_truncate_body(self):
+        """测试请求体和响应体截断"""
+        assert truncate_body(b"x" * 10, 20) == "x" * 10
+        assert truncate_body("测试" * 10, 7) == "测试...（共60字节）"
+        assert truncate_body({"a": "中"}, None) == '{"a": "中"}'
+
+    def test_structured_record(self, request_logger, caplog):
+        """测试字段作为日志记录属性附带，头部脱敏、正文截断"""
+        with caplog.at_level(logging.DEBUG, logger="test.request_log"):
+            request_logger.payload("query.response", "task-1", headers={"X-Api-Access-Key": ACCESS_KEY},
+                                   body=b"y" * 5000)
+        record = caplog.records[0]
+        assert record.levelno == logging.DEBUG
+        assert (record.event, record.task_id) == ("query.response", "task-1")
+        assert record.asr_fields["headers"] == {"X-Api-Access-Key": "***1234"}
+        assert record.asr_fields["body"] == "y" * 1024 + "...（共5000字节）"
+        message = record.getMessage()
+        assert ACCESS_KEY not in message and "***1234" in message
+        assert "y" * 1024 in message and "y" * 1025 not in message and "共5000字节" in message
+
+    def test_structured_fields_redacted(self, request_logger, caplog):
+        """测试结构化处理器读取 asr_fields 时得到脱敏、截断后的值，其他字段原样保留"""
+        with caplog.at_level(logging.INFO, logger="test.request_log"):
+            request_logger.event(logging.INFO, "submit", "task-1", headers={"Authorization": "Bearer " + ACCESS_KEY},
+                                 body={"audio": "x" * 2000}, attempt=2)
+        fields = caplog.records[0].asr_fields
+        assert ACCESS_KEY not in json.dumps(dict(fields))
+        assert fields["headers"] == {"Authorization": "***1234"}
+        assert fields["body"].endswith("...（共2013字节）") and len(fields["body"]) < 1100
+        assert fields["attempt"] == 2
+        assert list(fields) == ["headers", "body", "attempt"]
+
+    def test_full_dump(self, caplog):
+        """测试打开完整记录后正文不截断、以INFO级别输出，密钥仍然脱敏"""
+        full = RequestLogger(logging.getLogger("test.request_log"), full_dump=True)
+        with caplog.at_level(logging.INFO, logger="test.request_log"):
+            full.payload("query.response", "task-1", headers={"X-Api-Access-Key": ACCESS_KEY}, body=b"y" * 5000)
+        message = caplog.records[0].getMessage()
+        assert "y" * 5000 in message and ACCESS_KEY not in message
+
+    def test_lazy_formatting(self, request_logger, caplog):
+        """测试日志级别关闭时不格式化任何字段"""
+        value = Counted()
+        with caplog.at_level(logging.WARNING, logger="test.request_log"):
+            request_logger.event(logging.INFO, "query", "task-1", status=value)
+            request_logger.payload("query.response", "task-1", body=value)
+        assert value.formatted == 0
+        with caplog.at_level(logging.INFO, logger="test.request_log"):
+            request_logger.event(logging.INFO, "query", "task-1", status=value)
+        assert value.formatted >= 1
+
+    def test_per_task_sampling(self, caplog):
+        """测试轮询事件按任务固定采样"""
+        sampled = RequestLogger(logging.getLogger("test.request_log"), sample_rate=0.25)
+        task_ids = [f"task-{i}" for i in range(2000)]
+        chosen = [task_id for task_id in task_ids if sampled.sampled(task_id)]
+        assert 350 < len(chosen) < 650
+        assert chosen == [task_id for task_id in task_ids if sampled.sampled(task_id)]
+        assert not RequestLogger(logging.getLogger("x"), sample_rate=0).sampled("task-1")
+
+        with caplog.at_level(logging.DEBUG, logger="test.request_log"):
+            sampled.poll("query", chosen[0])
+            sampled.poll("query", next(t for t in task_ids if t not in chosen))
+        assert [r.levelno for r in caplog.records] == [logging.INFO, logging.DEBUG]
+
+
+class TestClientLogging:
+    """客户端日志测试类"""
+
+    @patch("meetaudio.client.requests.Session.post")
+    def test_submit_and_query_never_log_credentials(self, mock_post, caplog):
+        """测试提交和查询的日志不包含密钥，响应体被截断"""
+        body = json.dumps({"result": {"text": "字" * 3000}}, ensure_ascii=False).encode()
+        mock_post.return_value = Mock(
+            headers={"X-Api-Status-Code": "20000000", "X-Api-Message": "OK", "X-Tt-Logid": "log-1"},
+            content=body, status_code=200, json=Mock(return_value={})
+        )
+        client = ByteDanceASRClient(app_key="app-key-5678", access_key=ACCESS_KEY, url_validation="off")
+        with caplog.at_level(logging.DEBUG, logger="meetaudio.client"):
+            task_id = client.submit_audio("http://example.com/a.mp3")
+            client.get_result(task_id)
+
+        events = [getattr(r, "event", None) for r in caplog.records]
+        assert {"submit", "submit.request", "submit.response", "submitted", "query", "query.response"} <= set(events)
+        text = "\n".join(r.getMessage() for r in caplog.records)
+        assert ACCESS_KEY not in text and "app-key-5678" not in text
+        assert len(text) < 10_000
+
+
+@pytest.mark.slow
+class TestLoggingCost:
+    """日志开销测试"""
+
+    def test_cpu_per_poll(self):
+        """测试大结果时每次查询的日志开销（原先的 f-string 日志 vs 延迟格式化）"""
+        log = logging.getLogger("test.request_log.cost")
+        log.addHandler(logging.NullHandler())
+        log.propagate = False
+        request_logger = RequestLogger(log, sample_rate=1.0, full_dump=False)
+        headers = {"X-Api-Access-Key": ACCESS_KEY, "X-Api-Request-Id": "task-1", "X-Tt-Logid": "log"}
+        body = json.dumps({"result": {"text": "字" * 1_000_000}}, ensure_ascii=False).encode()
+
+        def legacy():
+            log.info(f"查询任务 - URL: http://example.com/query")
+            log.info(f"查询请求头: {headers}")
+            log.info(f"响应头: {dict(headers)}")
+            log.info(f"响应体: {body.decode()}")
+
+        def structured():
+            request_logger.payload("query.request", "task-1", url="http://example.com/query", headers=headers)
+            request_logger.poll("query", "task-1", status_code=20000000, message="OK", body_bytes=len(body))
+            request_logger.payload("query.response", "task-1", body=body)
+
+        def per_call(func, runs=50):
+            start = time.perf_counter()
+            for _ in range(runs):
+                func()
+            return (time.perf_counter() - start) / runs
+
+        lines = [f"\n响应体 {len(body) / 2**20:.1f}MB，每次查询的日志开销："]
+        for level in (logging.WARNING, logging.INFO):
+            log.setLevel(level)
+            old, new = per_call(legacy), per_call(structured)
+            lines.append(f"{logging.getLevelName(level)}: f-string {old * 1e6:.0f}us, 结构化 {new * 1e6:.0f}us")
+            assert new < old
+        print("\n".join(lines))
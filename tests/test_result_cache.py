@@ -0,0 +1,115 @@
+"""
+任务结果缓存测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from meetaudio.result_cache import ResultCache, is_terminal
+from meetaudio.models import ASRResult, TaskStatus
+from meetaudio.exceptions import APIError
+
+
+def success_status(text="完成"):
+    return TaskStatus(status_code=20000000, message="OK", result=ASRResult(text=text))
+
+
+PROCESSING = TaskStatus(status_code=20000001, message="Processing")
+
+
+class TestResultCache:
+    """ResultCache测试类"""
+
+    def test_is_terminal(self):
+        """测试终态判断"""
+        assert is_terminal(success_status())
+        assert is_terminal(TaskStatus(status_code=45000006, message="Invalid audio URI"))
+        assert not is_terminal(PROCESSING)
+        assert not is_terminal(TaskStatus(status_code=20000000, message="OK"))
+        assert not is_terminal(TaskStatus(status_code=45000000, message="cannot find task"))
+
+    def test_single_flight(self):
+        """测试并发查询只请求上游一次"""
+        cache = ResultCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return success_status()
+
+        entries = []
+        threads = [
+            threading.Thread(target=lambda: entries.append(cache.get("task-1", fetch)))
+            for _ in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        assert len(calls) == 1
+        assert len(entries) == 20
+        assert all(e is entries[0] for e in entries)
+
+    def test_terminal_result_serialized_once(self):
+        """测试终态结果只序列化一次并常驻缓存"""
+        serialized = []
+        cache = ResultCache(serializer=lambda s: serialized.append(s) or {"text": s.result.text})
+        fetches = []
+
+        for _ in range(5):
+            entry = cache.get("task-1", lambda: fetches.append(1) or success_status())
+
+        assert entry.payload == {"text": "完成"}
+        assert len(fetches) == 1
+        assert len(serialized) == 1
+
+    def test_put_after_terminal_skips_serializer(self):
+        """测试已缓存终态结果时，回调或轮询再次写入不会重复序列化"""
+        serialized = []
+        cache = ResultCache(serializer=lambda s: serialized.append(s) or {"text": s.result.text})
+        first = cache.put("task-1", success_status())
+
+        for _ in range(3):
+            assert cache.put("task-1", success_status("重复")) is first
+        assert len(serialized) == 1
+
+    def test_processing_state_expires(self):
+        """测试非终态结果在TTL后重新查询"""
+        cache = ResultCache(processing_ttl=0.05)
+        statuses = iter([PROCESSING, success_status()])
+
+        assert cache.get("task-1", lambda: next(statuses)).status.is_processing
+        assert cache.get("task-1", lambda: pytest.fail("should be cached")).status.is_processing
+        time.sleep(0.06)
+        assert cache.get("task-1", lambda: next(statuses)).status.is_success
+
+    def test_error_shared_and_not_cached(self):
+        """测试上游异常传递给所有等待者且不被缓存"""
+        cache = ResultCache()
+
+        def failing():
+            raise APIError("boom")
+
+        with pytest.raises(APIError):
+            cache.get("task-1", failing)
+        assert cache.peek("task-1") is None
+        assert cache.get("task-1", success_status).status.is_success
+
+    def test_lru_eviction_and_no_downgrade(self):
+        """测试LRU淘汰，以及终态不会被处理中状态覆盖"""
+        cache = ResultCache(max_entries=2)
+        cache.put("task-1", success_status())
+        assert cache.put("task-1", PROCESSING).status.is_success
+
+        cache.put("task-2", success_status())
+        cache.peek("task-1")
+        cache.get("task-1", lambda: pytest.fail("should be cached"))
+        cache.put("task-3", success_status())
+
+        assert cache.peek("task-2") is None
+        assert cache.peek("task-1") is not None
+        assert cache.stats()["entries"] == 2
@@ -0,0 +1,181 @@
+"""
+句子索引与关键信息提取测试
+"""
+
+import random
+import time
+
+import pytest
+
+from meetaudio.enhanced_client import MeetingResult
+from meetaudio.matcher import KeywordClassifier
+from meetaudio.sentence_index import SentenceIndex
+
+
+def legacy_key_information(text):
+    """原实现：每个关键词重新切分一次全文（返回去重前的结果）"""
+    decisions = []
+    actions = []
+    deadlines = []
+
+    for keyword in ["决定", "确定", "同意", "批准", "通过", "否决", "拒绝"]:
+        if keyword in text:
+            sentences = text.split("。")
+            for sentence in sentences:
+                if keyword in sentence:
+                    decisions.append(sentence.strip())
+
+    for keyword in ["需要", "要求", "安排", "负责", "完成", "执行", "落实"]:
+        if keyword in text:
+            sentences = text.split("。")
+            for sentence in sentences:
+                if keyword in sentence:
+                    actions.append(sentence.strip())
+
+    for keyword in ["月底", "周内", "明天", "下周", "月", "日", "年"]:
+        if keyword in text:
+            sentences = text.split("。")
+            for sentence in sentences:
+                if keyword in sentence and any(action in sentence for action in ["完成", "提交", "汇报"]):
+                    deadlines.append(sentence.strip())
+
+    return {"decisions": decisions, "actions": actions, "deadlines": deadlines}
+
+
+def random_meeting_text(sentences, seed=0, key_ratio=0.5):
+    """随机拼接会议发言，约 key_ratio 的短语包含关键词"""
+    rng = random.Random(seed)
+    key_phrases = [
+        "会议决定", "同意该方案", "请机务部负责", "下周完成", "月底前提交报告", "明天汇报",
+        "这个问题需要研究", "通过了预算", "落实安全责任", "今年的目标", " 拒绝了申请 ", "执行新规定"
+    ]
+    plain_phrases = ["大家好", "我补充一点", "下一步加强培训", "A320机队", "情况就是这样", "请各位发表意见"]
+
+    def phrase():
+        return rng.choice(key_phrases if rng.random() < key_ratio else plain_phrases)
+
+    return "。".join(
+        "，".join(phrase() for _ in range(rng.randint(1, 4))) for _ in range(sentences)
+    ) + "。"
+
+
+def meeting(text):
+    return MeetingResult(full_text=text, utterances=[], duration=0)
+
+
+class TestSentenceIndex:
+    """SentenceIndex测试类"""
+
+    def test_split_and_offsets(self):
+        """测试切分结果与 split 一致并记录位置"""
+        text = "第一句。 第二句。。最后"
+        index = SentenceIndex(text)
+        assert [s.text for s in index] == text.split("。")
+        assert all(text[s.start:s.end] == s.text for s in index)
+        assert index.sentence_at(text.index("第二")).index == 1
+        assert index.sentence_at(len(text) - 1).text == "最后"
+
+    def test_for_text_reuses_index(self):
+        """测试同一文本复用索引"""
+        text = "甲。乙。" * 10
+        assert SentenceIndex.for_text(text) is SentenceIndex.for_text("甲。乙。" * 10)
+
+    def test_tag_sentences(self):
+        """测试整段扫描后按句标记类别"""
+        classifier = KeywordClassifier({"a": ["决定", "月"], "b": ["月底", "完成"]})
+        index = SentenceIndex("会议决定。月底完成。无关。本月")
+        assert index.tag(classifier) == [
+            frozenset({"a"}), frozenset({"a", "b"}), frozenset(), frozenset({"a"})
+        ]
+        assert [s.index for s in index.matching(classifier, "b")] == [1]
+
+
+class TestKeywordClassifier:
+    """KeywordClassifier测试类"""
+
+    def test_nested_and_shared_keywords(self):
+        """测试被包含的关键词和属于多个类别的关键词"""
+        classifier = KeywordClassifier({"pos": ["总经理"], "mgr": ["经理"], "x": ["完成"], "y": ["完成", "成"]})
+        assert classifier.classify("总经理完成") == {"pos", "mgr", "x", "y"}
+        assert classifier.classify("经理") == {"mgr"}
+        assert classifier.classify("无关") == frozenset()
+        assert KeywordClassifier({}).classify("文本") == frozenset()
+
+    def test_partial_overlap(self):
+        """测试首尾部分重叠的关键词都能命中"""
+        classifier = KeywordClassifier({"a": ["下周"], "b": ["周内"]})
+        assert classifier.classify("下周内") == {"a", "b"}
+        assert classifier.classify("下周") == {"a"}
+
+    def test_equivalent_to_in_checks(self):
+        """测试与逐个关键词 in 判断一致"""
+        categories = {"a": ["AB", "C"], "b": ["BC", "CD"], "c": ["D", "ABCD"]}
+        classifier = KeywordClassifier(categories)
+        rng = random.Random(0)
+        for _ in range(500):
+            text = "".join(rng.choice("ABCDE") for _ in range(rng.randint(0, 8)))
+            expected = {name for name, keywords in categories.items() if any(k in text for k in keywords)}
+            assert classifier.classify(text) == expected, text
+
+
+class TestKeyInformation:
+    """MeetingResult.extract_key_information测试类"""
+
+    def test_matches_legacy_and_keeps_order(self):
+        """测试结果与原实现一致，按原文顺序去重"""
+        for seed in range(20):
+            text = random_meeting_text(50, seed)
+            result = meeting(text).extract_key_information()
+            legacy = legacy_key_information(text)
+            for key, limit in (("decisions", 5), ("actions", 5), ("deadlines", 3)):
+                in_order = [s.strip() for s in text.split("。") if s.strip() in set(legacy[key])]
+                assert result[key] == list(dict.fromkeys(in_order))[:limit]
+            assert result["responsibilities"] == []
+
+    def test_key_sentences_offsets(self):
+        """测试关键句保留原文位置"""
+        text = "大家好。会议决定采购。请下周完成。"
+        sentences = meeting(text).key_sentences()
+        assert [(s.index, text[s.start:s.end]) for s in sentences["decisions"]] == [(1, "会议决定采购")]
+        assert [s.index for s in sentences["actions"]] == [2]
+        assert [s.index for s in sentences["deadlines"]] == [2]
+
+    def test_ai_writer_reuses_sentence_index(self):
+        """测试AIWriter的下一步工作提取使用缓存的句子索引"""
+        from meetaudio.ai_writer import AIWriter
+        writer = AIWriter.__new__(AIWriter)
+        text = "下一步加强培训。其他事项。后续跟进。" * 3
+        assert writer._extract_next_steps(text) == ["下一步加强培训", "后续跟进"] * 2 + ["下一步加强培训"]
+        assert SentenceIndex.for_text(text) is SentenceIndex.for_text(text)
+
+
+@pytest.mark.slow
+class TestKeyInformationBenchmark:
+    """关键信息提取性能测试"""
+
+    @pytest.mark.parametrize("key_ratio", [0.05, 0.5])
+    def test_long_meeting(self, key_ratio):
+        """测试约3小时会议（2万句）的关键信息提取和句子分类耗时"""
+        text = random_meeting_text(20_000, key_ratio=key_ratio)
+
+        def best_of_three(func):
+            runs = []
+            for _ in range(3):
+                start = time.perf_counter()
+                func()
+                runs.append(time.perf_counter() - start)
+            return min(runs)
+
+        def reused():
+            result = meeting(text)
+            result.key_sentences()
+            result.extract_key_information()
+
+        legacy = best_of_three(lambda: legacy_key_information(text))
+        single_pass = best_of_three(lambda: meeting(text).extract_key_information())
+        reuse = best_of_three(reused)
+
+        print(f"\n关键词比例 {key_ratio}: 逐个关键词切分: {legacy * 1000:.1f}ms, "
+              f"单次切分扫描: {single_pass * 1000:.1f}ms, 复用索引: {reuse * 1000:.1f}ms")
+        assert single_pass < legacy
+        assert reuse < legacy
@@ -0,0 +1,133 @@
+"""
+查询结果流式解析测试
+"""
+
+import json
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from meetaudio.client import ByteDanceASRClient, parse_asr_result
+from meetaudio.enhanced_client import MeetingASRClient
+from meetaudio.mock_server import MockASRServer
+from meetaudio.streaming import UTTERANCE, ResultBuilder, ResultStreamParser
+from meetaudio.utterance_store import UtteranceStore
+from tests.test_utterance_store import raw_utterances
+
+
+def chunked(content, size):
+    """按固定大小切分字节（会切断多字节字符和数字）"""
+    return (content[i:i + size] for i in range(0, len(content), size))
+
+
+def response_body(utterances=30, words=2, **extra):
+    body = {
+        "audio_info": {"duration": 99},
+        "result": {"text": "全文，共计123字", "utterances": raw_utterances(utterances, words),
+                   "audio_info": {"duration": 1000}, "additions": {"x": [1, 2]}},
+    }
+    body.update(extra)
+    return json.dumps(body, ensure_ascii=False, indent=1).encode()
+
+
+def streamed(content, size=7):
+    builder = ResultBuilder()
+    return builder.build() if builder.feed(chunked(content, size)) else None
+
+
+class TestResultStreamParser:
+    """ResultStreamParser测试类"""
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1024, 10**7])
+    def test_same_result_for_any_chunking(self, size):
+        """测试任意切分方式下结果与一次性解析一致"""
+        content = response_body()
+        expected = parse_asr_result(json.loads(content))
+        result = streamed(content, size)
+        assert isinstance(result.utterances, UtteranceStore)
+        assert result.model_dump() == expected.model_dump()
+
+    def test_items(self):
+        """测试逐个产出分句和字段，跳过 result 以外的字段"""
+        content = b'{"code": 0, "result": {"utterances": [{"a": 1}, {"b": [2]}], "text": "t"}, "tail": 12}'
+        parser = ResultStreamParser(chunked(content, 2))
+        assert list(parser.items()) == [
+            ("utterances", []), (UTTERANCE, {"a": 1}), (UTTERANCE, {"b": [2]}), ("text", "t")
+        ]
+        assert parser.has_result
+
+    @pytest.mark.parametrize("content", [b"", b"{}", b'{"result": null}', b'{"code": 12345}'])
+    def test_no_result(self, content):
+        """测试没有 result 字段"""
+        assert streamed(content, 2) is None
+
+    def test_empty_and_missing_utterances(self):
+        """测试分句为空列表或缺失"""
+        assert list(streamed(b'{"result": {"text": "a", "utterances": []}}').utterances) == []
+        assert streamed(b'{"result": {"text": "a"}}').utterances is None
+
+    @pytest.mark.parametrize("content", [
+        b'{"result": {"text": "a", "utterances": [{"text": "x"', b'{"result": [1, 2}', b'{"result": {1: 2}}',
+        b'{"result": {"utterances": "abc"}}',
+    ])
+    def test_invalid(self, content):
+        """测试截断或不合法的响应体"""
+        with pytest.raises(ValueError):
+            streamed(content, 3)
+
+
+class TestStreamResultClient:
+    """客户端流式查询测试类"""
+
+    def test_stream_result_against_mock_server(self):
+        """测试通过HTTP流式读取模拟服务的结果，与缓冲解析一致"""
+        body = json.loads(response_body(200, 5))
+        with MockASRServer(processing_time=0, result_factory=lambda request: body) as server, \
+                patch("meetaudio.client.config.SUBMIT_URL", server.submit_url), \
+                patch("meetaudio.client.config.QUERY_URL", server.query_url):
+            buffered = ByteDanceASRClient(app_key="app", access_key="key")
+            streaming = MeetingASRClient(app_key="app", access_key="key", stream_results=True)
+            task_id = buffered.submit_audio(server.audio_url())
+
+            status = streaming.get_result(task_id)
+            assert status.is_success
+            assert isinstance(status.result.utterances, UtteranceStore)
+            assert status.result.model_dump() == buffered.get_result(task_id).result.model_dump()
+            assert streaming.get_meeting_result(task_id).get_meeting_summary()["total_utterances"] == 200
+
+            missing = streaming.get_result("unknown-task")
+            assert missing.status_code == 45000000 and missing.result is None
+
+
+@pytest.mark.slow
+class TestStreamingMemory:
+    """流式解析内存测试"""
+
+    def test_peak_memory_bounded(self):
+        """测试内存峰值不随会议时长增长（结果本身的列式存储除外）"""
+        def peak(content, parse):
+            tracemalloc.start()
+            try:
+                parse(content)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        def stream(content):
+            return streamed(content, 64 * 1024)
+
+        def buffered(content):
+            return parse_asr_result(json.loads(content))
+
+        short = response_body(500, 40)
+        long = response_body(5000, 40)
+        results = {
+            name: (peak(short, parse), peak(long, parse))
+            for name, parse in (("缓冲解析", buffered), ("流式解析", stream))
+        }
+        print("\n" + "\n".join(
+            f"{name}: {len(short) / 2**20:.1f}MB -> {a / 2**20:.1f}MB, {len(long) / 2**20:.1f}MB -> {b / 2**20:.1f}MB"
+            for name, (a, b) in results.items()
+        ))
+        assert results["流式解析"][1] * 5 < results["缓冲解析"][1]
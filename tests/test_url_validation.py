@@ -0,0 +1,157 @@
+"""
+音频URL验证测试
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from meetaudio.async_client import AsyncByteDanceASRClient
+from meetaudio.client import URL_CHECK_WORKERS, ByteDanceASRClient
+from meetaudio.exceptions import APIError
+from meetaudio.mock_server import MockASRServer
+from meetaudio.url_validation import AudioURLInfo, URLValidator, audio_url_info, url_validator
+
+
+@pytest.fixture
+def server():
+    with MockASRServer(processing_time=0, audio_size=8_000_000) as server, \
+            patch("meetaudio.client.config.SUBMIT_URL", server.submit_url), \
+            patch("meetaudio.client.config.QUERY_URL", server.query_url):
+        yield server
+
+
+class TestURLValidator:
+    """URLValidator测试类"""
+
+    def test_audio_url_info(self):
+        """测试从HEAD和Range GET响应中取文件大小和类型"""
+        head = audio_url_info("u", 200, {"content-length": "123", "content-type": "audio/wav"})
+        assert head == AudioURLInfo("u", True, 200, 123, "audio/wav")
+        ranged = audio_url_info("u", 206, {"content-length": "1", "content-range": "bytes 0-0/4567"})
+        assert ranged.accessible and ranged.content_length == 4567
+        assert audio_url_info("u", 206, {"content-range": "bytes 0-0/*"}).content_length is None
+        assert not audio_url_info("u", 404, {"content-length": "9"}).accessible
+
+    def test_ttl(self):
+        """测试成功和失败结果分别按各自的有效期缓存"""
+        validator = URLValidator(ttl=60, failure_ttl=0.05)
+        validator.put(AudioURLInfo("ok", True))
+        validator.put(AudioURLInfo("bad", False, 404))
+        assert validator.get("ok").accessible and validator.get("bad").status_code == 404
+        time.sleep(0.06)
+        assert validator.get("ok") is not None and validator.get("bad") is None
+        assert (validator.hits, validator.misses) == (3, 1)
+
+        validator.invalidate("ok")
+        assert validator.get("ok") is None
+
+        uncached = URLValidator(failure_ttl=0)
+        uncached.put(AudioURLInfo("bad", False))
+        assert uncached.get("bad") is None
+
+    def test_trust_and_eviction(self):
+        """测试可信URL登记，以及超出容量时淘汰最久未使用的"""
+        validator = URLValidator(max_entries=2)
+        validator.trust("a", 10, "audio/mpeg")
+        validator.trust("b")
+        validator.get("a")
+        validator.trust("c")
+        assert validator.get("b") is None
+        assert validator.get("a") == AudioURLInfo("a", True, None, 10, "audio/mpeg", trusted=True)
+
+
+class TestClientURLValidation:
+    """客户端URL验证测试类"""
+
+    def test_cached_per_url(self, server):
+        """测试同一URL只探测一次，并记录文件大小用于估算轮询时间"""
+        client = ByteDanceASRClient(app_key="app", access_key="key")
+        first = client.submit_audio(server.audio_url())
+        second = client.submit_audio(server.audio_url())
+        assert server.audio_requests == 1
+        info = client.audio_url_info(second)
+        assert info.content_length == 8_000_000 and info.content_type == "audio/mpeg"
+        assert client.audio_url_info(first) == info
+        assert client._start_polling(task_id=second).estimate == pytest.approx(
+            client.polling_policy.estimate_processing_time(audio_size=8_000_000)
+        )
+        assert client._start_polling(task_id="unknown").estimate is None
+
+    def test_range_fallback(self):
+        """测试HEAD被拒绝时改用只请求第一个字节的Range GET"""
+        with MockASRServer(audio_size=4096, allow_head=False) as server:
+            client = ByteDanceASRClient(app_key="app", access_key="key")
+            info = client.check_audio_url(server.audio_url())
+        assert info.accessible and info.status_code == 206 and info.content_length == 4096
+        assert server.audio_requests == 2
+
+    def test_trusted_url_skips_probe(self, server):
+        """测试登记为可信的URL不再探测"""
+        url = server.audio_url("uploaded.mp3")
+        url_validator.trust(url, 1234, "audio/mpeg")
+        client = ByteDanceASRClient(app_key="app", access_key="key")
+        task_id = client.submit_audio(url)
+        assert server.audio_requests == 0
+        assert client.audio_url_info(task_id).trusted
+
+    def test_inaccessible(self, server):
+        """测试URL不可访问时，blocking 模式不提交，off 模式不验证"""
+        url = server.base_url + "/missing.mp3"
+        with pytest.raises(APIError, match="无法访问"):
+            ByteDanceASRClient(app_key="app", access_key="key").submit_audio(url)
+        assert not server.tasks
+
+        task_id = ByteDanceASRClient(app_key="app", access_key="key", url_validation="off").submit_audio(url)
+        assert task_id in server.tasks
+
+        with pytest.raises(ValueError):
+            ByteDanceASRClient(app_key="app", access_key="key", url_validation="sometimes")
+
+    def test_pipelined(self, server):
+        """测试验证与提交同时进行：提交成功后验证失败只告警，并记录验证结果"""
+        client = ByteDanceASRClient(app_key="app", access_key="key", url_validation="pipelined")
+        task_id = client.submit_audio(server.base_url + "/missing.mp3")
+        assert task_id in server.tasks
+        assert client.audio_url_info(task_id).status_code == 404
+
+        task_id = client.submit_audio(server.audio_url())
+        assert client.audio_url_info(task_id).content_length == 8_000_000
+
+    def test_pipelined_clients_share_executor(self, server):
+        """测试反复创建的客户端共用一个验证线程池，不会各自遗留线程"""
+        for i in range(10):
+            client = ByteDanceASRClient(app_key="app", access_key="key", url_validation="pipelined")
+            client.submit_audio(server.base_url + f"/missing-{i}.mp3")
+        url_threads = [t for t in threading.enumerate() if t.name.startswith("URLCheck")]
+        assert 0 < len(url_threads) <= URL_CHECK_WORKERS
+
+    @pytest.mark.asyncio
+    async def test_async_pipelined_overlaps_submit(self):
+        """测试异步客户端 pipelined 模式下验证与提交的延迟重叠"""
+        async def handler(request):
+            await asyncio.sleep(0.2)
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Content-Length": "2048"})
+            return httpx.Response(200, headers={"X-Api-Status-Code": "20000000", "X-Api-Message": "OK"})
+
+        elapsed = {}
+        for mode in ("blocking", "pipelined"):
+            url_validator.clear()
+            client = AsyncByteDanceASRClient(app_key="app", access_key="key", url_validation=mode)
+            client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with client:
+                start = time.perf_counter()
+                task_id = await client.submit_audio("http://example.com/a.mp3")
+                elapsed[mode] = time.perf_counter() - start
+                assert client.audio_url_info(task_id).content_length == 2048
+
+                start = time.perf_counter()
+                await client.submit_audio("http://example.com/a.mp3")
+                assert time.perf_counter() - start < 0.35
+
+        assert elapsed["blocking"] >= 0.4 and elapsed["pipelined"] < 0.35
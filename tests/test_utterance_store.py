@@ -0,0 +1,137 @@
+"""
+列式分句存储测试
+"""
+
+import random
+import tracemalloc
+
+import pytest
+
+from meetaudio.client import parse_asr_result
+from meetaudio.enhanced_client import MeetingASRClient, MeetingResult
+from meetaudio.models import ASRUtterance, WordInfo
+from meetaudio.utterance_store import UtteranceStore
+
+
+def raw_utterances(count, words_per_utterance=0, seed=0):
+    """接口返回格式的分句字典（按时间递增，说话人随机，部分缺少可选字段）"""
+    rng = random.Random(seed)
+    utterances = []
+    t = 0
+    for i in range(count):
+        length = rng.randint(1000, 5000)
+        utterance = {"text": f"第{i}句，收到。", "start_time": t, "end_time": t + length}
+        if rng.random() < 0.9:
+            utterance["speaker_id"] = rng.choice(["1", "2", "3"])
+        if rng.random() < 0.5:
+            utterance["channel_id"] = rng.choice([0, 1])
+            utterance["definite"] = rng.random() < 0.8
+        if words_per_utterance:
+            step = length // words_per_utterance
+            utterance["words"] = [
+                {"text": chr(0x4e00 + rng.randrange(2000)), "start_time": t + j * step,
+                 "end_time": t + (j + 1) * step, "blank_duration": rng.choice([0, 0, 40])}
+                for j in range(words_per_utterance)
+            ]
+        utterances.append(utterance)
+        t += length + rng.randint(0, 800)
+    rng.shuffle(utterances)
+    return utterances
+
+
+class TestUtteranceStore:
+    """UtteranceStore测试类"""
+
+    def test_materializes_same_as_pydantic(self):
+        """测试按需生成的分句与直接创建的 ASRUtterance 一致"""
+        raw = raw_utterances(50, words_per_utterance=3)
+        raw[0]["words"] = []
+        store = UtteranceStore.from_utterances(raw)
+        expected = [ASRUtterance(**u) for u in raw]
+        assert len(store) == 50
+        assert [u.model_dump() for u in store] == [u.model_dump() for u in expected]
+        assert store[-1] == expected[-1]
+        assert [u.text for u in store[3:6]] == [u.text for u in expected[3:6]]
+        assert list(store.texts()) == [u["text"] for u in raw]
+        assert store.word_count == 147
+        with pytest.raises(IndexError):
+            store[50]
+
+    def test_from_models_and_take(self):
+        """测试由 ASRUtterance 创建、重排和筛选"""
+        utterances = [
+            ASRUtterance(text="乙", start_time=500, end_time=900, speaker_id="B",
+                         words=[WordInfo(text="乙", start_time=500, end_time=900)]),
+            ASRUtterance(text="甲", start_time=0, end_time=400, channel_id=1, definite=False),
+        ]
+        store = UtteranceStore.from_utterances(utterances)
+        assert store.to_list() == utterances
+        assert store.sorted_by_start_time().to_list() == utterances[::-1]
+        subset = store.take([0])
+        assert subset.to_list() == utterances[:1]
+        assert subset.speaker_id(0) == "B" and store.speaker_id(1) is None
+
+    def test_parse_columnar_result(self):
+        """测试列式解析查询结果，序列化结果与逐句解析一致"""
+        data = {"result": {"text": "全文", "utterances": raw_utterances(20, 2), "audio_info": {"duration": 1000}}}
+        expected = parse_asr_result({"result": dict(data["result"])})
+        result = parse_asr_result(data, columnar=True)
+        assert isinstance(result.utterances, UtteranceStore)
+        assert result.model_dump() == expected.model_dump()
+
+    def test_meeting_client_columnar_opt_in(self):
+        """测试会议客户端默认逐句解析为列表，columnar=True 时使用列式存储"""
+        data = {"result": {"text": "全文", "utterances": raw_utterances(3)}}
+        assert isinstance(MeetingASRClient("app", "key")._parse_result_data(data).utterances, list)
+        assert isinstance(MeetingASRClient("app", "key", columnar=True)._parse_result_data(data).utterances, UtteranceStore)
+
+
+class TestMeetingResultOnStore:
+    """基于列式存储的MeetingResult测试类"""
+
+    def test_queries_match_list_backed_result(self):
+        """测试列式存储与分句列表上的查询结果一致"""
+        raw = raw_utterances(400)
+        on_list = MeetingResult("全文", [ASRUtterance(**u) for u in raw], 1000)
+        on_store = MeetingResult("全文", UtteranceStore.from_utterances(raw), 1000)
+
+        def dump(utterances):
+            return [u.model_dump() for u in utterances]
+
+        assert list(on_store.speakers) == list(on_list.speakers)
+        for speaker_id in on_list.speakers:
+            assert on_store.get_speaker_content(speaker_id) == on_list.get_speaker_content(speaker_id)
+            assert dump(on_store.speakers[speaker_id]) == dump(on_list.speakers[speaker_id])
+        assert on_store.get_last_speakers(3) == on_list.get_last_speakers(3)
+        assert on_store.speaker_talk_time() == on_list.speaker_talk_time()
+        assert on_store.turns() == on_list.turns()
+        for overlap in (False, True):
+            assert dump(on_store.utterances_in_range(100_000, 300_000, overlap)) == \
+                dump(on_list.utterances_in_range(100_000, 300_000, overlap))
+        turn = on_store.turns()[5]
+        assert dump(on_store.turn_utterances(turn)) == dump(on_list.turn_utterances(turn))
+        assert on_store.get_meeting_summary() == on_list.get_meeting_summary()
+
+
+@pytest.mark.slow
+class TestUtteranceStoreMemory:
+    """列式存储内存测试"""
+
+    def test_four_hour_meeting(self):
+        """测试4小时会议（约4800句、19万个单词）的内存峰值"""
+        raw = raw_utterances(4800, words_per_utterance=40)
+
+        def peak(build):
+            tracemalloc.start()
+            try:
+                value = build()
+                return value, tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        models, pydantic_peak = peak(lambda: MeetingResult("全文", [ASRUtterance(**u) for u in raw], 0))
+        del models
+        store, columnar_peak = peak(lambda: MeetingResult("全文", UtteranceStore.from_utterances(raw), 0))
+
+        print(f"\n逐句 pydantic: {pydantic_peak / 2**20:.1f}MB, 列式存储: {columnar_peak / 2**20:.1f}MB")
+        assert columnar_peak * 5 < pydantic_peak
@@ -0,0 +1,124 @@
+"""
+任务结果订阅测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from meetaudio.watcher import TaskWatcher
+from meetaudio.models import ASRResult
+from meetaudio.exceptions import APIError, TimeoutError
+
+
+class FakeClient:
+    """记录 wait_for_result 调用次数的客户端"""
+
+    def __init__(self, delay=0.3, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def wait_for_result(self, task_id, timeout=300, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return ASRResult(text=f"result of {task_id}")
+
+
+class TestTaskWatcher:
+    """TaskWatcher测试类"""
+
+    def test_many_waiters_share_one_poller(self):
+        """测试200个并发等待者只产生一个后台轮询"""
+        client = FakeClient(delay=0.5)
+        watcher = TaskWatcher(client)
+        results = []
+        max_pollers = []
+
+        def waiter():
+            results.append(watcher.wait("task-1", timeout=10))
+            max_pollers.append(watcher.active_pollers)
+
+        waiters = [threading.Thread(target=waiter) for _ in range(200)]
+        for t in waiters:
+            t.start()
+        # 所有等待者已阻塞时，只有一个后台轮询在调用 wait_for_result
+        time.sleep(0.2)
+        assert watcher.active_pollers == 1
+        assert client.calls == 1
+
+        for t in waiters:
+            t.join(5)
+
+        assert client.calls == 1
+        assert len(results) == 200
+        assert all(r.text == "result of task-1" for r in results)
+        assert watcher.active_pollers == 0
+
+    def test_late_waiter_gets_cached_result(self):
+        """测试完成后的等待者直接拿到结果"""
+        client = FakeClient(delay=0)
+        watcher = TaskWatcher(client)
+        watcher.wait("task-1", timeout=5)
+        assert watcher.watch("task-1") is False
+        assert watcher.wait("task-1", timeout=0).text == "result of task-1"
+        assert client.calls == 1
+
+    def test_error_propagates_to_all_waiters(self):
+        """测试轮询失败时所有等待者收到同一异常"""
+        client = FakeClient(delay=0.2, error=APIError("audio download failed"))
+        watcher = TaskWatcher(client)
+        outcomes = []
+        waiters = [
+            threading.Thread(target=lambda: outcomes.append(watcher.wait_outcome("task-1", timeout=5)))
+            for _ in range(10)
+        ]
+        for t in waiters:
+            t.start()
+        for t in waiters:
+            t.join(5)
+
+        assert len(outcomes) == 10
+        assert all(outcome is outcomes[0] for outcome in outcomes)
+        assert isinstance(outcomes[0], APIError)
+        assert client.calls == 1
+
+    def test_error_not_cached(self):
+        """测试失败不被缓存：等待者都被唤醒后，再次等待会重新轮询"""
+        client = FakeClient(delay=0, error=TimeoutError("poll timeout"))
+        watcher = TaskWatcher(client)
+        with pytest.raises(TimeoutError):
+            watcher.wait("task-1", timeout=5)
+
+        client.error = None
+        assert watcher.wait("task-1", timeout=5).text == "result of task-1"
+        assert client.calls == 2
+
+    def test_error_without_waiters_not_kept(self):
+        """测试没有等待者时轮询失败不保留结果"""
+        client = FakeClient(delay=0, error=APIError("audio download failed"))
+        watcher = TaskWatcher(client)
+        assert watcher.watch("task-1") is True
+        for _ in range(100):
+            if not watcher.active_pollers:
+                break
+            time.sleep(0.01)
+        assert watcher.watch("task-1") is True
+
+    def test_waiter_timeout_does_not_stop_poller(self):
+        """测试单个等待者超时不影响后台轮询"""
+        watcher = TaskWatcher(FakeClient(delay=0.3))
+        with pytest.raises(TimeoutError):
+            watcher.wait("task-1", timeout=0.01)
+        assert watcher.active_pollers == 1
+        assert watcher.wait("task-1", timeout=5).text == "result of task-1"
+
+    def test_requires_client(self):
+        """测试未设置客户端时报错"""
+        with pytest.raises(APIError):
+            TaskWatcher().watch("task-1")
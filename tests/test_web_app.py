@@ -0,0 +1,82 @@
+"""
+Web演示应用接口测试
+"""
+
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+from tests.test_callback import RESULT_BODY
+
+WEB_DEMO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web_demo")
+WEB_DEMO_MODULES = ("app", "async_task_manager", "config_manager", "task_persistence", "chunked_upload")
+
+
+@pytest.fixture
+def web_app(tmp_path, monkeypatch):
+    """在临时目录中导入 Web 应用（导入时会创建配置和任务目录并初始化客户端）"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(WEB_DEMO_DIR)
+    monkeypatch.delenv("ASR_CALLBACK_TOKEN", raising=False)
+    for name in WEB_DEMO_MODULES:
+        sys.modules.pop(name, None)
+    module = importlib.import_module("app")
+    yield module
+    module.task_manager.stop()
+    for name in WEB_DEMO_MODULES:
+        sys.modules.pop(name, None)
+
+
+class TestASRCallback:
+    """识别结果回调接口测试类"""
+
+    HEADERS = {"X-Api-Request-Id": "task-1", "X-Api-Status-Code": "20000000"}
+
+    def _post(self, web_app, query=""):
+        return web_app.app.test_client().post(
+            f"/api/asr_callback{query}", data=json.dumps(RESULT_BODY), headers=self.HEADERS
+        )
+
+    def test_rejects_missing_or_wrong_token(self, web_app):
+        """测试缺少或错误的校验令牌返回403，结果不会登记"""
+        token = web_app.asr_callback_token()
+        assert self._post(web_app).status_code == 403
+        assert self._post(web_app, "?token=wrong").status_code == 403
+        assert web_app.callback_registry.get("task-1") is None
+
+        assert self._post(web_app, f"?token={token}").status_code == 200
+        assert web_app.callback_registry.get("task-1").is_success
+
+    def test_callback_url_carries_token(self, web_app):
+        """测试提交任务使用的回调地址带有持久化的校验令牌，配置接口不返回令牌"""
+        url = web_app.asr_callback_url({"asr_callback_url": "https://example.com/api/asr_callback"})
+        token = web_app.config_manager.get_config("asr")["asr_callback_token"]
+        assert url == f"https://example.com/api/asr_callback?token={token}"
+        assert web_app.asr_callback_url({"asr_callback_url": ""}) is None
+
+        response = web_app.app.test_client().get("/api/config?section=asr")
+        assert "asr_callback_token" not in response.get_json()["config"]
+
+
+class TestReinitializeClients:
+    """配置保存后重新初始化客户端测试类"""
+
+    def test_previous_ai_writer_closed(self, web_app):
+        """测试重新初始化AI撰稿引擎时关闭旧实例的连接池，清空配置时同样关闭"""
+        web_app.config_manager.update_config("ai", {"ark_api_key": "test-key", "ark_base_url": "http://127.0.0.1:9/api/v3"})
+        web_app.reinitialize_clients_for_section("ai")
+        first = web_app.ai_writer
+        web_app.reinitialize_clients_for_section("ai")
+        second = web_app.ai_writer
+
+        assert second is not first
+        assert first.transport.http.is_closed
+        assert not second.transport.http.is_closed
+
+        web_app.config_manager.update_config("ai", {"ark_api_key": ""})
+        web_app.reinitialize_clients_for_section("ai")
+        assert web_app.ai_writer is None
+        assert second.transport.http.is_closed
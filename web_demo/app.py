@@ -5,7 +5,9 @@ Web演示后端API
 
 import os
 import sys
+import hmac
 import json
+import secrets
 import uuid
 import io
 import time
@@ -16,18 +18,23 @@ from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
 import logging
-from chunked_upload import ChunkedUploadHandler, create_chunked_upload_route
-from async_task_manager import task_manager, TaskStatus
-from config_manager import config_manager
 
-# 添加项目根目录到路径
+# 添加项目根目录到路径（async_task_manager 也依赖 meetaudio）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from chunked_upload import ChunkedUploadHandler, create_chunked_upload_route
+from async_task_manager import task_manager, TaskStatus
+from config_manager import config_manager
 from meetaudio import ByteDanceASRClient
 from meetaudio.enhanced_client import MeetingASRClient, MeetingResult
+from meetaudio.callback import CallbackRegistry, parse_callback
+from meetaudio.watcher import TaskWatcher
+from meetaudio.result_cache import ResultCache
+from meetaudio.models import TaskStatus as ASRTaskStatus
 from meetaudio.ai_writer import AIWriter
+from meetaudio.llm_cache import LLMResponseCache
 from meetaudio.document_generator import document_generator
-from meetaudio.exceptions import ByteDanceASRError
+from meetaudio.exceptions import ByteDanceASRError, TaskCancelledError
 from meetaudio.utils import setup_logging
 
 app = Flask(__name__)
@@ -45,6 +52,42 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # 创建分块上传处理器
 chunked_upload_handler = ChunkedUploadHandler(UPLOAD_FOLDER)
 
+# 识别结果回调登记处（配置了 asr_callback_url 时，识别服务会将结果推送到 /api/asr_callback）
+callback_registry = CallbackRegistry()
+
+
+def asr_callback_token():
+    """
+    回调校验令牌：依次取 ASR_CALLBACK_TOKEN 环境变量、配置中的 asr_callback_token；
+    都没有时生成并保存到配置（多个 worker 时应通过环境变量指定同一令牌）
+    """
+    token = os.getenv("ASR_CALLBACK_TOKEN") or config_manager.get_config("asr").get("asr_callback_token")
+    if not token:
+        token = secrets.token_urlsafe(24)
+        config_manager.update_config("asr", {"asr_callback_token": token})
+    return token
+
+
+def asr_callback_url(asr_config):
+    """提交任务时使用的回调地址（带校验令牌），未配置回调时返回None"""
+    url = asr_config.get("asr_callback_url")
+    if not url:
+        return None
+    separator = "&" if "?" in url else "?"
+    return f"{url}{separator}token={asr_callback_token()}"
+
+# 识别结果订阅器：同一任务的所有 /api/wait 请求共享一个后台轮询
+task_watcher = TaskWatcher()
+
+# 任务结果缓存：/api/query 与 /api/wait 共享，终态结果只查询和序列化一次
+result_cache = ResultCache(serializer=lambda status: serialize_task_status(status))
+
+# 大模型响应缓存：重新生成纪要、重复润色同一段文本时直接返回缓存的回复，重新初始化AI撰稿引擎后仍共用
+llm_cache = LLMResponseCache(os.path.join("task_data", "llm_cache.db"))
+
+# 纪要正文的预估长度（字符），流式生成期间据此把进度从50%推进到89%
+MINUTES_EXPECTED_LENGTH = 3000
+
 # 创建云存储客户端
 storage_client = None
 def init_storage_client():
@@ -120,20 +163,30 @@ def handle_generate_minutes_task(task_data, task):
 
         logger.info(f"调用AI生成接口: {original_task_id}")
 
-        # 添加超时和重试机制
-        import time
+        # 流式生成：已生成的正文写入 task.partial_text，供 /api/async_task/<id>/stream 推送
+        def on_text(text):
+            task.partial_text = text
+            progress = min(89, 50 + len(text) * 39 // MINUTES_EXPECTED_LENGTH)
+            if progress != task.progress:
+                task.progress = progress
+
+        # 总时长由任务管理器的 task_timeout 限制，取消或超时时在两次大模型调用之间退出
         start_time = time.time()
-        max_duration = 1000  # 最大允许16分钟
 
         try:
             minutes_data = ai_writer.generate_meeting_minutes(
                 meeting_result=meeting_result,
-                meeting_info=meeting_info
+                meeting_info=meeting_info,
+                cancel_token=task.cancel_token,
+                use_cache=not task_data.get('regenerate', False),
+                on_text=on_text
             )
 
             duration = time.time() - start_time
             logger.info(f"AI生成接口返回: {original_task_id}, 耗时: {duration:.2f}秒")
 
+        except TaskCancelledError:
+            raise
         except Exception as ai_error:
             duration = time.time() - start_time
             logger.error(f"AI生成失败: {original_task_id}, 耗时: {duration:.2f}秒, 错误: {ai_error}")
@@ -170,9 +223,16 @@ def handle_generate_minutes_task(task_data, task):
         logger.error(f"异步生成会议纪要失败: {e}")
         raise e
 
+def replace_ai_writer(writer):
+    """替换全局AI撰稿引擎，并关闭旧实例的连接池"""
+    global ai_writer
+    previous, ai_writer = ai_writer, writer
+    if previous is not None and previous is not writer:
+        previous.close()
+
 def init_clients():
     """初始化客户端"""
-    global asr_client, ai_writer
+    global asr_client
     try:
         # 检查配置是否完整
         missing_configs = config_manager.get_missing_configs()
@@ -188,20 +248,25 @@ def init_clients():
         if asr_config.get("asr_app_key") and asr_config.get("asr_access_key"):
             asr_client = MeetingASRClient(
                 app_key=asr_config["asr_app_key"],
-                access_key=asr_config["asr_access_key"]
+                access_key=asr_config["asr_access_key"],
+                callback_url=asr_callback_url(asr_config),
+                callback_registry=callback_registry
             )
+            task_watcher.client = asr_client
+            task_watcher.timeout = asr_config.get("asr_timeout", 1800)
             logger.info("会议ASR客户端初始化成功")
         else:
             logger.warning("ASR配置不完整，ASR客户端未初始化")
 
         # 初始化AI撰稿引擎
         if ai_config.get("ark_api_key"):
-            ai_writer = AIWriter(
+            replace_ai_writer(AIWriter(
                 api_key=ai_config["ark_api_key"],
                 model=ai_config.get("ark_model", "ep-20250618123643-dtts7"),
                 base_url=ai_config.get("ark_base_url", "https://ark.cn-beijing.volces.com/api/v3"),
-                timeout=ai_config.get("ark_timeout", 300)
-            )
+                timeout=ai_config.get("ark_timeout", 300),
+                response_cache=llm_cache
+            ))
             logger.info("AI撰稿引擎初始化成功")
         else:
             logger.warning("AI配置不完整，AI撰稿引擎未初始化")
@@ -218,7 +283,7 @@ def init_clients():
 
 def reinitialize_clients_for_section(section):
     """根据配置段重新初始化相应的客户端"""
-    global asr_client, ai_writer
+    global asr_client
     result = {}
 
     try:
@@ -226,16 +291,17 @@ def reinitialize_clients_for_section(section):
             # 重新初始化AI客户端
             ai_config = config_manager.get_config("ai")
             if ai_config.get("ark_api_key"):
-                ai_writer = AIWriter(
+                replace_ai_writer(AIWriter(
                     api_key=ai_config["ark_api_key"],
                     model=ai_config.get("ark_model", "ep-20250618123643-dtts7"),
                     base_url=ai_config.get("ark_base_url", "https://ark.cn-beijing.volces.com/api/v3"),
-                    timeout=ai_config.get("ark_timeout", 300)
-                )
+                    timeout=ai_config.get("ark_timeout", 300),
+                    response_cache=llm_cache
+                ))
                 logger.info("AI撰稿引擎重新初始化成功")
                 result['ai'] = 'success'
             else:
-                ai_writer = None
+                replace_ai_writer(None)
                 logger.warning("AI配置不完整，AI客户端已清空")
                 result['ai'] = 'cleared'
 
@@ -245,12 +311,17 @@ def reinitialize_clients_for_section(section):
             if asr_config.get("asr_app_key") and asr_config.get("asr_access_key"):
                 asr_client = MeetingASRClient(
                     app_key=asr_config["asr_app_key"],
-                    access_key=asr_config["asr_access_key"]
+                    access_key=asr_config["asr_access_key"],
+                    callback_url=asr_callback_url(asr_config),
+                    callback_registry=callback_registry
                 )
+                task_watcher.client = asr_client
+                task_watcher.timeout = asr_config.get("asr_timeout", 1800)
                 logger.info("ASR客户端重新初始化成功")
                 result['asr'] = 'success'
             else:
                 asr_client = None
+                task_watcher.client = None
                 logger.warning("ASR配置不完整，ASR客户端已清空")
                 result['asr'] = 'cleared'
 
@@ -303,7 +374,8 @@ def api_status():
         "version": "1.0.0",
         "config_status": config_status,
         "missing_configs": missing_configs,
-        "ready": len(missing_configs) == 0
+        "ready": len(missing_configs) == 0,
+        "llm_cache": llm_cache.stats()
     })
 
 
@@ -590,6 +662,54 @@ def generate_detailed_minutes_data(demo_data, meeting_info):
         }
     }
 
+def fetch_task_status(task_id):
+    """查询上游任务状态；任务暂时不存在时重试（经结果缓存调用，同一任务的并发请求共享一次查询）"""
+    max_retries = 3
+    retry_delay = 3  # 秒
+    status = None
+
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"查询任务 {task_id}，第 {attempt + 1} 次尝试")
+            status = asr_client.get_result(task_id)
+            logger.info(f"查询完成，状态: {status.status_code}, 消息: {status.message}")
+
+            # 如果不是"任务不存在"错误，直接返回结果
+            if status.status_code != 45000000 or "cannot find task" not in status.message:
+                break
+
+            # 如果是"任务不存在"且还有重试机会，等待后重试
+            if attempt < max_retries - 1:
+                logger.warning(f"任务 {task_id} 暂时不存在，{retry_delay}秒后重试...")
+                time.sleep(retry_delay)
+                continue
+
+        except Exception as e:
+            logger.error(f"查询任务异常 (尝试 {attempt + 1}): {str(e)}")
+            if attempt < max_retries - 1:
+                time.sleep(retry_delay)
+                continue
+            else:
+                raise
+
+    return status
+
+def serialize_task_status(status):
+    """将任务状态转换为 /api/query 的响应数据（完成的结果只序列化一次并缓存）"""
+    response_data = {
+        'success': True,
+        'status_code': status.status_code,
+        'message': status.message,
+        'is_success': status.is_success,
+        'is_processing': status.is_processing,
+        'is_failed': status.is_failed
+    }
+
+    if status.result:
+        response_data['result'] = serialize_asr_result(status.result)
+
+    return response_data
+
 @app.route('/api/query/<task_id>', methods=['GET'])
 def query_result(task_id):
     """查询识别结果"""
@@ -600,39 +720,12 @@ def query_result(task_id):
                 'error': 'ASR服务未初始化'
             }), 500
 
-        # 查询结果，增加重试机制
         logger.info(f"开始查询任务结果: {task_id}")
-
-        max_retries = 3
-        retry_delay = 3  # 秒
-        status = None
-
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"查询任务 {task_id}，第 {attempt + 1} 次尝试")
-                status = asr_client.get_result(task_id)
-                logger.info(f"查询完成，状态: {status.status_code}, 消息: {status.message}")
-
-                # 如果不是"任务不存在"错误，直接返回结果
-                if status.status_code != 45000000 or "cannot find task" not in status.message:
-                    break
-
-                # 如果是"任务不存在"且还有重试机会，等待后重试
-                if attempt < max_retries - 1:
-                    logger.warning(f"任务 {task_id} 暂时不存在，{retry_delay}秒后重试...")
-                    time.sleep(retry_delay)
-                    continue
-
-            except Exception as e:
-                logger.error(f"查询任务异常 (尝试 {attempt + 1}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    raise
+        entry = result_cache.get(task_id, lambda: fetch_task_status(task_id))
+        status = entry.status
 
         # 检查是否是"任务不存在"错误
-        if status and status.status_code == 45000000 and "cannot find task" in status.message:
+        if status.status_code == 45000000 and "cannot find task" in status.message:
             logger.warning(f"任务不存在: {task_id}，可能是API处理延迟或URL访问问题")
             return jsonify({
                 'success': False,
@@ -642,23 +735,7 @@ def query_result(task_id):
                 'suggestion': '请稍后重试，或检查音频文件URL是否可以被远程API访问'
             }), 404
 
-        response_data = {
-            'success': True,
-            'status_code': status.status_code,
-            'message': status.message,
-            'is_success': status.is_success,
-            'is_processing': status.is_processing,
-            'is_failed': status.is_failed
-        }
-
-        if status.result:
-            response_data['result'] = {
-                'text': status.result.text,
-                'audio_info': status.result.audio_info.model_dump() if status.result.audio_info else None,
-                'utterances': [u.model_dump() for u in status.result.utterances] if status.result.utterances else None
-            }
-
-        return jsonify(response_data)
+        return jsonify(entry.payload)
 
     except ByteDanceASRError as e:
         logger.error(f"查询结果失败: {e.message}")
@@ -675,9 +752,26 @@ def query_result(task_id):
             'error': f'服务器错误: {str(e)}'
         }), 500
 
+def serialize_asr_result(result):
+    """将识别结果转换为接口返回的字典"""
+    return {
+        'text': result.text,
+        'audio_info': result.audio_info.model_dump() if result.audio_info else None,
+        'utterances': [u.model_dump() for u in result.utterances] if result.utterances else None
+    }
+
+def describe_wait_error(e):
+    """将等待失败的异常转换为用户可读的提示"""
+    error_msg = str(e)
+    if "audio download failed" in error_msg:
+        error_msg = "音频文件下载失败，请检查文件是否可访问或重新上传"
+    elif "Invalid audio URI" in error_msg:
+        error_msg = "音频文件URL无效，请重新上传文件"
+    return error_msg
+
 @app.route('/api/wait/<task_id>', methods=['GET'])
 def wait_for_result(task_id):
-    """等待识别完成（长轮询）"""
+    """等待识别完成（长轮询，多个请求共享同一个后台轮询）"""
     try:
         timeout = request.args.get('timeout', 1800, type=int)  # 默认30分钟
 
@@ -689,16 +783,15 @@ def wait_for_result(task_id):
 
         logger.info(f"开始长轮询等待任务: {task_id}, 超时: {timeout}秒")
 
-        # 等待结果
-        result = asr_client.wait_for_result(task_id, timeout=timeout)
+        # 已缓存终态结果时直接返回，否则订阅后台轮询
+        entry = result_cache.peek(task_id)
+        if entry is None or not entry.terminal or not entry.status.is_success:
+            result = task_watcher.wait(task_id, timeout=timeout)
+            entry = result_cache.put(task_id, ASRTaskStatus(status_code=20000000, message="OK", result=result))
 
         response_data = {
             'success': True,
-            'result': {
-                'text': result.text,
-                'audio_info': result.audio_info.model_dump() if result.audio_info else None,
-                'utterances': [u.model_dump() for u in result.utterances] if result.utterances else None
-            }
+            'result': entry.payload['result']
         }
 
         logger.info(f"长轮询完成: {task_id}")
@@ -708,19 +801,81 @@ def wait_for_result(task_id):
         logger.error(f"长轮询等待失败: {e}")
 
         # 提供更详细的错误信息
-        error_msg = str(e)
-        if "audio download failed" in error_msg:
-            error_msg = "音频文件下载失败，请检查文件是否可访问或重新上传"
-        elif "Invalid audio URI" in error_msg:
-            error_msg = "音频文件URL无效，请重新上传文件"
-
         return jsonify({
             'success': False,
-            'error': error_msg,
+            'error': describe_wait_error(e),
             'task_id': task_id,
             'details': str(e)
         }), 408
 
+@app.route('/api/wait/<task_id>/stream', methods=['GET'])
+def stream_result(task_id):
+    """以Server-Sent Events等待识别完成：定期发送心跳，完成后推送 result 或 error 事件"""
+    if not asr_client:
+        return jsonify({
+            'success': False,
+            'error': 'ASR服务未初始化'
+        }), 500
+
+    timeout = request.args.get('timeout', 1800, type=int)
+    heartbeat = 15
+
+    def generate():
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                payload = {'success': False, 'error': f'等待超时（{timeout}秒）', 'task_id': task_id}
+                yield f"event: error\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                return
+
+            outcome = task_watcher.wait_outcome(task_id, timeout=min(heartbeat, remaining))
+            if outcome is None:
+                yield ": keep-alive\n\n"
+            elif isinstance(outcome, Exception):
+                payload = {
+                    'success': False,
+                    'error': describe_wait_error(outcome),
+                    'task_id': task_id,
+                    'details': str(outcome)
+                }
+                yield f"event: error\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                return
+            else:
+                entry = result_cache.put(task_id, ASRTaskStatus(status_code=20000000, message="OK", result=outcome))
+                payload = {'success': True, 'result': entry.payload['result']}
+                yield f"event: result\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                return
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/asr_callback', methods=['POST'])
+def asr_callback():
+    """接收识别服务推送的任务结果（回调地址中的 token 须与本部署的校验令牌一致）"""
+    expected = os.getenv("ASR_CALLBACK_TOKEN") or config_manager.get_config("asr").get("asr_callback_token")
+    token = request.args.get('token', '')
+    if not expected or not hmac.compare_digest(token.encode(), expected.encode()):
+        logger.warning("拒绝回调: 校验令牌不匹配")
+        return jsonify({
+            'success': False,
+            'error': 'invalid token'
+        }), 403
+
+    try:
+        task_id, status = parse_callback(request.get_data(), request.headers)
+    except ValueError as e:
+        logger.warning(f"拒绝非法回调: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    callback_registry.publish(task_id, status)
+    return jsonify({'success': True})
+
 @app.route('/api/generate_minutes/<task_id>', methods=['POST'])
 def generate_meeting_minutes(task_id):
     """异步生成会议纪要 - 提交任务"""
@@ -759,7 +914,9 @@ def generate_meeting_minutes(task_id):
             'options': {
                 'focus_last_speakers': data.get('focus_last_speakers', True),
                 'speaker_count': data.get('speaker_count', 2)
-            }
+            },
+            # 为True时不使用缓存的大模型回复，重新生成
+            'regenerate': bool(data.get('regenerate', False))
         }
 
         # 提交异步任务
@@ -804,6 +961,100 @@ def get_async_task_status(async_task_id):
             'error': f'查询失败: {str(e)}'
         }), 500
 
+@app.route('/api/async_task/<async_task_id>/cancel', methods=['POST'])
+def cancel_async_task(async_task_id):
+    """取消异步任务"""
+    try:
+        if task_manager.cancel_task(async_task_id):
+            return jsonify({
+                'success': True,
+                'message': '任务已取消'
+            })
+
+        task_status = task_manager.get_task_status(async_task_id)
+        if not task_status:
+            return jsonify({
+                'success': False,
+                'error': '任务不存在'
+            }), 404
+        return jsonify({
+            'success': False,
+            'error': '任务已结束，无法取消',
+            'status': task_status['status']
+        }), 409
+
+    except Exception as e:
+        logger.error(f"取消异步任务失败: {e}")
+        return jsonify({
+            'success': False,
+            'error': f'取消失败: {str(e)}'
+        }), 500
+
+@app.route('/api/async_task/<async_task_id>/stream', methods=['GET'])
+def stream_async_task(async_task_id):
+    """
+    以Server-Sent Events推送异步任务进度和流式生成的文本
+
+    事件：status（状态和进度变化）、delta（新生成的文本）、partial（重试后从头生成时的完整文本）、
+    result（任务完成，内容同 /result 接口）、error（任务失败、取消、不存在或等待超时）
+    """
+    timeout = request.args.get('timeout', 1800, type=int)
+    heartbeat = 15
+    # 进度变化不会唤醒等待，按此间隔重新查询
+    interval = 1.0
+
+    def event(name, payload):
+        return f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    def generate():
+        deadline = time.monotonic() + timeout
+        last_sent = time.monotonic()
+        revision = -1
+        state = None
+        sent_text = ""
+        while True:
+            task_status = task_manager.get_task_status(async_task_id)
+            if not task_status:
+                yield event('error', {'success': False, 'error': '任务不存在'})
+                return
+
+            status = task_status['status']
+            if (status, task_status['progress']) != state:
+                state = (status, task_status['progress'])
+                yield event('status', {'status': status, 'progress': task_status['progress']})
+                last_sent = time.monotonic()
+
+            text = task_status.get('partial_text', '')
+            if text.startswith(sent_text):
+                if len(text) > len(sent_text):
+                    yield event('delta', {'text': text[len(sent_text):]})
+                    last_sent = time.monotonic()
+            elif text:
+                yield event('partial', {'text': text})
+                last_sent = time.monotonic()
+            sent_text = text or sent_text
+
+            if status == 'completed':
+                yield event('result', task_manager.get_task_result(async_task_id))
+                return
+            if status in ('failed', 'cancelled'):
+                yield event('error', {'success': False, 'status': status, 'error': task_status.get('error')})
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                yield event('error', {'success': False, 'error': f'等待超时（{timeout}秒）'})
+                return
+            if time.monotonic() - last_sent >= heartbeat:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            revision = task_manager.wait_for_update(revision, timeout=min(interval, remaining))
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/async_task/<async_task_id>/result', methods=['GET'])
 def get_async_task_result(async_task_id):
     """获取异步任务结果"""
@@ -863,7 +1114,9 @@ def enhance_content():
                 'error': 'AI服务未初始化'
             }), 500
 
-        enhanced_text = ai_writer.enhance_content(text, enhancement_type)
+        enhanced_text = ai_writer.enhance_content(
+            text, enhancement_type, use_cache=not data.get('regenerate', False)
+        )
 
         return jsonify({
             'success': True,
@@ -897,21 +1150,8 @@ def ai_text_process():
 
         logger.info(f"AI文本处理请求 - 动作: {action}, 文本长度: {len(original_text)}")
 
-        # 直接从配置管理器获取AI配置
-        ai_config = config_manager.get_config("ai")
-        if not ai_config:
-            return jsonify({
-                'success': False,
-                'error': 'AI配置未找到'
-            }), 500
-
-        ark_api_key = ai_config.get("ark_api_key", "")
-        ark_model = ai_config.get("ark_model", "ep-20250618123643-dtts7")
-        ark_base_url = ai_config.get("ark_base_url", "https://ark.cn-beijing.volces.com/api/v3")
-
-        logger.info(f"配置检查 - API Key长度: {len(ark_api_key)}, Model: {ark_model}, Base URL: {ark_base_url}")
-
-        if not ark_api_key:
+        # AI撰稿引擎按当前AI配置初始化，复用其连接池
+        if not ai_writer or not ai_writer.transport:
             return jsonify({
                 'success': False,
                 'error': 'API密钥未配置'
@@ -919,27 +1159,16 @@ def ai_text_process():
 
         # 调用AI服务进行文本处理
         try:
-            # 直接创建OpenAI客户端，使用配置中的参数
-            import openai
-
-            client = openai.OpenAI(
-                api_key=ark_api_key,
-                base_url=ark_base_url,
-                timeout=60
-            )
-
-            response = client.chat.completions.create(
-                model=ark_model,
-                messages=[
+            processed_text = ai_writer.transport.chat(
+                ai_writer.model,
+                [
                     {"role": "system", "content": "你是一个专业的文本处理助手。请根据用户的要求处理文本，直接返回处理后的结果，不要包含任何解释或说明。"},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3,
                 max_tokens=2000,
-                timeout=60
-            )
-
-            processed_text = response.choices[0].message.content.strip()
+                timeout=60,
+                use_cache=not data.get('regenerate', False)
+            ).strip()
 
             logger.info(f"AI文本处理成功 - 动作: {action}")
 
@@ -981,19 +1210,8 @@ def optimize_prompt():
 
         logger.info(f"AI提示词优化请求 - 需求描述长度: {len(user_requirement)}")
 
-        # 获取AI配置
-        ai_config = config_manager.get_config("ai")
-        if not ai_config:
-            return jsonify({
-                'success': False,
-                'error': 'AI配置未找到'
-            }), 500
-
-        ark_api_key = ai_config.get("ark_api_key", "")
-        ark_model = ai_config.get("ark_model", "ep-20250618123643-dtts7")
-        ark_base_url = ai_config.get("ark_base_url", "https://ark.cn-beijing.volces.com/api/v3")
-
-        if not ark_api_key:
+        # AI撰稿引擎按当前AI配置初始化，复用其连接池
+        if not ai_writer or not ai_writer.transport:
             return jsonify({
                 'success': False,
                 'error': 'API密钥未配置'
@@ -1035,26 +1253,15 @@ JSON格式示例：
 }}"""
 
         try:
-            import openai
-
-            client = openai.OpenAI(
-                api_key=ark_api_key,
-                base_url=ark_base_url,
-                timeout=120
-            )
-
-            response = client.chat.completions.create(
-                model=ark_model,
-                messages=[
+            ai_response = ai_writer.transport.chat(
+                ai_writer.model,
+                [
                     {"role": "system", "content": "你是一个专业的会议纪要系统配置专家，擅长根据用户需求生成专业的提示词配置。"},
                     {"role": "user", "content": optimization_prompt}
                 ],
-                temperature=0.3,
                 max_tokens=3000,
                 timeout=120
-            )
-
-            ai_response = response.choices[0].message.content.strip()
+            ).strip()
             logger.info(f"AI优化响应长度: {len(ai_response)}")
 
             # 尝试解析JSON响应
@@ -1165,6 +1372,7 @@ def get_status():
         'ai_writer_initialized': ai_writer is not None,
         'storage_info': 'TOS云存储' if storage_client else '本地HTTP存储',
         'storage_test': storage_client.test_connection() if storage_client else True,
+        'llm_cache': llm_cache.stats(),
         'version': '2.0.0'
     })
 
@@ -1347,20 +1555,15 @@ def get_config():
         import copy
         config = copy.deepcopy(config)
 
-        if section == 'ai' or not section:
-            if 'ai' in config:
-                if config['ai'].get('ark_api_key'):
-                    config['ai']['ark_api_key'] = config['ai']['ark_api_key'][:8] + '...'
-
-        if section == 'storage' or not section:
-            if 'storage' in config:
-                if config['storage'].get('tos_secret_key'):
-                    config['storage']['tos_secret_key'] = config['storage']['tos_secret_key'][:8] + '...'
-
-        if section == 'asr' or not section:
-            if 'asr' in config:
-                if config['asr'].get('asr_access_key'):
-                    config['asr']['asr_access_key'] = config['asr']['asr_access_key'][:8] + '...'
+        # 查询单个配置节时 config 即该节本身
+        sections = {section: config} if section else config
+        for name, key in (('ai', 'ark_api_key'), ('storage', 'tos_secret_key'), ('asr', 'asr_access_key')):
+            values = sections.get(name)
+            if values and values.get(key):
+                values[key] = values[key][:8] + '...'
+        if sections.get('asr'):
+            # 回调校验令牌只在服务端使用
+            sections['asr'].pop('asr_callback_token', None)
 
         return jsonify({
             'success': True,
@@ -2,18 +2,32 @@
 异步任务管理器 - 处理AI会议纪要生成的异步任务
 """
 
+import heapq
+import itertools
+import multiprocessing
+import socket
 import threading
 import time
 import uuid
 import logging
-import json
 import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, Any, Optional, Callable
 from enum import Enum
 from datetime import datetime, timedelta
 
+from meetaudio.cancellation import CancelToken
+from meetaudio.exceptions import TaskCancelledError
+from task_persistence import SharedTaskStore, TaskPersistence, create_persistence
+
 logger = logging.getLogger(__name__)
 
+# 任务处理器的执行方式：thread（工作线程，默认）、process（进程池，适合CPU密集型）、inline（提交时同步执行）
+EXECUTOR_MODES = ("thread", "process", "inline")
+
+# 进程池子进程中的进度队列（由进程池初始化函数设置）
+_progress_queue = None
+
 
 class TaskStatus(Enum):
     """任务状态枚举"""
@@ -21,15 +35,21 @@ class TaskStatus(Enum):
     RUNNING = "running"      # 执行中
     COMPLETED = "completed"  # 已完成
     FAILED = "failed"        # 失败
+    CANCELLED = "cancelled"  # 已取消
+
+
+# 已结束的任务状态
+FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
 
 
 class AsyncTask:
     """异步任务类"""
     
-    def __init__(self, task_id: str, task_type: str, task_data: Dict[str, Any]):
+    def __init__(self, task_id: str, task_type: str, task_data: Dict[str, Any], priority: int = 0):
         self.task_id = task_id
         self.task_type = task_type
         self.task_data = task_data
+        self.priority = priority
         self.status = TaskStatus.PENDING
         self.result = None
         self.error = None
@@ -37,12 +57,30 @@ class AsyncTask:
         self.started_at = None
         self.completed_at = None
         self.progress = 0
+        # 执行期间的取消令牌（不持久化）；处理器可通过 task.cancel_token 协作式退出
+        self.cancel_token: Optional[CancelToken] = None
+        # 超时或取消后不再等待处理器返回，执行它的工作线程结束后直接退出
+        self.abandoned = False
+        # 流式生成中已生成的文本（只有共享任务存储会写入）；处理器设置后通知 listener
+        self._partial_text = ""
+        self.listener: Optional[Callable[[], None]] = None
+
+    @property
+    def partial_text(self) -> str:
+        return self._partial_text
+
+    @partial_text.setter
+    def partial_text(self, value: str):
+        self._partial_text = value
+        if self.listener:
+            self.listener()
         
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
             "task_id": self.task_id,
             "task_type": self.task_type,
+            "priority": self.priority,
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
@@ -53,29 +91,103 @@ class AsyncTask:
         }
 
 
+class ProcessTaskContext:
+    """进程池中传给处理器的任务上下文：设置 progress 时通过队列回传给主进程"""
+
+    def __init__(self, task_id: str, task_type: str):
+        self.task_id = task_id
+        self.task_type = task_type
+        self._progress = 0
+        # 流式生成的部分文本不回传主进程
+        self.partial_text = ""
+
+    @property
+    def progress(self) -> int:
+        return self._progress
+
+    @progress.setter
+    def progress(self, value: int):
+        self._progress = value
+        if _progress_queue is not None:
+            _progress_queue.put((self.task_id, value))
+
+
+def _init_process_worker(progress_queue):
+    """进程池子进程初始化"""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_in_process(handler: Callable, task_id: str, task_type: str, task_data: Dict[str, Any]):
+    """在进程池子进程中执行处理器"""
+    return handler(task_data, ProcessTaskContext(task_id, task_type))
+
+
 class AsyncTaskManager:
     """异步任务管理器"""
 
-    def __init__(self, max_workers: int = 2, task_timeout: int = 300, persist_dir: str = "task_data"):
+    def __init__(
+        self,
+        max_workers: int = 2,
+        task_timeout: int = 300,
+        persist_dir: str = "task_data",
+        persistence: Optional[TaskPersistence] = None,
+        process_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            max_workers: 工作线程数
+            task_timeout: 任务超时时间（秒），超时的任务被标记为失败并释放工作线程；0或None表示不限时
+            persist_dir: 持久化数据目录
+            persistence: 持久化后端，默认使用 persist_dir 下的 SQLite 数据库
+            process_workers: 进程池大小（仅 process 执行方式使用），默认与 max_workers 相同
+        """
         self.max_workers = max_workers
         self.task_timeout = task_timeout
         self.tasks: Dict[str, AsyncTask] = {}
         self.task_handlers: Dict[str, Callable] = {}
+        self.task_executors: Dict[str, str] = {}
+        self.process_workers = process_workers or max_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
         self.worker_threads = []
         self.running = False
         self.lock = threading.Lock()
+        # 就绪队列：按 (-优先级, 提交序号) 排序的堆，工作线程在条件变量上等待新任务
+        self.condition = threading.Condition(self.lock)
+        self._ready_queue = []
+        self._sequence = itertools.count()
+        self._stopped = threading.Event()
+        self._worker_ids = itertools.count()
+        # 任务部分文本或状态更新的通知（独立的锁：处理器更新部分文本时不与 self.lock 竞争）
+        self._updates = threading.Condition()
+        self._revision = 0
         self.persist_dir = persist_dir
 
         # 创建持久化目录
         os.makedirs(self.persist_dir, exist_ok=True)
+        self.persistence = persistence or create_persistence(
+            os.getenv("TASK_PERSISTENCE_BACKEND", "sqlite"), self.persist_dir
+        )
 
         # 加载已存在的任务
         self._load_tasks()
         
-    def register_handler(self, task_type: str, handler: Callable):
-        """注册任务处理器"""
+    def register_handler(self, task_type: str, handler: Callable, executor: str = "thread"):
+        """
+        注册任务处理器
+
+        Args:
+            task_type: 任务类型
+            handler: 处理函数 handler(task_data, task)，通过设置 task.progress 汇报进度
+            executor: 执行方式；process 方式下处理器及其参数、返回值必须可被 pickle
+                     （模块级函数），task 为 ProcessTaskContext
+        """
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"未知的执行方式: {executor}")
         self.task_handlers[task_type] = handler
-        logger.info(f"注册任务处理器: {task_type}")
+        self.task_executors[task_type] = executor
+        logger.info(f"注册任务处理器: {task_type} ({executor})")
         
     def start(self):
         """启动任务管理器"""
@@ -83,58 +195,135 @@ class AsyncTaskManager:
             return
             
         self.running = True
+        self._stopped.clear()
         
         # 启动工作线程
-        for i in range(self.max_workers):
-            thread = threading.Thread(target=self._worker_loop, name=f"TaskWorker-{i}")
-            thread.daemon = True
-            thread.start()
-            self.worker_threads.append(thread)
+        for _ in range(self.max_workers):
+            self._spawn_worker()
             
         # 启动清理线程
         cleanup_thread = threading.Thread(target=self._cleanup_loop, name="TaskCleanup")
         cleanup_thread.daemon = True
         cleanup_thread.start()
+
+        # 启动超时检查线程
+        if self.task_timeout:
+            watchdog = threading.Thread(target=self._watchdog_loop, name="TaskWatchdog")
+            watchdog.daemon = True
+            watchdog.start()
         
         logger.info(f"异步任务管理器已启动，工作线程数: {self.max_workers}")
         
     def stop(self):
         """停止任务管理器"""
-        self.running = False
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self._stopped.set()
+        if self._process_pool:
+            self._process_pool.shutdown(wait=False)
+            self._progress_queue.put(None)
+            self._process_pool = None
+        self.persistence.flush()
         logger.info("异步任务管理器已停止")
         
-    def submit_task(self, task_type: str, task_data: Dict[str, Any], task_id: Optional[str] = None) -> str:
-        """提交异步任务"""
+    def submit_task(
+        self,
+        task_type: str,
+        task_data: Dict[str, Any],
+        task_id: Optional[str] = None,
+        priority: int = 0
+    ) -> str:
+        """提交异步任务（priority 越大越先执行，同优先级按提交顺序）"""
         if task_id is None:
             task_id = str(uuid.uuid4())
             
         if task_type not in self.task_handlers:
             raise ValueError(f"未注册的任务类型: {task_type}")
             
-        task = AsyncTask(task_id, task_type, task_data)
+        task = AsyncTask(task_id, task_type, task_data, priority)
+        inline = self.task_executors.get(task_type) == "inline"
 
-        with self.lock:
+        with self.condition:
             self.tasks[task_id] = task
+            if inline:
+                self._mark_running(task)
+            else:
+                self._enqueue(task)
             self._save_task(task)
+            self.condition.notify()
 
         logger.info(f"提交异步任务: {task_id} ({task_type})")
+        if inline:
+            self._execute_task(task)
         return task_id
         
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """获取任务状态"""
+        """获取任务状态（执行中的任务附带已生成的部分文本 partial_text）"""
         with self.lock:
-            task = self.tasks.get(task_id)
+            task = self._find_task(task_id)
             if task:
-                return task.to_dict()
+                status = task.to_dict()
+                if task.status == TaskStatus.RUNNING and task.partial_text:
+                    status["partial_text"] = task.partial_text
+                return status
             return None
+
+    def wait_for_update(self, revision: int, timeout: float) -> int:
+        """
+        等待任务更新（部分文本变化或任务结束）
+
+        Args:
+            revision: 上次返回的更新序号，首次调用传 -1（立即返回）
+            timeout: 最长等待时间（秒）；进度变化和其他进程执行的任务不会通知，需按超时重新查询
+
+        Returns:
+            最新的更新序号
+        """
+        with self._updates:
+            if self._revision == revision:
+                self._updates.wait(timeout)
+            return self._revision
+
+    def _notify_update(self):
+        """唤醒 wait_for_update 的等待者"""
+        with self._updates:
+            self._revision += 1
+            self._updates.notify_all()
+
+    def _partial_text_changed(self, task: AsyncTask):
+        """处理器更新了部分文本"""
+        self._notify_update()
             
     def get_task_result(self, task_id: str) -> Optional[Any]:
         """获取任务结果"""
         with self.lock:
-            task = self.tasks.get(task_id)
+            task = self._find_task(task_id)
             if task and task.status == TaskStatus.COMPLETED:
                 return task.result
             return None
+
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        取消任务
+
+        等待中的任务不再执行；执行中的任务通过 task.cancel_token 通知处理器退出，
+        并立即补充一个工作线程，不等待处理器返回。
+
+        Returns:
+            是否取消成功（任务不存在或已结束时返回False）
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.status in FINISHED_STATUSES:
+                return False
+            if task.status == TaskStatus.RUNNING:
+                task.cancel_token.cancel()
+                self._abandon(task)
+            self._finish(task, TaskStatus.CANCELLED, error="任务已取消")
+
+        logger.info(f"取消任务: {task_id}")
+        return True
             
     def _worker_loop(self):
         """工作线程循环"""
@@ -142,22 +331,72 @@ class AsyncTaskManager:
             task = self._get_pending_task()
             if task:
                 self._execute_task(task)
-            else:
-                time.sleep(1)  # 没有任务时休眠1秒
-                
-    def _get_pending_task(self) -> Optional[AsyncTask]:
-        """获取待执行的任务"""
-        with self.lock:
-            for task in self.tasks.values():
-                if task.status == TaskStatus.PENDING:
-                    task.status = TaskStatus.RUNNING
-                    task.started_at = datetime.now()
+                if task.abandoned:
+                    # 已有替补线程接手，本线程退出
+                    return
+
+    def _spawn_worker(self):
+        """启动一个工作线程"""
+        self.worker_threads = [t for t in self.worker_threads if t.is_alive()]
+        thread = threading.Thread(target=self._worker_loop, name=f"TaskWorker-{next(self._worker_ids)}")
+        thread.daemon = True
+        thread.start()
+        self.worker_threads.append(thread)
+
+    def _mark_running(self, task: AsyncTask):
+        """将任务标记为执行中并开始计时（需持有锁）"""
+        task.status = TaskStatus.RUNNING
+        task.started_at = datetime.now()
+        task.cancel_token = CancelToken(self.task_timeout or None)
+
+    def _finish(self, task: AsyncTask, status: TaskStatus, result: Any = None, error: Optional[str] = None):
+        """将任务标记为结束状态并保存（需持有锁）"""
+        task.status = status
+        task.result = result
+        task.error = error
+        task.completed_at = datetime.now()
+        if status == TaskStatus.COMPLETED:
+            task.progress = 100
+        self._save_task(task)
+        self._notify_update()
+
+    def _abandon(self, task: AsyncTask):
+        """
+        放弃等待执行中的任务（需持有锁）
+
+        工作线程中执行的处理器无法被强制中断：为它补充一个替补工作线程，
+        原线程在处理器返回后退出，结果被丢弃。进程池任务的工作线程会自行停止等待。
+        """
+        if task.abandoned or self.task_executors.get(task.task_type, "thread") != "thread":
+            return
+        task.abandoned = True
+        if self.running:
+            self._spawn_worker()
+
+    def _enqueue(self, task: AsyncTask):
+        """将任务放入就绪队列（需持有锁）"""
+        heapq.heappush(self._ready_queue, (-task.priority, next(self._sequence), task.task_id))
+
+    def _get_pending_task(self, timeout: Optional[float] = None) -> Optional[AsyncTask]:
+        """获取待执行的任务；队列为空时等待提交通知，停止或超时返回None"""
+        with self.condition:
+            while self.running:
+                while self._ready_queue:
+                    _, _, task_id = heapq.heappop(self._ready_queue)
+                    task = self.tasks.get(task_id)
+                    # 已被清理或不再等待的任务直接跳过
+                    if task is None or task.status != TaskStatus.PENDING:
+                        continue
+                    self._mark_running(task)
                     self._save_task(task)
                     return task
+                if not self.condition.wait(timeout) and timeout is not None:
+                    return None
             return None
             
     def _execute_task(self, task: AsyncTask):
         """执行任务"""
+        task.listener = lambda: self._partial_text_changed(task)
         try:
             logger.info(f"开始执行任务: {task.task_id} ({task.task_type})")
 
@@ -167,27 +406,79 @@ class AsyncTaskManager:
                 raise ValueError(f"未找到任务处理器: {task.task_type}")
 
             # 执行任务
-            result = handler(task.task_data, task)
+            if self.task_executors.get(task.task_type) == "process":
+                future = self._get_process_pool().submit(
+                    _run_in_process, handler, task.task_id, task.task_type, task.task_data
+                )
+                result = self._wait_future(future, task.cancel_token)
+            else:
+                result = handler(task.task_data, task)
 
-            # 更新任务状态
+            # 更新任务状态（已被取消或判定超时的任务不再覆盖）
             with self.lock:
-                task.status = TaskStatus.COMPLETED
-                task.result = result
-                task.completed_at = datetime.now()
-                task.progress = 100
-                self._save_task(task)
+                if task.status != TaskStatus.RUNNING:
+                    logger.info(f"任务已结束，丢弃执行结果: {task.task_id} ({task.status.value})")
+                    return
+                self._finish(task, TaskStatus.COMPLETED, result=result)
 
             logger.info(f"任务执行成功: {task.task_id}")
 
+        except TaskCancelledError as e:
+            logger.warning(f"任务中止: {task.task_id}, 原因: {e}")
+
+            with self.lock:
+                if task.status == TaskStatus.RUNNING:
+                    if task.cancel_token.reason == "timeout":
+                        self._finish(task, TaskStatus.FAILED, error=str(e))
+                    else:
+                        self._finish(task, TaskStatus.CANCELLED, error=str(e))
+
         except Exception as e:
             logger.error(f"任务执行失败: {task.task_id}, 错误: {e}")
 
             with self.lock:
-                task.status = TaskStatus.FAILED
-                task.error = str(e)
-                task.completed_at = datetime.now()
-                self._save_task(task)
+                if task.status == TaskStatus.RUNNING:
+                    self._finish(task, TaskStatus.FAILED, error=str(e))
+
+    @staticmethod
+    def _wait_future(future, cancel_token: CancelToken, interval: float = 0.5):
+        """等待进程池任务结果，期间响应取消和超时（子进程中的处理器会继续运行到结束）"""
+        while True:
+            cancel_token.raise_if_cancelled()
+            try:
+                return future.result(timeout=cancel_token.cap_timeout(interval))
+            except FutureTimeoutError:
+                continue
                 
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """按需创建进程池和进度回传线程"""
+        with self.lock:
+            if self._process_pool is None:
+                self._progress_queue = multiprocessing.Queue()
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    initializer=_init_process_worker,
+                    initargs=(self._progress_queue,)
+                )
+                pump = threading.Thread(
+                    target=self._progress_loop, args=(self._progress_queue,), name="TaskProgress"
+                )
+                pump.daemon = True
+                pump.start()
+            return self._process_pool
+
+    def _progress_loop(self, progress_queue):
+        """接收进程池中处理器汇报的进度"""
+        while True:
+            item = progress_queue.get()
+            if item is None:
+                return
+            task_id, progress = item
+            with self.lock:
+                task = self.tasks.get(task_id)
+                if task and task.status == TaskStatus.RUNNING:
+                    task.progress = progress
+
     def _cleanup_loop(self):
         """清理过期任务"""
         while self.running:
@@ -202,7 +493,10 @@ class AsyncTaskManager:
                     
                     for task_id in expired_tasks:
                         del self.tasks[task_id]
-                        self._delete_task_file(task_id)
+                        self.persistence.delete(task_id)
+
+                # 未加载到内存的历史任务直接在持久化后端中清理
+                self.persistence.purge(cutoff_time.isoformat())
 
                 if expired_tasks:
                     logger.info(f"清理过期任务: {len(expired_tasks)}个")
@@ -210,75 +504,292 @@ class AsyncTaskManager:
             except Exception as e:
                 logger.error(f"清理任务时出错: {e}")
 
+            self._stopped.wait(300)  # 每5分钟清理一次，停止时立即退出
+
+    def _watchdog_loop(self):
+        """将超过 task_timeout 仍未结束的任务标记为失败，并释放其工作线程"""
+        interval = min(5.0, max(0.05, self.task_timeout / 10))
+        while not self._stopped.wait(interval):
+            with self.lock:
+                overdue = [
+                    task for task in self.tasks.values()
+                    if task.status == TaskStatus.RUNNING and task.cancel_token and task.cancel_token.cancelled
+                ]
+                for task in overdue:
+                    logger.error(f"任务执行超时: {task.task_id}")
+                    self._abandon(task)
+                    self._finish(task, TaskStatus.FAILED, error="任务执行超时")
+
     def _save_task(self, task: AsyncTask):
-        """保存任务到文件"""
+        """提交任务快照给持久化后端（只入队，由后台线程批量写入）"""
         try:
-            task_file = os.path.join(self.persist_dir, f"{task.task_id}.json")
-            task_data = task.to_dict()
-            # 添加任务数据
-            task_data['task_data'] = task.task_data
-
-            with open(task_file, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, ensure_ascii=False, indent=2)
+            self.persistence.save(self._task_record(task))
         except Exception as e:
             logger.error(f"保存任务失败 {task.task_id}: {e}")
 
+    @staticmethod
+    def _task_record(task: AsyncTask) -> Dict[str, Any]:
+        """任务的持久化记录（状态加任务数据）"""
+        task_data = task.to_dict()
+        # 添加任务数据
+        task_data['task_data'] = task.task_data
+        return task_data
+
+    @staticmethod
+    def _task_from_record(task_data: Dict[str, Any]) -> AsyncTask:
+        """从持久化记录重建任务对象"""
+        task = AsyncTask(
+            task_data['task_id'],
+            task_data['task_type'],
+            task_data.get('task_data', {}),
+            task_data.get('priority', 0)
+        )
+        task.status = TaskStatus(task_data['status'])
+        task.result = task_data.get('result')
+        task.error = task_data.get('error')
+        task.progress = task_data.get('progress', 0)
+        task.partial_text = task_data.get('partial_text', '')
+
+        # 解析时间
+        task.created_at = datetime.fromisoformat(task_data['created_at'])
+        if task_data.get('started_at'):
+            task.started_at = datetime.fromisoformat(task_data['started_at'])
+        if task_data.get('completed_at'):
+            task.completed_at = datetime.fromisoformat(task_data['completed_at'])
+        return task
+
+    def _find_task(self, task_id: str) -> Optional[AsyncTask]:
+        """查找任务：先查内存，再按需从持久化后端读取已结束的历史任务（需持有锁）"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            record = self.persistence.load(task_id)
+            if record:
+                task = self._task_from_record(record)
+        return task
+
     def _load_tasks(self):
-        """从文件加载任务"""
+        """从持久化后端回放未结束的任务"""
         try:
-            if not os.path.exists(self.persist_dir):
-                return
+            for task_data in self.persistence.load_active():
+                try:
+                    task = self._task_from_record(task_data)
+                except Exception as e:
+                    logger.error(f"加载任务记录失败 {task_data.get('task_id')}: {e}")
+                    continue
+
+                # 上次运行中被中断的任务重新排队执行
+                if task.status == TaskStatus.RUNNING:
+                    task.status = TaskStatus.PENDING
+                    task.started_at = None
+                    self._save_task(task)
 
-            for filename in os.listdir(self.persist_dir):
-                if filename.endswith('.json'):
-                    task_file = os.path.join(self.persist_dir, filename)
-                    try:
-                        with open(task_file, 'r', encoding='utf-8') as f:
-                            task_data = json.load(f)
-
-                        # 重建任务对象
-                        task = AsyncTask(
-                            task_data['task_id'],
-                            task_data['task_type'],
-                            task_data.get('task_data', {})
-                        )
-                        task.status = TaskStatus(task_data['status'])
-                        task.result = task_data.get('result')
-                        task.error = task_data.get('error')
-                        task.progress = task_data.get('progress', 0)
-
-                        # 解析时间
-                        task.created_at = datetime.fromisoformat(task_data['created_at'])
-                        if task_data.get('started_at'):
-                            task.started_at = datetime.fromisoformat(task_data['started_at'])
-                        if task_data.get('completed_at'):
-                            task.completed_at = datetime.fromisoformat(task_data['completed_at'])
-
-                        self.tasks[task.task_id] = task
-                        logger.info(f"加载任务: {task.task_id} (状态: {task.status.value})")
-
-                    except Exception as e:
-                        logger.error(f"加载任务文件失败 {filename}: {e}")
-                        # 删除损坏的文件
-                        try:
-                            os.remove(task_file)
-                        except:
-                            pass
+                self.tasks[task.task_id] = task
+                self._enqueue(task)
+                logger.info(f"加载任务: {task.task_id} (状态: {task.status.value})")
 
         except Exception as e:
             logger.error(f"加载任务失败: {e}")
 
-    def _delete_task_file(self, task_id: str):
-        """删除任务文件"""
+
+class SharedAsyncTaskManager(AsyncTaskManager):
+    """
+    多进程共享的异步任务管理器
+
+    任务保存在 SharedTaskStore 中，任意 worker 提交的任务对所有 worker 可见；
+    各进程的工作线程从共享队列领取本进程已注册类型的任务，执行期间由心跳线程续约，
+    结果只在仍持有租约时写入。gunicorn 以多个 worker 运行时使用。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        task_timeout: int = 300,
+        persist_dir: str = "task_data",
+        store: Optional[SharedTaskStore] = None,
+        poll_interval: float = 0.5,
+        partial_text_interval: float = 0.5,
+        **kwargs
+    ):
+        """
+        Args:
+            max_workers: 本进程的工作线程数
+            task_timeout: 任务超时时间（秒）
+            persist_dir: 共享数据目录（所有 worker 相同）
+            store: 共享任务存储，默认使用 persist_dir 下的 shared_tasks.db
+            poll_interval: 共享队列为空时的轮询间隔（秒）；本进程提交的任务会立即唤醒工作线程
+            partial_text_interval: 流式生成的部分文本写入共享存储的最短间隔（秒），
+                                   其余的由租约心跳补写，其他 worker 的 SSE 连接据此推送
+        """
+        self.poll_interval = poll_interval
+        self.partial_text_interval = partial_text_interval
+        # 各任务上次写入共享存储的时间和部分文本
+        self._partial_saved: Dict[str, tuple] = {}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        store = store or SharedTaskStore(os.path.join(persist_dir, "shared_tasks.db"))
+        super().__init__(max_workers, task_timeout, persist_dir, persistence=store, **kwargs)
+        self.store = store
+
+    def start(self):
+        """启动任务管理器和租约心跳"""
+        if self.running:
+            return
+        super().start()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="TaskLeaseHeartbeat")
+        heartbeat.daemon = True
+        heartbeat.start()
+
+    def submit_task(
+        self,
+        task_type: str,
+        task_data: Dict[str, Any],
+        task_id: Optional[str] = None,
+        priority: int = 0
+    ) -> str:
+        """提交异步任务到共享队列"""
+        if task_id is None:
+            task_id = str(uuid.uuid4())
+
+        if task_type not in self.task_handlers:
+            raise ValueError(f"未注册的任务类型: {task_type}")
+
+        task = AsyncTask(task_id, task_type, task_data, priority)
+        inline = self.task_executors.get(task_type) == "inline"
+        if inline:
+            with self.lock:
+                self._mark_running(task)
+                self.tasks[task_id] = task
+
+        self.store.insert(self._task_record(task), owner=self.owner if inline else None)
+
+        logger.info(f"提交异步任务: {task_id} ({task_type})")
+        if inline:
+            self._execute_task(task)
+        else:
+            with self.condition:
+                self.condition.notify()
+        return task_id
+
+    def _get_pending_task(self, timeout: Optional[float] = None) -> Optional[AsyncTask]:
+        """从共享队列领取任务；没有任务时等待本进程的提交通知或轮询间隔"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running:
+            try:
+                record = self.store.claim(self.owner, list(self.task_handlers))
+            except Exception as e:
+                logger.error(f"领取任务失败: {e}")
+                record = None
+
+            if record:
+                task = self._task_from_record(record)
+                task.cancel_token = CancelToken(self.task_timeout or None)
+                with self.lock:
+                    self.tasks[task.task_id] = task
+                return task
+
+            wait = self.poll_interval
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+            with self.condition:
+                if self.running:
+                    self.condition.wait(wait)
+        return None
+
+    def _save_task(self, task: AsyncTask):
+        """写入共享存储：结束状态只在仍持有租约时生效，之后从本进程内存移除"""
         try:
-            task_file = os.path.join(self.persist_dir, f"{task_id}.json")
-            if os.path.exists(task_file):
-                os.remove(task_file)
+            if task.status in FINISHED_STATUSES:
+                if not self.store.complete(self._task_record(task), self.owner):
+                    logger.warning(f"任务租约已失效，丢弃结果: {task.task_id}")
+                self.tasks.pop(task.task_id, None)
+            else:
+                self.store.renew(task.task_id, self.owner, task.progress)
         except Exception as e:
-            logger.error(f"删除任务文件失败 {task_id}: {e}")
-                
-            time.sleep(300)  # 每5分钟清理一次
+            logger.error(f"保存任务失败 {task.task_id}: {e}")
+
+    def cancel_task(self, task_id: str) -> bool:
+        """取消任务：本进程执行中的任务直接取消，否则在共享存储中取消（由持有者在续约时得知）"""
+        if super().cancel_task(task_id):
+            return True
+        try:
+            cancelled = self.store.cancel(task_id)
+        except Exception as e:
+            logger.error(f"取消任务失败 {task_id}: {e}")
+            return False
+        if cancelled:
+            logger.info(f"取消任务: {task_id}")
+        return cancelled
+
+    def _release(self, task_id: str):
+        """租约失效（被取消或被其他进程接管）：通知处理器退出并释放工作线程"""
+        with self.lock:
+            task = self.tasks.get(task_id)
+            if task is None or task.status != TaskStatus.RUNNING:
+                return
+            task.cancel_token.cancel()
+            self._abandon(task)
+            task.status = TaskStatus.CANCELLED
+            self.tasks.pop(task_id, None)
+        self._notify_update()
+
+    def _partial_text_changed(self, task: AsyncTask):
+        """部分文本变化时唤醒本进程的等待者，并按 partial_text_interval 节流写入共享存储"""
+        super()._partial_text_changed(task)
+        now = time.monotonic()
+        saved_at, _ = self._partial_saved.get(task.task_id, (0.0, ""))
+        if now - saved_at < self.partial_text_interval:
+            return
+        self._save_partial_text(task.task_id, task.progress, task.partial_text, now)
+
+    def _save_partial_text(self, task_id: str, progress: int, text: str, now: float) -> bool:
+        """写入部分文本（同时续约）"""
+        self._partial_saved[task_id] = (now, text)
+        try:
+            return self.store.renew(task_id, self.owner, progress, text)
+        except Exception as e:
+            logger.error(f"保存部分文本失败 {task_id}: {e}")
+            return True
+
+    def _heartbeat_loop(self):
+        """定期为本进程正在执行的任务续约，并同步进度和节流时未写入的部分文本"""
+        interval = min(self.store.lease_seconds / 3, max(self.partial_text_interval, 0.1))
+        renewed_at = time.monotonic()
+        while not self._stopped.wait(interval):
+            now = time.monotonic()
+            with self.lock:
+                running = [t for t in self.tasks.values() if t.status == TaskStatus.RUNNING]
+                running_ids = {t.task_id for t in running}
+                for task_id in list(self._partial_saved):
+                    if task_id not in running_ids:
+                        del self._partial_saved[task_id]
+            renew_all = now - renewed_at >= self.store.lease_seconds / 3
+            if renew_all:
+                renewed_at = now
+
+            for task in running:
+                task_id, progress, text = task.task_id, task.progress, task.partial_text
+                _, saved_text = self._partial_saved.get(task_id, (0.0, ""))
+                try:
+                    if text and text != saved_text:
+                        renewed = self._save_partial_text(task_id, progress, text, now)
+                    elif renew_all:
+                        renewed = self.store.renew(task_id, self.owner, progress)
+                    else:
+                        continue
+                    if not renewed:
+                        logger.warning(f"任务租约已失效（已取消或被接管）: {task_id}")
+                        self._release(task_id)
+                except Exception as e:
+                    logger.error(f"任务续约失败 {task_id}: {e}")
+
+
+def create_task_manager(**kwargs) -> AsyncTaskManager:
+    """根据 TASK_STORE 环境变量创建任务管理器（shared：多 worker 共享）"""
+    if os.getenv("TASK_STORE", "local") == "shared":
+        return SharedAsyncTaskManager(**kwargs)
+    return AsyncTaskManager(**kwargs)
 
 
 # 全局任务管理器实例
-task_manager = AsyncTaskManager(max_workers=2, task_timeout=300)
+task_manager = create_task_manager(max_workers=2, task_timeout=1000)
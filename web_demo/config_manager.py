@@ -47,7 +47,9 @@ class ConfigManager:
                 "asr_app_key": "",
                 "asr_access_key": "",
                 "asr_model": "bigmodel",  # 保留默认模型
-                "asr_timeout": 1800
+                "asr_timeout": 1800,
+                "asr_callback_url": "",  # 可选，公网可访问的 /api/asr_callback 地址
+                "asr_callback_token": ""  # 回调校验令牌，为空时首次启用回调自动生成
             },
             "prompt": {
                 "system_prompt": """你是一个专业的会议纪要生成助手。请根据提供的会议录音转录内容，生成规范的会议纪要。
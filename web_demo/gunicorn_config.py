@@ -1,14 +1,28 @@
 # Gunicorn配置文件
 # 支持大文件上传的配置
 
+import os
+
 # 绑定地址和端口
 bind = "0.0.0.0:8080"
 
-# 工作进程数
-workers = 1
+# 工作进程数（默认1个）
+# 多于一个 worker 时异步任务改用共享任务存储（SQLite 领取/租约），任意 worker 都能查询任务状态；
+# 但ASR回调登记、/api/wait 的后台轮询、任务结果缓存、大模型响应的内存缓存仍是进程内的，
+# 各 worker 之间不共享，回调落到其他 worker 时等待者只能继续各自查询上游，开启多 worker 前请评估这些影响
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+if workers > 1:
+    os.environ.setdefault("TASK_STORE", "shared")
 
 # 工作进程类型
-worker_class = "sync"
+# 长轮询 /api/wait 和 SSE 会长时间保持连接，使用协程 worker 避免独占工作进程；
+# 未安装 gevent 时退回多线程 worker
+try:
+    import gevent  # noqa: F401
+    worker_class = "gevent"
+except ImportError:
+    worker_class = "gthread"
+    threads = 32
 
 # 超时设置 - 增加超时时间以支持AI生成任务
 timeout = 1200  # 20分钟超时，支持长时间AI生成任务
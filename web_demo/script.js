@@ -19,7 +19,7 @@ let uploadArea, uploadBtn, fileInput, audioUrl, urlSubmitBtn, startBtn, resetBtn
 let enableItn, enablePunc, enableSpeaker, showUtterances, enableDialect, focusLastSpeakers;
 let statusTitle, statusMessage, progressFill, taskId;
 let resultText, audioDuration, utteranceCount, processTime, utterancesSection, utterancesList;
-let downloadBtn, downloadJsonBtn, downloadWordBtn;
+let downloadBtn, downloadJsonBtn, downloadWordBtn, regenerateMinutesBtn;
 
 // 录音相关DOM元素
 let recordingSection, recordingStatus, audioVisualizer, startRecordBtn, pauseRecordBtn, stopRecordBtn;
@@ -79,6 +79,7 @@ function initializeDOMElements() {
     downloadBtn = document.getElementById('downloadBtn');
     downloadJsonBtn = document.getElementById('downloadJsonBtn');
     downloadWordBtn = document.getElementById('downloadWordBtn');
+    regenerateMinutesBtn = document.getElementById('regenerateMinutesBtn');
 
     // 录音相关元素
     recordingSection = document.getElementById('recordingSection');
@@ -125,6 +126,7 @@ function initializeEventListeners() {
         // 初始状态设为禁用
         setWordDownloadButtonState(false);
     }
+    if (regenerateMinutesBtn) regenerateMinutesBtn.addEventListener('click', handleRegenerateMinutes);
 
     // 录音按钮事件
     if (startRecordBtn) startRecordBtn.addEventListener('click', startRecording);
@@ -135,8 +137,13 @@ function initializeEventListeners() {
     if (discardRecordingBtn) discardRecordingBtn.addEventListener('click', discardRecording);
 }
 
-// Word下载按钮状态管理
+// Word下载、重新生成按钮状态管理（会议纪要生成完成后才可用）
 function setWordDownloadButtonState(enabled) {
+    if (regenerateMinutesBtn) {
+        regenerateMinutesBtn.disabled = !enabled;
+        regenerateMinutesBtn.style.opacity = enabled ? '1' : '0.5';
+        regenerateMinutesBtn.style.cursor = enabled ? 'pointer' : 'not-allowed';
+    }
     if (downloadWordBtn) {
         downloadWordBtn.disabled = !enabled;
         if (enabled) {
@@ -229,6 +236,7 @@ function handleReset() {
     currentFile = null;
     currentTaskId = null;
     window.currentAsyncTaskId = null; // 清除异步任务ID
+    window.currentMinutesTaskId = null;
     fileInput.value = '';
     audioUrl.value = '';
 
@@ -1750,8 +1758,19 @@ ${result.result.text}
     }
 }
 
+// 重新生成会议纪要（跳过服务端的大模型响应缓存）
+function handleRegenerateMinutes() {
+    if (!window.currentMinutesTaskId) {
+        return;
+    }
+    setWordDownloadButtonState(false);
+    generateMeetingMinutes(window.currentMinutesTaskId, null, { regenerate: true });
+}
+
 // 异步生成会议纪要
-async function generateMeetingMinutes(taskId, asrResult) {
+async function generateMeetingMinutes(taskId, asrResult, options = {}) {
+    // 保存识别任务ID，供重新生成使用
+    window.currentMinutesTaskId = taskId;
     try {
         // 隐藏欢迎页面
         const welcomeSection = document.getElementById('welcomeSection');
@@ -1796,7 +1815,8 @@ async function generateMeetingMinutes(taskId, asrResult) {
                 topic: '工作会议',
                 date: new Date().toLocaleDateString('zh-CN'),
                 host: '党委书记',
-                attendees: ['总经理', '相关部门负责人']
+                attendees: ['总经理', '相关部门负责人'],
+                regenerate: Boolean(options.regenerate)
             })
         });
 
@@ -1810,8 +1830,8 @@ async function generateMeetingMinutes(taskId, asrResult) {
 
             updateMinutesStatus('任务已提交，开始AI生成...', 10);
 
-            // 开始轮询任务状态
-            pollAsyncTaskStatus(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection);
+            // 接收任务进度和流式生成的纪要正文
+            streamAsyncTask(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection);
 
         } else {
             throw new Error(submitResult.error || '提交任务失败');
@@ -1829,6 +1849,81 @@ async function generateMeetingMinutes(taskId, asrResult) {
     }
 }
 
+// 以SSE接收异步任务进度和流式生成的纪要正文，浏览器不支持或连接失败时退回轮询
+function streamAsyncTask(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection) {
+    if (!window.EventSource) {
+        pollAsyncTaskStatus(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection);
+        return;
+    }
+
+    const source = new EventSource(`/api/async_task/${asyncTaskId}/stream`);
+    let streamedText = '';
+    let finished = false;
+
+    source.addEventListener('status', (event) => {
+        const data = JSON.parse(event.data);
+        updateMinutesProgress(data.progress);
+        updateMinutesStatus(data.status === 'pending' ? '任务排队中...' : 'AI正在分析会议内容...', data.progress);
+    });
+
+    source.addEventListener('delta', (event) => {
+        streamedText += JSON.parse(event.data).text;
+        renderStreamingMinutes(streamedText);
+    });
+
+    source.addEventListener('partial', (event) => {
+        streamedText = JSON.parse(event.data).text;
+        renderStreamingMinutes(streamedText);
+    });
+
+    source.addEventListener('result', (event) => {
+        finished = true;
+        source.close();
+        const result = JSON.parse(event.data);
+        updateMinutesProgress(100);
+        updateMinutesStatus('生成完成！', 100);
+        displayMeetingMinutesResult(result.minutes_data, minutesContent, keyInfoSection, speakersSection, aiToolsSection);
+    });
+
+    source.addEventListener('error', (event) => {
+        if (finished) return;
+        finished = true;
+        source.close();
+
+        // 连接失败（没有事件数据）时退回轮询
+        if (!event.data) {
+            pollAsyncTaskStatus(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection);
+            return;
+        }
+
+        const data = JSON.parse(event.data);
+        if (data.status === 'cancelled') {
+            showMinutesError('会议纪要生成任务已取消，请重新生成');
+        } else if (data.error === '任务不存在') {
+            showMinutesError('任务已过期或不存在，请重新生成会议纪要');
+        } else {
+            showMinutesError(`AI生成失败：${data.error || '任务执行失败'}`);
+        }
+    });
+}
+
+// 显示流式生成中的纪要正文
+function renderStreamingMinutes(text) {
+    const minutesResult = document.getElementById('minutesResult');
+    if (!minutesResult) return;
+
+    let preview = document.getElementById('minutesStreamPreview');
+    if (!preview) {
+        minutesResult.innerHTML = '';
+        preview = document.createElement('div');
+        preview.id = 'minutesStreamPreview';
+        preview.style.whiteSpace = 'pre-wrap';
+        minutesResult.appendChild(preview);
+    }
+    minutesResult.style.display = 'block';
+    preview.textContent = filterThinkingSection(text);
+}
+
 // 轮询异步任务状态
 async function pollAsyncTaskStatus(asyncTaskId, minutesContent, keyInfoSection, speakersSection, aiToolsSection) {
     const maxAttempts = 900; // 最多轮询900次（30分钟）
@@ -1882,6 +1977,9 @@ async function pollAsyncTaskStatus(asyncTaskId, minutesContent, keyInfoSection,
                     clearInterval(pollInterval);
                     const error = taskStatus.error || '任务执行失败';
                     showMinutesError(`AI生成失败：${error}`);
+                } else if (status === 'cancelled') {
+                    clearInterval(pollInterval);
+                    showMinutesError('会议纪要生成任务已取消，请重新生成');
                 }
 
             } else {
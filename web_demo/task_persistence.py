@@ -0,0 +1,512 @@
+"""
+异步任务持久化后端
+
+任务状态变化只把最新快照放入待写队列，由后台写线程合并后批量落盘（每批一次 fsync），
+不再在任务管理器的锁内逐个重写 JSON 文件。启动时只回放未结束的任务，
+已结束的历史任务按需通过 load() 读取。
+
+提供两种实现：
+- SQLiteTaskPersistence：SQLite（WAL模式），默认
+- JournalTaskPersistence：追加写日志文件，启动时在垃圾过多时压缩
+
+多个 worker 进程共享任务时使用 SharedTaskStore（同步写入，带领取/租约语义）。
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 未结束的任务状态（与 TaskStatus 的取值一致）
+ACTIVE_STATUSES = ("pending", "running")
+
+
+class TaskPersistence:
+    """持久化后端基类：负责批量写线程，子类实现具体的读写"""
+
+    def __init__(self, batch_interval: float = 0.05):
+        """
+        Args:
+            batch_interval: 收到写请求后等待更多写请求合并成一批的时间（秒）
+        """
+        self.batch_interval = batch_interval
+        # task_id -> 最新记录；None 表示删除
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(target=self._writer_loop, name=type(self).__name__, daemon=True)
+        self._writer.start()
+
+    def save(self, record: Dict[str, Any]):
+        """提交任务记录（只入队，不阻塞调用方）"""
+        with self._condition:
+            self._pending[record["task_id"]] = record
+            self._condition.notify_all()
+
+    def delete(self, task_id: str):
+        """删除任务记录"""
+        with self._condition:
+            self._pending[task_id] = None
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已提交的写入全部落盘"""
+        with self._condition:
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self):
+        """写完剩余记录并关闭"""
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+        self._close()
+
+    def load_active(self) -> List[Dict[str, Any]]:
+        """加载所有未结束的任务记录"""
+        raise NotImplementedError
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """按任务ID加载记录"""
+        with self._condition:
+            if task_id in self._pending:
+                return self._pending[task_id]
+        return self._load(task_id)
+
+    def purge(self, completed_before: str):
+        """删除在指定时间（ISO格式）之前结束的任务"""
+        raise NotImplementedError
+
+    def _writer_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if self._closed and not self._pending:
+                    return
+            # 稍等片刻，让同一时间段内的状态变化合并为一批
+            time.sleep(self.batch_interval)
+            with self._condition:
+                batch, self._pending = self._pending, {}
+                self._writing = True
+            try:
+                puts = [r for r in batch.values() if r is not None]
+                deletes = [task_id for task_id, r in batch.items() if r is None]
+                self._write_batch(puts, deletes)
+            except Exception as e:
+                logger.error(f"保存任务失败 ({len(batch)}条): {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write_batch(self, puts: List[Dict[str, Any]], deletes: List[str]):
+        raise NotImplementedError
+
+    def _load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class SQLiteTaskPersistence(TaskPersistence):
+    """SQLite（WAL模式）持久化，每批写入一个事务"""
+
+    def __init__(self, path: str, batch_interval: float = 0.05):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " completed_at TEXT,"
+            " record TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+        super().__init__(batch_interval)
+
+    def load_active(self) -> List[Dict[str, Any]]:
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT record FROM tasks WHERE status IN ({placeholders})", ACTIVE_STATUSES
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def purge(self, completed_before: str):
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM tasks WHERE completed_at IS NOT NULL AND completed_at < ?",
+                (completed_before,)
+            )
+
+    def _load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT record FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_batch(self, puts: List[Dict[str, Any]], deletes: List[str]):
+        rows = [
+            (r["task_id"], r["status"], r.get("completed_at"), json.dumps(r, ensure_ascii=False))
+            for r in puts
+        ]
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?)", rows)
+                self._conn.executemany("DELETE FROM tasks WHERE task_id = ?", [(t,) for t in deletes])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _close(self):
+        with self._db_lock:
+            self._conn.close()
+
+
+class JournalTaskPersistence(TaskPersistence):
+    """
+    追加写日志持久化
+
+    每行一条记录：``P\\t<task_id>\\t<status>\\t<completed_at>\\t<json>`` 或 ``D\\t<task_id>``。
+    启动时只解析每行的前几个字段建立索引，只对未结束的任务解析JSON；
+    已结束的任务记录偏移量，按需读取。
+    """
+
+    def __init__(self, path: str, batch_interval: float = 0.05, compact_ratio: float = 2.0):
+        """
+        Args:
+            path: 日志文件路径
+            batch_interval: 批量写入的合并时间（秒）
+            compact_ratio: 过期行数超过有效行数的该倍数时，启动时压缩日志
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self._file_lock = threading.Lock()
+        # task_id -> (状态, 结束时间, 行偏移)
+        self._index: Dict[str, Tuple[str, str, int]] = {}
+        self._stale_lines = 0
+        self._scan()
+        if self._stale_lines > max(1000, len(self._index) * compact_ratio):
+            self._compact()
+        self._file = open(self.path, "ab")
+        super().__init__(batch_interval)
+
+    def load_active(self) -> List[Dict[str, Any]]:
+        with self._file_lock:
+            offsets = [offset for status, _, offset in self._index.values() if status in ACTIVE_STATUSES]
+        return [self._read_record(offset) for offset in sorted(offsets)]
+
+    def purge(self, completed_before: str):
+        with self._file_lock:
+            expired = [
+                task_id for task_id, (_, completed_at, _) in self._index.items()
+                if completed_at and completed_at < completed_before
+            ]
+        for task_id in expired:
+            self.delete(task_id)
+
+    def _load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._file_lock:
+            entry = self._index.get(task_id)
+        return self._read_record(entry[2]) if entry else None
+
+    def _scan(self):
+        """扫描日志建立索引"""
+        if not os.path.exists(self.path):
+            return
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                fields = line.split(b"\t", 4)
+                if not line.endswith(b"\n") or len(fields) < 2:
+                    # 未写完的最后一行（进程在写入中途退出）
+                    break
+                task_id = fields[1].decode("utf-8").rstrip("\n")
+                if task_id in self._index:
+                    self._stale_lines += 1
+                if fields[0] == b"P" and len(fields) == 5:
+                    self._index[task_id] = (fields[2].decode(), fields[3].decode(), offset)
+                else:
+                    self._stale_lines += 1
+                    self._index.pop(task_id, None)
+                offset += len(line)
+        if offset < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+    def _compact(self):
+        """只保留每个任务的最新记录，重写日志"""
+        tmp_path = self.path + ".compact"
+        index = {}
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            for task_id, (status, completed_at, offset) in sorted(self._index.items(), key=lambda i: i[1][2]):
+                src.seek(offset)
+                index[task_id] = (status, completed_at, dst.tell())
+                dst.write(src.readline())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.path)
+        logger.info(f"任务日志已压缩: 移除 {self._stale_lines} 条过期记录")
+        self._index = index
+        self._stale_lines = 0
+
+    def _read_record(self, offset: int) -> Dict[str, Any]:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            line = f.readline()
+        return json.loads(line.split(b"\t", 4)[4])
+
+    def _write_batch(self, puts: List[Dict[str, Any]], deletes: List[str]):
+        with self._file_lock:
+            for r in puts:
+                status, completed_at = r["status"], r.get("completed_at") or ""
+                line = "\t".join(("P", r["task_id"], status, completed_at, json.dumps(r, ensure_ascii=False)))
+                offset = self._file.tell()
+                self._file.write(line.encode("utf-8") + b"\n")
+                if r["task_id"] in self._index:
+                    self._stale_lines += 1
+                self._index[r["task_id"]] = (status, completed_at, offset)
+            for task_id in deletes:
+                self._file.write(f"D\t{task_id}\n".encode("utf-8"))
+                if self._index.pop(task_id, None) is not None:
+                    self._stale_lines += 2
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _close(self):
+        with self._file_lock:
+            self._file.close()
+
+
+def create_persistence(backend: str, persist_dir: str) -> TaskPersistence:
+    """
+    按名称创建持久化后端
+
+    Args:
+        backend: "sqlite" 或 "journal"
+        persist_dir: 数据目录
+    """
+    if backend == "sqlite":
+        return SQLiteTaskPersistence(os.path.join(persist_dir, "tasks.db"))
+    if backend == "journal":
+        return JournalTaskPersistence(os.path.join(persist_dir, "tasks.journal"))
+    raise ValueError(f"未知的任务持久化后端: {backend}")
+
+
+class SharedTaskStore(TaskPersistence):
+    """
+    多进程共享的任务存储与队列（SQLite，WAL模式）
+
+    多个 gunicorn worker 打开同一个数据库文件：任务提交后立即对所有进程可见，
+    工作线程通过 claim() 在事务中原子地领取任务并获得租约，执行期间定期 renew() 续约，
+    完成时 complete() 只在仍持有租约时生效。持有者进程退出、租约过期后任务才会被其他进程重新领取，
+    因此正常运行时每个任务只执行一次，且最终只记录一次结果。
+
+    与批量写入的后端不同，这里的写入都是同步的。
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0):
+        """
+        Args:
+            path: 数据库文件路径（所有进程使用同一路径）
+            lease_seconds: 租约时长（秒）
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " task_type TEXT NOT NULL,"
+            " priority INTEGER NOT NULL DEFAULT 0,"
+            " status TEXT NOT NULL,"
+            " lease_owner TEXT,"
+            " lease_expires REAL,"
+            " completed_at TEXT,"
+            " record TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_shared_tasks_queue ON shared_tasks(status, priority)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """每个线程一个连接"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def insert(self, record: Dict[str, Any], owner: Optional[str] = None):
+        """
+        插入新任务；同ID的任务已结束时替换为新任务（重新提交），未结束时抛出 sqlite3.IntegrityError
+
+        Args:
+            record: 任务记录
+            owner: 指定时任务直接以运行状态归该持有者所有（用于同步执行）
+        """
+        cursor = self._connection().execute(
+            "INSERT INTO shared_tasks VALUES (?, ?, ?, ?, ?, ?, NULL, ?)"
+            " ON CONFLICT(task_id) DO UPDATE SET task_type = excluded.task_type, priority = excluded.priority,"
+            " status = excluded.status, lease_owner = excluded.lease_owner, lease_expires = excluded.lease_expires,"
+            " completed_at = NULL, record = excluded.record"
+            " WHERE shared_tasks.status NOT IN ('pending', 'running')",
+            (
+                record["task_id"], record["task_type"], record.get("priority", 0), record["status"],
+                owner, time.time() + self.lease_seconds if owner else None,
+                json.dumps(record, ensure_ascii=False)
+            )
+        )
+        if cursor.rowcount == 0:
+            raise sqlite3.IntegrityError(f"任务仍在执行中: {record['task_id']}")
+
+    def claim(self, owner: str, task_types: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        领取一个待执行（或租约已过期）的任务
+
+        Args:
+            owner: 领取者标识
+            task_types: 领取者能处理的任务类型
+
+        Returns:
+            领取到的任务记录，没有时返回None
+        """
+        if not task_types:
+            return None
+        conn = self._connection()
+        now = time.time()
+        placeholders = ",".join("?" * len(task_types))
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT task_id, record FROM shared_tasks"
+                f" WHERE task_type IN ({placeholders})"
+                f" AND (status = 'pending' OR (status = 'running' AND lease_expires < ?))"
+                f" ORDER BY priority DESC, rowid LIMIT 1",
+                (*task_types, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            record = json.loads(row[1])
+            if record["status"] == "running":
+                logger.warning(f"任务租约过期，重新领取: {row[0]}")
+            record["status"] = "running"
+            record["started_at"] = datetime.now().isoformat()
+            conn.execute(
+                "UPDATE shared_tasks SET status = 'running', lease_owner = ?, lease_expires = ?, record = ?"
+                " WHERE task_id = ?",
+                (owner, now + self.lease_seconds, json.dumps(record, ensure_ascii=False), row[0])
+            )
+            conn.execute("COMMIT")
+            return record
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def renew(
+        self,
+        task_id: str,
+        owner: str,
+        progress: Optional[int] = None,
+        partial_text: Optional[str] = None
+    ) -> bool:
+        """
+        续约并更新进度和流式生成的部分文本（为None的不更新）；租约已被他人接管时返回False
+
+        部分文本写入任务记录，其他进程查询执行中的任务时也能看到。
+        """
+        fields = {"$.progress": progress, "$.partial_text": partial_text}
+        updates = [(path, value) for path, value in fields.items() if value is not None]
+        record = "json_set(record, " + ", ".join("?, ?" for _ in updates) + ")" if updates else "record"
+        cursor = self._connection().execute(
+            f"UPDATE shared_tasks SET lease_expires = ?, record = {record}"
+            f" WHERE task_id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, *(x for item in updates for x in item), task_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, record: Dict[str, Any], owner: str) -> bool:
+        """写入终态结果；只有仍持有租约时生效"""
+        cursor = self._connection().execute(
+            "UPDATE shared_tasks SET status = ?, completed_at = ?, lease_owner = NULL, lease_expires = NULL,"
+            " record = ? WHERE task_id = ? AND lease_owner = ? AND status = 'running'",
+            (
+                record["status"], record.get("completed_at"), json.dumps(record, ensure_ascii=False),
+                record["task_id"], owner
+            )
+        )
+        return cursor.rowcount == 1
+
+    def cancel(self, task_id: str, error: str = "任务已取消") -> bool:
+        """
+        取消未结束的任务并释放租约；执行中任务的持有者在下次续约失败时得知取消
+
+        Returns:
+            是否取消成功（任务不存在或已结束时返回False）
+        """
+        completed_at = datetime.now().isoformat()
+        cursor = self._connection().execute(
+            "UPDATE shared_tasks SET status = 'cancelled', completed_at = ?, lease_owner = NULL, lease_expires = NULL,"
+            " record = json_set(record, '$.status', 'cancelled', '$.error', ?, '$.completed_at', ?)"
+            " WHERE task_id = ? AND status IN ('pending', 'running')",
+            (completed_at, error, completed_at, task_id)
+        )
+        return cursor.rowcount == 1
+
+    def save(self, record: Dict[str, Any]):
+        """无条件覆盖任务记录"""
+        self._connection().execute(
+            "UPDATE shared_tasks SET status = ?, completed_at = ?, record = ? WHERE task_id = ?",
+            (record["status"], record.get("completed_at"), json.dumps(record, ensure_ascii=False), record["task_id"])
+        )
+
+    def delete(self, task_id: str):
+        self._connection().execute("DELETE FROM shared_tasks WHERE task_id = ?", (task_id,))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT record FROM shared_tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_active(self) -> List[Dict[str, Any]]:
+        # 未结束的任务留在共享队列中，由各进程按需领取
+        return []
+
+    def purge(self, completed_before: str):
+        self._connection().execute(
+            "DELETE FROM shared_tasks WHERE completed_at IS NOT NULL AND completed_at < ?",
+            (completed_before,)
+        )
@@ -10,6 +10,8 @@ import base64
 from typing import Optional, Tuple
 import tos
 
+from meetaudio.url_validation import url_validator
+
 logger = logging.getLogger(__name__)
 
 
@@ -177,16 +179,19 @@ class TOSClient:
             # 上传文件
             logger.info(f"开始上传文件: {file_path} -> {object_key}")
             
+            content_type = self._get_content_type(file_path)
             with open(file_path, 'rb') as f:
                 self.client.put_object(
                     bucket=self.bucket_name,
                     key=object_key,
                     content=f,
-                    content_type=self._get_content_type(file_path)
+                    content_type=content_type
                 )
             
             # 生成公开访问URL（使用正确的TOS URL格式）
             public_url = f"https://{self.bucket_name}.{self.endpoint}/{object_key}"
+            # 刚上传的对象无需在提交识别前再验证
+            url_validator.trust(public_url, os.path.getsize(file_path), content_type)
             
             logger.info(f"文件上传成功: {public_url}")
             return True, public_url, ""
@@ -233,6 +238,7 @@ class TOSClient:
             
             # 生成公开访问URL（使用正确的TOS URL格式）
             public_url = f"https://{self.bucket_name}.{self.endpoint}/{object_key}"
+            url_validator.trust(public_url, len(file_content), content_type)
             
             logger.info(f"文件内容上传成功: {public_url}")
             return True, public_url, ""
@@ -254,6 +260,7 @@ class TOSClient:
         """
         try:
             self.client.delete_object(bucket=self.bucket_name, key=object_key)
+            url_validator.invalidate(f"https://{self.bucket_name}.{self.endpoint}/{object_key}")
             logger.info(f"文件删除成功: {object_key}")
             return True
         except Exception as e: